@@ -1,7 +1,7 @@
 import json
 import logging
 import os
-from typing import ClassVar, List
+from typing import ClassVar, Dict, List
 
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -34,6 +34,12 @@ class Settings(BaseSettings):
     # Default LLM parameters
     llm_temperature: float = float(os.getenv("LLM_TEMPERATURE", 0.7))
     llm_max_tokens: int = int(os.getenv("LLM_MAX_TOKENS", 2048))
+    llm_timeout: float = float(os.getenv("LLM_TIMEOUT", 60))
+    # JSON object of per-operation output token caps, e.g.
+    # {"expand_mindmap_node": 8192}
+    llm_op_max_tokens: Dict[str, int] = json.loads(
+        os.getenv("LLM_OP_MAX_TOKENS", "{}")
+    )
 
     # CORS Configuration
     allowed_origins: str = os.getenv("ALLOWED_ORIGINS", "*")
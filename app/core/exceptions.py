@@ -41,3 +41,12 @@ class AIRateLimitError(HTTPException):
         super().__init__(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=detail
         )
+
+
+class AIOutputTruncatedError(HTTPException):
+    """Raised when the model stops at its output token limit (502 Bad Gateway)"""
+
+    def __init__(self, detail: str):
+        super().__init__(
+            status_code=status.HTTP_502_BAD_GATEWAY, detail=detail
+        )
@@ -21,6 +21,7 @@ class GeminiAdapter(RAGAdapterMixin):
     ) -> Tuple[str, TokenUsage]:
         resp = self.client.invoke(input=messages, **params)
         content = resp.content
+        self.last_finish_reason = resp.response_metadata.get("finish_reason")
 
         if isinstance(content, list):
             content = " ".join(str(item) for item in content)
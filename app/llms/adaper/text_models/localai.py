@@ -16,7 +16,11 @@ class LocalAIAdapter:
         )
 
     def run(self, model: str, messages: List[BaseMessage], **params) -> str:
-        resp = self.client.invoke(input=messages, **params).content
+        message = self.client.invoke(input=messages, **params)
+        self.last_finish_reason = message.response_metadata.get(
+            "finish_reason"
+        )
+        resp = message.content
 
         if isinstance(resp, list):
             return " ".join(str(item) for item in resp)
@@ -24,10 +24,17 @@ class OpenRouterAdapter(RAGAdapterMixin):
         params["openrouter_api_key"] = openrouter_api_key
         params["openrouter_api_base"] = openrouter_base_url
 
+        client_params = {
+            key: params[key]
+            for key in ("max_tokens", "timeout", "max_retries")
+            if key in params
+        }
+
         self.client = ChatOpenAI(
             temperature=0.7,
             api_key=params.get("openrouter_api_key"),
             base_url=params.get("openrouter_api_base"),
+            **client_params,
         )
 
     def run(
@@ -35,6 +42,7 @@ class OpenRouterAdapter(RAGAdapterMixin):
     ) -> Tuple[str, TokenUsage]:
         resp = self.client.invoke(input=messages, **params)
         content = resp.content
+        self.last_finish_reason = resp.response_metadata.get("finish_reason")
 
         if isinstance(content, list):
             content = " ".join(str(item) for item in content)
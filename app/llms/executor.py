@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.core.config import settings
 from app.llms.adaper.image_models.nano_banana import NanoBananaAdapter
@@ -8,6 +8,21 @@ from app.llms.adaper.text_models.open_router import OpenRouterAdapter
 from app.llms.adaper.text_models.openai import OpenAIAdapter
 from app.schemas.token_usage import TokenUsage
 
+# Finish reasons reported when generation stopped at the output token limit:
+# "length" for OpenAI-compatible APIs, "MAX_TOKENS" for Gemini.
+_TRUNCATED_FINISH_REASONS = {"length", "MAX_TOKENS"}
+
+
+class LLMOutputTruncatedError(Exception):
+    """Raised when a capped completion stops at its ``max_tokens`` limit."""
+
+    def __init__(self, model: str, max_tokens: int):
+        super().__init__(
+            f"{model} stopped at the {max_tokens}-token output limit"
+        )
+        self.model = model
+        self.max_tokens = max_tokens
+
 
 class LLMExecutor:
     def __init__(self) -> None:
@@ -35,11 +50,46 @@ class LLMExecutor:
         raise ValueError(f"Unknown image provider: {provider}")
 
     def batch(
-        self, provider: str, model: str, messages, **params
+        self,
+        provider: str,
+        model: str,
+        messages,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        **params,
     ) -> Tuple[str, TokenUsage]:
+        """Run a single completion.
+
+        ``max_tokens``, ``timeout`` and ``max_retries`` are applied to the
+        underlying chat client so a runaway generation or a stalled request
+        cannot hold the worker indefinitely.
+
+        Raises:
+            LLMOutputTruncatedError: If ``max_tokens`` is set and the model
+                stopped because it reached that limit.
+        """
+        client_params = {
+            key: value
+            for key, value in (
+                ("max_tokens", max_tokens),
+                ("timeout", timeout),
+                ("max_retries", max_retries),
+            )
+            if value is not None
+        }
         adapter_class = self._text_adapter(provider)
-        adapter = adapter_class(model_name=model)
-        return adapter.run(model=model, messages=messages, **params)
+        adapter = adapter_class(model_name=model, **client_params)
+        result = adapter.run(model=model, messages=messages, **params)
+
+        finish_reason = getattr(adapter, "last_finish_reason", None)
+        if (
+            max_tokens is not None
+            and finish_reason in _TRUNCATED_FINISH_REASONS
+        ):
+            raise LLMOutputTruncatedError(model, max_tokens)
+
+        return result
 
     def stream(
         self, provider: str, model: str, messages, **params
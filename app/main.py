@@ -103,7 +103,8 @@ async def lifespan(app: FastAPI):
             print("Vertex AI initialization skipped - using mock mode")
             return
 
-        service_account_info = json.load(open(settings.service_account_json))
+        with open(settings.service_account_json, encoding="utf-8") as f:
+            service_account_info = json.load(f)
         credentials = service_account.Credentials.from_service_account_info(
             service_account_info
         )
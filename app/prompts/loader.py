@@ -10,6 +10,8 @@ import yaml
 
 ROOT = Path(__file__).resolve().parent
 REGISTRY = ROOT / "registry.yaml"
+# libyaml's C parser when PyYAML was built with it, the pure-Python one if not
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 """
 Prompt loading and rendering with variable substitution.
@@ -32,42 +34,60 @@ class PromptStore:
     def __init__(self, base_dir: Path = ROOT):
         self.base = base_dir
 
-    @lru_cache(maxsize=64)
-    def _load_registry(self) -> Dict[str, Any]:
-        """Load the prompt registry from a YAML file."""
-        with open(REGISTRY, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _load_registry() -> Dict[str, Any]:
+        """
+        Load the prompt registry from a YAML file.
+
+        The registry is module-level, so it is parsed once per process
+        and shared by every store rather than re-read per instance.
+        Returns:
+            Dict[str, Any]: The parsed registry.
+        """
+        # Raw bytes let the loader decode UTF-8 itself
+        return yaml.load(REGISTRY.read_bytes(), Loader=YAML_LOADER) or {}
 
-    def _spec(self, key: str) -> PromptSpec:
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _spec(base: Path, key: str) -> PromptSpec:
         """
         Get the PromptSpec for a given key.
         Raises KeyError if the key is not found.
+
+        Cached per base directory and key rather than per instance, so
+        stores created per request share specs already resolved.
         Args:
+            base: The directory prompt paths are relative to.
             key: The prompt key to look up.
         Returns:
             PromptSpec: The specification for the prompt.
         Raises:
             KeyError: If the prompt key is not found in the registry.
         """
-        reg = self._load_registry().get("prompts", {})
+        reg = PromptStore._load_registry().get("prompts", {})
 
         if key not in reg:
             raise KeyError(f"Prompt key not found: {key}")
 
         entry = reg[key]
-        path = self.base / entry["path"]
+        path = base / entry["path"]
         fmt = entry.get("format", "st")
         defaults = entry.get("defaults")
-        defaults_path = self.base / defaults if defaults else None
+        defaults_path = base / defaults if defaults else None
 
         return PromptSpec(
             key=key, path=path, format=fmt, defaults_path=defaults_path
         )
 
-    @lru_cache(maxsize=128)
-    def _load_text(self, path: Path) -> str:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _load_text(path: Path) -> str:
         """
         Load the text content of a prompt file.
+
+        Cached per path rather than per instance, so stores created per
+        request reuse templates already read by any other store.
         Args:
             path: The path to the prompt file.
         Returns:
@@ -87,7 +107,7 @@ class PromptStore:
             return {}
 
         return (
-            yaml.safe_load(spec.defaults_path.read_text(encoding="utf-8"))
+            yaml.load(spec.defaults_path.read_bytes(), Loader=YAML_LOADER)
             or {}
         )
 
@@ -100,7 +120,7 @@ class PromptStore:
         Returns:
             str: The rendered prompt text.
         """
-        spec = self._spec(key)
+        spec = self._spec(self.base, key)
         text = self._load_text(spec.path)
 
         if vars is None:
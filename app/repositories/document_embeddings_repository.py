@@ -62,9 +62,8 @@ class DocumentEmbeddingsRepository:
         if self._embeddings is None:
             # Initialize Vertex AI
             if self.service_account_file:
-                service_account_info = json.load(
-                    open(self.service_account_file)
-                )
+                with open(self.service_account_file, encoding="utf-8") as f:
+                    service_account_info = json.load(f)
                 credentials = (
                     service_account.Credentials.from_service_account_info(
                         service_account_info
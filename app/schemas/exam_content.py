@@ -1,9 +1,14 @@
 """Schemas for exam and question generation."""
 
+import re
 from datetime import datetime
-from typing import Any, Dict, List, Literal, Optional, Union
+from functools import cached_property
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, model_validator
+
+# A {{answer|alternative}} placeholder in fill in the blank text
+_BLANK_RE = re.compile(r"\{\{([^}]+)\}\}")
 
 
 class Topic(BaseModel):
@@ -312,6 +317,7 @@ class MultipleChoiceData(BaseModel):
 
     class Config:
         populate_by_name = True
+        frozen = True
 
 
 class FillInBlankData(BaseModel):
@@ -336,6 +342,12 @@ class FillInBlankData(BaseModel):
 
     class Config:
         populate_by_name = True
+        frozen = True
+
+    @cached_property
+    def num_blanks(self) -> int:
+        """Number of {{...}} placeholders, counted in one scan on first use."""
+        return len(_BLANK_RE.findall(self.data))
 
 
 class MatchingPair(BaseModel):
@@ -361,6 +373,7 @@ class MatchingData(BaseModel):
 
     class Config:
         populate_by_name = True
+        frozen = True
 
 
 class OpenEndedData(BaseModel):
@@ -374,6 +387,15 @@ class OpenEndedData(BaseModel):
 
     class Config:
         populate_by_name = True
+        frozen = True
+
+
+# Tagged on data.type, so validation goes straight to the matching model
+# instead of trying each one in turn
+QuestionData = Annotated[
+    Union[MultipleChoiceData, FillInBlankData, MatchingData, OpenEndedData],
+    Field(discriminator="type"),
+]
 
 
 class Question(BaseModel):
@@ -396,14 +418,90 @@ class Question(BaseModel):
         alias="context_id",
         description="ID of the context this question belongs to (for context-based questions)",
     )
-    data: Union[
-        MultipleChoiceData, FillInBlankData, MatchingData, OpenEndedData
-    ]
+    data: QuestionData
     point: float = Field(default=1.0, ge=0)
 
     class Config:
         populate_by_name = True
 
+    @model_validator(mode="before")
+    @classmethod
+    def default_data_type(cls, values: Any) -> Any:
+        """Take data.type from the question type when the data omits it."""
+        if isinstance(values, dict):
+            data = values.get("data")
+            if isinstance(data, dict) and "type" not in data:
+                values = {
+                    **values,
+                    "data": {**data, "type": values.get("type")},
+                }
+        return values
+
+
+# Built once; validating raw dicts through it skips Question's kwargs path
+QUESTION_ADAPTER: TypeAdapter[Question] = TypeAdapter(Question)
+
+
+def validate_question(data: Dict[str, Any]) -> Question:
+    """
+    Validate one raw question dict, e.g. parsed from LLM output.
+
+    Args:
+        data: Question fields as produced by the model
+
+    Returns:
+        Question: The validated question.
+
+    Raises:
+        ValidationError: If the data does not match the schema.
+    """
+    return QUESTION_ADAPTER.validate_python(data)
+
+
+QUESTION_LIST_ADAPTER: TypeAdapter[List[Question]] = TypeAdapter(
+    List[Question]
+)
+
+
+def validate_questions(data: List[Dict[str, Any]]) -> List[Question]:
+    """
+    Validate a list of raw question dicts in one call.
+
+    pydantic-core loops over the items itself instead of one Python-level
+    validate_question call per question.
+
+    Args:
+        data: Question dicts as produced by the model
+
+    Returns:
+        List[Question]: The validated questions.
+
+    Raises:
+        ValidationError: If any item does not match the schema; error
+            locations start with the item's index.
+    """
+    return QUESTION_LIST_ADAPTER.validate_python(data)
+
+
+def validate_questions_json(raw: Union[str, bytes]) -> List[Question]:
+    """
+    Parse and validate a JSON array of questions in one pass.
+
+    pydantic-core decodes the JSON itself, so no intermediate dicts are
+    built in Python as with json.loads followed by validation.
+
+    Args:
+        raw: JSON text or UTF-8 bytes holding a list of questions
+
+    Returns:
+        List[Question]: The validated questions.
+
+    Raises:
+        ValidationError: If the JSON is malformed or does not match the
+            schema; a malformed document reports a json_invalid error.
+    """
+    return QUESTION_LIST_ADAPTER.validate_json(raw)
+
 
 class GenerateQuestionsRequest(BaseModel):
     """Request to generate questions from a matrix."""
@@ -453,7 +551,9 @@ class GenerateQuestionsFromTopicRequest(BaseModel):
 
     topic: str = Field(..., description="Topic or chapter name")
     grade: Literal["K", "1", "2", "3", "4", "5"]
-    subject: str = Field(..., description="Subject code: T, TV, TA")
+    subject: Literal["T", "TV", "TA"] = Field(
+        ..., description="Subject code: T, TV, TA"
+    )
 
     questions_per_difficulty: Dict[
         Literal[
@@ -491,7 +591,9 @@ class GenerateQuestionsFromContextRequest(BaseModel):
     )
 
     grade: Literal["K", "1", "2", "3", "4", "5"]
-    subject: str = Field(..., description="Subject code: T, TV, TA")
+    subject: Literal["T", "TV", "TA"] = Field(
+        ..., description="Subject code: T, TV, TA"
+    )
 
     questions_per_difficulty: Dict[
         Literal[
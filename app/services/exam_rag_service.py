@@ -12,9 +12,12 @@ from app.schemas.exam_content import (
     MatrixDimensions,
     MatrixMetadata,
     Question,
+    validate_questions_json,
 )
 from app.services.base_rag_service import BaseRagService
 
+_CODE_FENCE_RE = re.compile(r"```(?:json)?\s*\n?(.*?)\n?```", re.DOTALL)
+
 
 class ExamRagService(BaseRagService):
     """Service for generating exam content (matrices and questions) using RAG.
@@ -33,8 +36,7 @@ class ExamRagService(BaseRagService):
             Extracted JSON string
         """
         result_text = result.strip()
-        code_fence_pattern = r"```(?:json)?\s*\n?(.*?)\n?```"
-        match = re.search(code_fence_pattern, result_text, re.DOTALL)
+        match = _CODE_FENCE_RE.search(result_text)
         if match:
             return match.group(1).strip()
         return result_text
@@ -217,25 +219,9 @@ class ExamRagService(BaseRagService):
 
         try:
             result_text = self._extract_json(result["answer"])
-            questions_data = json.loads(result_text)
-
-            if not isinstance(questions_data, list):
-                raise ValueError(
-                    f"Expected list of questions, got {type(questions_data)}"
-                )
-
-            questions = []
-            for i, q in enumerate(questions_data):
-                try:
-                    question = Question(**q)
-                    questions.append(question)
-                except Exception as e:
-                    print(f"[ERROR] Failed to parse question {i}: {e}")
-                    raise ValueError(
-                        f"Invalid question format at index {i}: {e}"
-                    )
-
-            return questions
+            # Decoded and validated in one pass by pydantic-core; errors
+            # name the index of the offending question
+            return validate_questions_json(result_text)
 
         except Exception as e:
             raise ValueError(f"Failed to generate questions with RAG: {e}")
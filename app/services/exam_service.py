@@ -8,6 +8,7 @@ from datetime import datetime
 from typing import Any, AsyncGenerator, Dict, List
 
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from pydantic import ValidationError
 
 from app.llms.executor import LLMExecutor
 from app.prompts.loader import PromptStore
@@ -32,10 +33,15 @@ from app.schemas.exam_content import (
     Topic,
     TopicWithQuestions,
     UsedContext,
+    validate_questions,
+    validate_questions_json,
 )
 
 logger = logging.getLogger(__name__)
 
+# Matches ```json or ``` followed by content and closing ```
+_CODE_FENCE_RE = re.compile(r"```(?:json)?\s*\n?(.*?)\n?```", re.DOTALL)
+
 
 class ExamService:
     """Service for generating exams and questions using AI."""
@@ -180,6 +186,55 @@ class ExamService:
         except Exception as e:
             raise ValueError(f"Failed to create matrix: {e}")
 
+    def _parse_questions_json(
+        self, result_text: str, total_questions: int
+    ) -> List[Question]:
+        """Parse and validate a JSON list of questions from the LLM.
+
+        pydantic-core decodes and validates the text in a single pass,
+        without building an intermediate list of dicts first.
+
+        Args:
+            result_text: JSON text extracted from the LLM response
+            total_questions: Number of questions that were requested
+
+        Returns:
+            List of validated Question objects
+
+        Raises:
+            ValueError: If the text is not JSON, not a list, or a question
+                does not match the schema
+        """
+        try:
+            questions = validate_questions_json(result_text)
+        except ValidationError as e:
+            error = e.errors()[0]
+            if error["type"] == "json_invalid":
+                logger.error(
+                    f"[EXAM_SERVICE] JSON parsing error: {error['msg']}"
+                )
+                raise ValueError(
+                    f"Invalid JSON response from LLM: {error['msg']}"
+                )
+            if not error["loc"]:
+                raise ValueError(
+                    f"Expected list of questions, got {type(error['input'])}"
+                )
+            i = error["loc"][0]
+            logger.error(f"[EXAM_SERVICE] Failed to parse question {i}: {e}")
+            raise ValueError(f"Invalid question format at index {i}: {e}")
+
+        # Validate count
+        if len(questions) != total_questions:
+            logger.warning(
+                f"[EXAM_SERVICE] Expected {total_questions} questions, got {len(questions)}"
+            )
+
+        logger.info(
+            f"[EXAM_SERVICE] Successfully generated {len(questions)} questions"
+        )
+        return questions
+
     def _extract_json(self, result: str) -> str:
         """Extract JSON from potential markdown code blocks.
 
@@ -188,9 +243,7 @@ class ExamService:
         result_text = result.strip()
 
         # Try to extract JSON from code fences using regex
-        # Matches ```json or ``` followed by content and closing ```
-        code_fence_pattern = r"```(?:json)?\s*\n?(.*?)\n?```"
-        match = re.search(code_fence_pattern, result_text, re.DOTALL)
+        match = _CODE_FENCE_RE.search(result_text)
         if match:
             return match.group(1).strip()
 
@@ -429,24 +482,20 @@ class ExamService:
             questions_data: Raw question data from LLM
             topic_to_context: Optional mapping of topic_index to context_id
         """
-        questions = []
-        for i, q in enumerate(questions_data):
-            try:
-                # Set contextId if this question belongs to a context-based topic
-                if topic_to_context:
-                    topic_id = q.get("topicId")
-                    if topic_id is not None and topic_id in topic_to_context:
-                        q["contextId"] = topic_to_context[topic_id]
-
-                question = Question(**q)
-                questions.append(question)
-            except Exception as e:
-                logger.error(
-                    f"[EXAM_SERVICE] Failed to parse question {i}: {e}"
-                )
-                logger.error(f"[EXAM_SERVICE] Question data: {q}")
-                raise ValueError(f"Invalid question format at index {i}: {e}")
-        return questions
+        # Set contextId on questions that belong to a context-based topic
+        if topic_to_context:
+            for q in questions_data:
+                topic_id = q.get("topicId")
+                if topic_id is not None and topic_id in topic_to_context:
+                    q["contextId"] = topic_to_context[topic_id]
+
+        try:
+            return validate_questions(questions_data)
+        except ValidationError as e:
+            i = e.errors()[0]["loc"][0]
+            logger.error(f"[EXAM_SERVICE] Failed to parse question {i}: {e}")
+            logger.error(f"[EXAM_SERVICE] Question data: {questions_data[i]}")
+            raise ValueError(f"Invalid question format at index {i}: {e}")
 
     # # TODO: Do it later
     #     async def generate_questions_from_matrix_stream(
@@ -643,46 +692,10 @@ class ExamService:
             f"[EXAM_SERVICE] LLM call completed. Tokens: input={token_usage.input_tokens}, output={token_usage.output_tokens}"
         )
 
-        # Parse result
-        try:
-            result_text = self._extract_json(result)
-            questions_data = json.loads(result_text)
-
-            # Validate is list
-            if not isinstance(questions_data, list):
-                raise ValueError(
-                    f"Expected list of questions, got {type(questions_data)}"
-                )
-
-            # Validate count
-            if len(questions_data) != total_questions:
-                logger.warning(
-                    f"[EXAM_SERVICE] Expected {total_questions} questions, got {len(questions_data)}"
-                )
-
-            # Convert to Question objects with validation
-            questions = []
-            for i, q in enumerate(questions_data):
-                try:
-                    question = Question(**q)
-                    questions.append(question)
-                except Exception as e:
-                    logger.error(
-                        f"[EXAM_SERVICE] Failed to parse question {i}: {e}"
-                    )
-                    logger.error(f"[EXAM_SERVICE] Question data: {q}")
-                    raise ValueError(
-                        f"Invalid question format at index {i}: {e}"
-                    )
-
-            logger.info(
-                f"[EXAM_SERVICE] Successfully generated {len(questions)} questions"
-            )
-            return questions
-
-        except json.JSONDecodeError as e:
-            logger.error(f"[EXAM_SERVICE] JSON parsing error: {e}")
-            raise ValueError(f"Invalid JSON response from LLM: {e}")
+        # Parse and validate the JSON in one pass
+        return self._parse_questions_json(
+            self._extract_json(result), total_questions
+        )
 
     def generate_questions_from_context(
         self, request: GenerateQuestionsFromContextRequest
@@ -807,43 +820,7 @@ class ExamService:
             f"[EXAM_SERVICE] LLM call completed. Tokens: input={token_usage.input_tokens}, output={token_usage.output_tokens}"
         )
 
-        # Parse result
-        try:
-            result_text = self._extract_json(result)
-            questions_data = json.loads(result_text)
-
-            # Validate is list
-            if not isinstance(questions_data, list):
-                raise ValueError(
-                    f"Expected list of questions, got {type(questions_data)}"
-                )
-
-            # Validate count
-            if len(questions_data) != total_questions:
-                logger.warning(
-                    f"[EXAM_SERVICE] Expected {total_questions} questions, got {len(questions_data)}"
-                )
-
-            # Convert to Question objects with validation
-            questions = []
-            for i, q in enumerate(questions_data):
-                try:
-                    question = Question(**q)
-                    questions.append(question)
-                except Exception as e:
-                    logger.error(
-                        f"[EXAM_SERVICE] Failed to parse question {i}: {e}"
-                    )
-                    logger.error(f"[EXAM_SERVICE] Question data: {q}")
-                    raise ValueError(
-                        f"Invalid question format at index {i}: {e}"
-                    )
-
-            logger.info(
-                f"[EXAM_SERVICE] Successfully generated {len(questions)} questions"
-            )
-            return questions
-
-        except json.JSONDecodeError as e:
-            logger.error(f"[EXAM_SERVICE] JSON parsing error: {e}")
-            raise ValueError(f"Invalid JSON response from LLM: {e}")
+        # Parse and validate the JSON in one pass
+        return self._parse_questions_json(
+            self._extract_json(result), total_questions
+        )
@@ -1,3 +1,4 @@
+import functools
 import json
 import logging
 from typing import Any, Dict, Optional
@@ -8,14 +9,16 @@ from openai import (
     AuthenticationError,
     RateLimitError,
 )
+from pydantic import ConfigDict, TypeAdapter
 
 from app.core.config import settings
 from app.core.exceptions import (
     AIAuthenticationError,
+    AIOutputTruncatedError,
     AIRateLimitError,
     AIServiceError,
 )
-from app.llms.executor import LLMExecutor
+from app.llms.executor import LLMExecutor, LLMOutputTruncatedError
 from app.prompts.loader import PromptStore
 from app.schemas.modification import (
     ExpandCombinedTextRequest,
@@ -29,6 +32,71 @@ from app.schemas.modification import (
 
 logger = logging.getLogger("uvicorn.error")
 
+# Per-operation floors over ``settings.llm_max_tokens``. Node expansion emits
+# whole subtrees and needs a larger budget. Nothing is capped below the
+# configured default: Gemini 2.5 models count thinking tokens against the
+# same budget, so small caps cut off the visible answer. Entries in
+# ``settings.llm_op_max_tokens`` (LLM_OP_MAX_TOKENS) take precedence.
+_OP_TOKEN_CAPS = {
+    "expand_mindmap_node": 4096,
+}
+
+
+def _max_tokens(op_name: str) -> int:
+    """Return the output token cap for a modification operation."""
+    if op_name in settings.llm_op_max_tokens:
+        return settings.llm_op_max_tokens[op_name]
+    return max(settings.llm_max_tokens, _OP_TOKEN_CAPS.get(op_name, 0))
+
+
+# Serializes JSON payloads (slide schemas, items, nodes) through pydantic-core
+# instead of the stdlib encoder. Non-ASCII characters are kept as-is and
+# NaN/Infinity are written as literals, as ``json.dumps`` does; the only
+# difference in the prompt text is the compact separators.
+_JSON_ADAPTER = TypeAdapter(
+    Any, config=ConfigDict(ser_json_inf_nan="constants")
+)
+
+
+def _dump_json(value: Any) -> str:
+    return _JSON_ADAPTER.dump_json(value).decode("utf-8")
+
+
+def _llm_exceptions(op_name: str, failure_message: str):
+    """Translate provider errors raised by a service method into HTTP errors.
+
+    Args:
+        op_name: Operation name used when logging unexpected errors.
+        failure_message: Prefix of the detail for unexpected errors.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except AuthenticationError as e:
+                raise AIAuthenticationError(
+                    f"AI service authentication failed: {str(e)}"
+                )
+            except RateLimitError as e:
+                raise AIRateLimitError(f"OpenAI rate limit exceeded: {str(e)}")
+            except LLMOutputTruncatedError as e:
+                logger.warning("%s output truncated: %s", op_name, e)
+                raise AIOutputTruncatedError(
+                    f"AI response was cut off at the {e.max_tokens}-token "
+                    "output limit"
+                )
+            except OpenAIAPIError as e:
+                raise AIServiceError(f"OpenAI API error: {str(e)}")
+            except Exception as e:
+                logger.exception("Unexpected error in %s", op_name)
+                raise AIServiceError(f"{failure_message}: {str(e)}")
+
+        return wrapper
+
+    return decorator
+
 
 class ModificationService:
     def __init__(self, llm_executor: LLMExecutor, prompt_store: PromptStore):
@@ -70,483 +138,410 @@ class ModificationService:
                 cleaned = cleaned[:-3].strip()
         return json.loads(cleaned)
 
+    @_llm_exceptions("refine_content", "Failed to refine content")
     def refine_content(self, request: RefineContentRequest) -> Dict[str, Any]:
-        try:
-            slide_type = ""
-            if request.context and request.context.slideType:
-                slide_type = request.context.slideType
-
-            # Determine which prompt to use based on operation
-            operation = self._get_operation(
-                request.instruction, request.operation
-            )
-            prompt_key = f"modification.slide.{operation}"
-
-            prompt = self._render(
-                prompt_key,
-                {
-                    "context_json": json.dumps(
-                        request.schema, ensure_ascii=False
-                    ),
-                    "instruction": request.instruction,
-                    "slide_type": slide_type,
-                },
-            )
-
-            text, usage = self.llm_executor.batch(
-                provider=request.provider,
-                model=request.model,
-                messages=[HumanMessage(content=prompt)],
-            )
-            logger.info(
-                "refine_content tokens: %s",
-                usage.total_tokens if usage else "N/A",
-            )
-
-            parsed = self._extract_json(text)
-            return {"schema": parsed}
-        except AuthenticationError as e:
-            raise AIAuthenticationError(
-                f"OpenAI authentication failed: {str(e)}"
-            )
-        except RateLimitError as e:
-            raise AIRateLimitError(f"OpenAI rate limit exceeded: {str(e)}")
-        except OpenAIAPIError as e:
-            raise AIServiceError(f"OpenAI API error: {str(e)}")
-        except Exception as e:
-            logger.exception("Unexpected error in refine_content")
-            raise AIServiceError(f"Failed to refine content: {str(e)}")
-
+        slide_type = ""
+        if request.context and request.context.slideType:
+            slide_type = request.context.slideType
+
+        # Determine which prompt to use based on operation
+        operation = self._get_operation(request.instruction, request.operation)
+        prompt_key = f"modification.slide.{operation}"
+
+        prompt = self._render(
+            prompt_key,
+            {
+                "context_json": _dump_json(request.schema),
+                "instruction": request.instruction,
+                "slide_type": slide_type,
+            },
+        )
+
+        text, usage = self.llm_executor.batch(
+            provider=request.provider,
+            model=request.model,
+            messages=[HumanMessage(content=prompt)],
+            max_tokens=_max_tokens("refine_content"),
+            timeout=settings.llm_timeout,
+            max_retries=settings.max_retries,
+        )
+        logger.info(
+            "refine_content tokens: %s",
+            usage.total_tokens if usage else "N/A",
+        )
+
+        parsed = self._extract_json(text)
+        return {"schema": parsed}
+
+    @_llm_exceptions("transform_layout", "Failed to transform layout")
     def transform_layout(
         self, request: TransformLayoutRequest
     ) -> Dict[str, Any]:
-        try:
-            prompt = self._render(
-                "modification.slide.layout",
-                {
-                    "source_json": json.dumps(
-                        request.currentSchema, ensure_ascii=False
-                    ),
-                    "target_type": request.targetType,
-                },
-            )
-
-            text, usage = self.llm_executor.batch(
-                provider=request.provider,
-                model=request.model,
-                messages=[HumanMessage(content=prompt)],
-            )
-            logger.info(
-                "transform_layout tokens: %s",
-                usage.total_tokens if usage else "N/A",
-            )
-
-            parsed = self._extract_json(text)
-            return {"schema": parsed}
-        except AuthenticationError as e:
-            raise AIAuthenticationError(
-                f"AI service authentication failed: {str(e)}"
-            )
-        except RateLimitError as e:
-            raise AIRateLimitError(f"OpenAI rate limit exceeded: {str(e)}")
-        except OpenAIAPIError as e:
-            raise AIServiceError(f"OpenAI API error: {str(e)}")
-        except Exception as e:
-            logger.exception("Unexpected error in transform_layout")
-            raise AIServiceError(f"Failed to transform layout: {str(e)}")
-
+        prompt = self._render(
+            "modification.slide.layout",
+            {
+                "source_json": _dump_json(request.currentSchema),
+                "target_type": request.targetType,
+            },
+        )
+
+        text, usage = self.llm_executor.batch(
+            provider=request.provider,
+            model=request.model,
+            messages=[HumanMessage(content=prompt)],
+            max_tokens=_max_tokens("transform_layout"),
+            timeout=settings.llm_timeout,
+            max_retries=settings.max_retries,
+        )
+        logger.info(
+            "transform_layout tokens: %s",
+            usage.total_tokens if usage else "N/A",
+        )
+
+        parsed = self._extract_json(text)
+        return {"schema": parsed}
+
+    @_llm_exceptions("refine_element_text", "Failed to refine text")
     def refine_element_text(
         self, request: RefineElementTextRequest
     ) -> Dict[str, Any]:
         """Refine text content of a specific element."""
-        try:
-            slide_context = ""
-            if request.slideType:
-                slide_context += f"Slide layout type: {request.slideType}. "
-            if request.slideSchema:
-                title = request.slideSchema.get("title", "")
-                if title:
-                    slide_context += f"Slide title: {title}. "
-
-            # Determine which prompt to use based on operation
-            operation = self._get_operation(
-                request.instruction, request.operation
-            )
-            prompt_key = f"modification.element.{operation}"
-
-            prompt = self._render(
-                prompt_key,
-                {
-                    "current_text": request.currentText,
-                    "slide_context": slide_context,
-                },
-            )
-
-            text, usage = self.llm_executor.batch(
-                provider=request.provider,
-                model=request.model,
-                messages=[HumanMessage(content=prompt)],
-            )
-            logger.info(
-                "refine_element_text tokens: %s",
-                usage.total_tokens if usage else "N/A",
-            )
-
-            return {"refinedText": text.strip()}
-        except AuthenticationError as e:
-            raise AIAuthenticationError(
-                f"AI service authentication failed: {str(e)}"
-            )
-        except RateLimitError as e:
-            raise AIRateLimitError(f"OpenAI rate limit exceeded: {str(e)}")
-        except OpenAIAPIError as e:
-            raise AIServiceError(f"OpenAI API error: {str(e)}")
-        except Exception as e:
-            logger.exception("Unexpected error in refine_element_text")
-            raise AIServiceError(f"Failed to refine text: {str(e)}")
-
+        slide_context = ""
+        if request.slideType:
+            slide_context += f"Slide layout type: {request.slideType}. "
+        if request.slideSchema:
+            title = request.slideSchema.get("title", "")
+            if title:
+                slide_context += f"Slide title: {title}. "
+
+        # Determine which prompt to use based on operation
+        operation = self._get_operation(request.instruction, request.operation)
+        prompt_key = f"modification.element.{operation}"
+
+        prompt = self._render(
+            prompt_key,
+            {
+                "current_text": request.currentText,
+                "slide_context": slide_context,
+            },
+        )
+
+        text, usage = self.llm_executor.batch(
+            provider=request.provider,
+            model=request.model,
+            messages=[HumanMessage(content=prompt)],
+            max_tokens=_max_tokens("refine_element_text"),
+            timeout=settings.llm_timeout,
+            max_retries=settings.max_retries,
+        )
+        logger.info(
+            "refine_element_text tokens: %s",
+            usage.total_tokens if usage else "N/A",
+        )
+
+        return {"refinedText": text.strip()}
+
+    @_llm_exceptions("expand_combined_text", "Failed to refine combined text")
     def expand_combined_text(
         self, request: ExpandCombinedTextRequest
     ) -> Dict[str, Any]:
         """Expand content of combined text items."""
-        try:
-            slide_context = ""
-            if request.slideType:
-                slide_context += f"Slide layout type: {request.slideType}. "
-            if request.slideSchema:
-                title = request.slideSchema.get("title", "")
-                if title:
-                    slide_context += f"Slide title: {title}. "
-
-            # Convert items to JSON for the prompt
-            items_json = json.dumps(request.items, ensure_ascii=False)
-
-            # Determine which prompt to use based on operation
-            operation = self._get_operation(
-                request.instruction, request.operation
-            )
-            prompt_key = f"modification.combined_text.{operation}_items"
-
-            prompt = self._render(
-                prompt_key,
-                {
-                    "items_json": items_json,
-                    "slide_context": slide_context,
-                },
-            )
-
-            text, usage = self.llm_executor.batch(
-                provider=request.provider,
-                model=request.model,
-                messages=[HumanMessage(content=prompt)],
-            )
-            logger.info(
-                "refine_combined_text tokens: %s",
-                usage.total_tokens if usage else "N/A",
-            )
-
-            # Parse the refined items from the response
-            parsed = self._extract_json(text)
-            return {"expandedItems": parsed}
-        except AuthenticationError as e:
-            raise AIAuthenticationError(
-                f"AI service authentication failed: {str(e)}"
-            )
-        except RateLimitError as e:
-            raise AIRateLimitError(f"OpenAI rate limit exceeded: {str(e)}")
-        except OpenAIAPIError as e:
-            raise AIServiceError(f"OpenAI API error: {str(e)}")
-        except Exception as e:
-            logger.exception("Unexpected error in refine_combined_text")
-            raise AIServiceError(f"Failed to refine combined text: {str(e)}")
-
+        slide_context = ""
+        if request.slideType:
+            slide_context += f"Slide layout type: {request.slideType}. "
+        if request.slideSchema:
+            title = request.slideSchema.get("title", "")
+            if title:
+                slide_context += f"Slide title: {title}. "
+
+        # Convert items to JSON for the prompt
+        items_json = _dump_json(request.items)
+
+        # Determine which prompt to use based on operation
+        operation = self._get_operation(request.instruction, request.operation)
+        prompt_key = f"modification.combined_text.{operation}_items"
+
+        prompt = self._render(
+            prompt_key,
+            {
+                "items_json": items_json,
+                "slide_context": slide_context,
+            },
+        )
+
+        text, usage = self.llm_executor.batch(
+            provider=request.provider,
+            model=request.model,
+            messages=[HumanMessage(content=prompt)],
+            max_tokens=_max_tokens("expand_combined_text"),
+            timeout=settings.llm_timeout,
+            max_retries=settings.max_retries,
+        )
+        logger.info(
+            "expand_combined_text tokens: %s",
+            usage.total_tokens if usage else "N/A",
+        )
+
+        # Parse the refined items from the response
+        parsed = self._extract_json(text)
+        return {"expandedItems": parsed}
+
+    @_llm_exceptions("refine_mindmap_node", "Failed to refine mindmap node")
     def refine_mindmap_node(
         self, request: RefineNodeRequest
     ) -> Dict[str, Any]:
         """Refine a mindmap node's content (expand, shorten, fix grammar, formalize)."""
-        try:
-            # Build tree context information
-            tree_context = ""
-            if request.context:
-                # Main mindmap topic
-                if request.context.mindmapTitle:
-                    tree_context += (
-                        f"Mindmap Topic: {request.context.mindmapTitle}. "
-                    )
-
-                # Educational metadata
-                if request.context.grade:
-                    tree_context += f"Grade Level: {request.context.grade}. "
-                if request.context.subject:
-                    tree_context += f"Subject: {request.context.subject}. "
-
-                # Hierarchy context
-                if request.context.rootNodeContent:
-                    tree_context += (
-                        f"Root Concept: {request.context.rootNodeContent}. "
-                    )
-
-                if (
-                    request.context.fullAncestryPath
-                    and len(request.context.fullAncestryPath) > 0
-                ):
-                    ancestry = " → ".join(request.context.fullAncestryPath)
-                    tree_context += f"Hierarchy Path: {ancestry}. "
-
-                if request.context.parentContent:
-                    tree_context += (
-                        f"Parent Concept: {request.context.parentContent}. "
-                    )
-
-                # Sibling context for consistency
-                if (
-                    request.context.siblingContents
-                    and len(request.context.siblingContents) > 0
-                ):
-                    siblings = ", ".join(
-                        request.context.siblingContents[:8]
-                    )  # Limit to 8
-                    tree_context += f"Related Sibling Concepts: {siblings}. "
-
-            # Determine which prompt to use based on operation
-            operation = self._get_operation(
-                request.instruction, request.operation
-            )
-            prompt_key = f"modification.mindmap.{operation}"
-
-            # Prepare grade level text for prompt
-            grade_level = ""
-            if request.context and request.context.grade:
-                grade_level = f" for {request.context.grade}"
-
-            prompt = self._render(
-                prompt_key,
-                {
-                    "current_content": request.currentContent,
-                    "tree_context": tree_context,
-                    "instruction": request.instruction,
-                    "grade_level": grade_level,
-                },
-            )
-
-            text, usage = self.llm_executor.batch(
-                provider=request.provider,
-                model=request.model,
-                messages=[HumanMessage(content=prompt)],
-            )
-            logger.info(
-                "refine_mindmap_node tokens: %s",
-                usage.total_tokens if usage else "N/A",
-            )
-
-            return {"refinedContent": text.strip()}
-        except AuthenticationError as e:
-            raise AIAuthenticationError(
-                f"AI service authentication failed: {str(e)}"
-            )
-        except RateLimitError as e:
-            raise AIRateLimitError(f"OpenAI rate limit exceeded: {str(e)}")
-        except OpenAIAPIError as e:
-            raise AIServiceError(f"OpenAI API error: {str(e)}")
-        except Exception as e:
-            logger.exception("Unexpected error in refine_mindmap_node")
-            raise AIServiceError(f"Failed to refine mindmap node: {str(e)}")
+        # Build tree context information
+        tree_context = ""
+        if request.context:
+            # Main mindmap topic
+            if request.context.mindmapTitle:
+                tree_context += (
+                    f"Mindmap Topic: {request.context.mindmapTitle}. "
+                )
 
+            # Educational metadata
+            if request.context.grade:
+                tree_context += f"Grade Level: {request.context.grade}. "
+            if request.context.subject:
+                tree_context += f"Subject: {request.context.subject}. "
+
+            # Hierarchy context
+            if request.context.rootNodeContent:
+                tree_context += (
+                    f"Root Concept: {request.context.rootNodeContent}. "
+                )
+
+            if (
+                request.context.fullAncestryPath
+                and len(request.context.fullAncestryPath) > 0
+            ):
+                ancestry = " → ".join(request.context.fullAncestryPath)
+                tree_context += f"Hierarchy Path: {ancestry}. "
+
+            if request.context.parentContent:
+                tree_context += (
+                    f"Parent Concept: {request.context.parentContent}. "
+                )
+
+            # Sibling context for consistency
+            if (
+                request.context.siblingContents
+                and len(request.context.siblingContents) > 0
+            ):
+                siblings = ", ".join(
+                    request.context.siblingContents[:8]
+                )  # Limit to 8
+                tree_context += f"Related Sibling Concepts: {siblings}. "
+
+        # Determine which prompt to use based on operation
+        operation = self._get_operation(request.instruction, request.operation)
+        prompt_key = f"modification.mindmap.{operation}"
+
+        # Prepare grade level text for prompt
+        grade_level = ""
+        if request.context and request.context.grade:
+            grade_level = f" for {request.context.grade}"
+
+        prompt = self._render(
+            prompt_key,
+            {
+                "current_content": request.currentContent,
+                "tree_context": tree_context,
+                "instruction": request.instruction,
+                "grade_level": grade_level,
+            },
+        )
+
+        text, usage = self.llm_executor.batch(
+            provider=request.provider,
+            model=request.model,
+            messages=[HumanMessage(content=prompt)],
+            max_tokens=_max_tokens("refine_mindmap_node"),
+            timeout=settings.llm_timeout,
+            max_retries=settings.max_retries,
+        )
+        logger.info(
+            "refine_mindmap_node tokens: %s",
+            usage.total_tokens if usage else "N/A",
+        )
+
+        return {"refinedContent": text.strip()}
+
+    @_llm_exceptions("expand_mindmap_node", "Failed to expand mindmap node")
     def expand_mindmap_node(
         self, request: ExpandNodeRequest
     ) -> Dict[str, Any]:
         """Generate child nodes for a mindmap node with AI."""
-        try:
-            # Build tree context information
-            tree_context = ""
-            if request.context:
-                # Main mindmap topic
-                if request.context.mindmapTitle:
-                    tree_context += (
-                        f"Mindmap Topic: {request.context.mindmapTitle}. "
-                    )
-
-                # Hierarchy context
-                if request.context.rootNodeContent:
-                    tree_context += (
-                        f"Root Concept: {request.context.rootNodeContent}. "
-                    )
-
-                if (
-                    request.context.fullAncestryPath
-                    and len(request.context.fullAncestryPath) > 0
-                ):
-                    ancestry = " → ".join(request.context.fullAncestryPath)
-                    tree_context += f"Hierarchy Path: {ancestry}. "
-
-                if request.context.parentContent:
-                    tree_context += (
-                        f"Parent Concept: {request.context.parentContent}. "
-                    )
-
-                # Sibling context for consistency
-                if (
-                    request.context.siblingContents
-                    and len(request.context.siblingContents) > 0
-                ):
-                    siblings = ", ".join(
-                        request.context.siblingContents[:8]
-                    )  # Limit to 8
-                    tree_context += f"Related Sibling Concepts: {siblings}. "
+        # Build tree context information
+        tree_context = ""
+        if request.context:
+            # Main mindmap topic
+            if request.context.mindmapTitle:
+                tree_context += (
+                    f"Mindmap Topic: {request.context.mindmapTitle}. "
+                )
 
+            # Hierarchy context
+            if request.context.rootNodeContent:
                 tree_context += (
-                    f"Current Level: {request.context.currentLevel}. "
+                    f"Root Concept: {request.context.rootNodeContent}. "
                 )
 
-            # Render system prompt that defines the JSON structure
-            system_prompt = self._render(
-                "mindmap.system",
-                {
-                    "maxDepth": str(request.maxDepth),
-                    "maxBranchesPerNode": str(request.maxChildren),
-                },
-            )
-
-            # Render user prompt with tree context
-            user_prompt = self._render(
-                "mindmap.user",
-                {
-                    "topic": request.nodeContent,
-                    "tree_context": tree_context,
-                    "maxDepth": str(request.maxDepth),
-                    "maxBranchesPerNode": str(request.maxChildren),
-                    "language": "",  # Empty - AI will auto-detect from content
-                    "grade": "",  # Empty - not used
-                    "subject": "",  # Empty - not used
-                },
-            )
-
-            # Call LLM with BOTH system and user prompts
-            text, usage = self.llm_executor.batch(
-                provider=request.provider,
-                model=request.model,
-                messages=[
-                    SystemMessage(content=system_prompt),
-                    HumanMessage(content=user_prompt),
-                ],
-            )
-            logger.info(
-                "expand_mindmap_node tokens: %s",
-                usage.total_tokens if usage else "N/A",
-            )
-
-            # Parse the hierarchical children structure
-            parsed = self._extract_json(text)
-            return {"children": parsed.get("children", [])}
-        except AuthenticationError as e:
-            raise AIAuthenticationError(
-                f"AI service authentication failed: {str(e)}"
-            )
-        except RateLimitError as e:
-            raise AIRateLimitError(f"OpenAI rate limit exceeded: {str(e)}")
-        except OpenAIAPIError as e:
-            raise AIServiceError(f"OpenAI API error: {str(e)}")
-        except Exception as e:
-            logger.exception("Unexpected error in expand_mindmap_node")
-            raise AIServiceError(f"Failed to expand mindmap node: {str(e)}")
+            if (
+                request.context.fullAncestryPath
+                and len(request.context.fullAncestryPath) > 0
+            ):
+                ancestry = " → ".join(request.context.fullAncestryPath)
+                tree_context += f"Hierarchy Path: {ancestry}. "
 
+            if request.context.parentContent:
+                tree_context += (
+                    f"Parent Concept: {request.context.parentContent}. "
+                )
+
+            # Sibling context for consistency
+            if (
+                request.context.siblingContents
+                and len(request.context.siblingContents) > 0
+            ):
+                siblings = ", ".join(
+                    request.context.siblingContents[:8]
+                )  # Limit to 8
+                tree_context += f"Related Sibling Concepts: {siblings}. "
+
+            tree_context += f"Current Level: {request.context.currentLevel}. "
+
+        # Render system prompt that defines the JSON structure
+        system_prompt = self._render(
+            "mindmap.system",
+            {
+                "maxDepth": str(request.maxDepth),
+                "maxBranchesPerNode": str(request.maxChildren),
+            },
+        )
+
+        # Render user prompt with tree context
+        user_prompt = self._render(
+            "mindmap.user",
+            {
+                "topic": request.nodeContent,
+                "tree_context": tree_context,
+                "maxDepth": str(request.maxDepth),
+                "maxBranchesPerNode": str(request.maxChildren),
+                "language": "",  # Empty - AI will auto-detect from content
+                "grade": "",  # Empty - not used
+                "subject": "",  # Empty - not used
+            },
+        )
+
+        # Call LLM with BOTH system and user prompts
+        text, usage = self.llm_executor.batch(
+            provider=request.provider,
+            model=request.model,
+            messages=[
+                SystemMessage(content=system_prompt),
+                HumanMessage(content=user_prompt),
+            ],
+            max_tokens=_max_tokens("expand_mindmap_node"),
+            timeout=settings.llm_timeout,
+            max_retries=settings.max_retries,
+        )
+        logger.info(
+            "expand_mindmap_node tokens: %s",
+            usage.total_tokens if usage else "N/A",
+        )
+
+        # Parse the hierarchical children structure
+        parsed = self._extract_json(text)
+        return {"children": parsed.get("children", [])}
+
+    @_llm_exceptions(
+        "refine_mindmap_branch", "Failed to refine mindmap branch"
+    )
     def refine_mindmap_branch(
         self, request: RefineBranchRequest
     ) -> Dict[str, Any]:
         """Refine multiple nodes in a mindmap branch together."""
-        try:
-            # Build tree context information
-            tree_context = ""
-            if request.context:
-                # Main mindmap topic
-                if request.context.mindmapTitle:
-                    tree_context += (
-                        f"Mindmap Topic: {request.context.mindmapTitle}. "
-                    )
-
-                # Educational metadata
-                if request.context.grade:
-                    tree_context += f"Grade Level: {request.context.grade}. "
-                if request.context.subject:
-                    tree_context += f"Subject: {request.context.subject}. "
-
-                # Hierarchy context
-                if request.context.rootNodeContent:
-                    tree_context += (
-                        f"Root Concept: {request.context.rootNodeContent}. "
-                    )
-
-                if (
-                    request.context.fullAncestryPath
-                    and len(request.context.fullAncestryPath) > 0
-                ):
-                    ancestry = " → ".join(request.context.fullAncestryPath)
-                    tree_context += f"Hierarchy Path: {ancestry}. "
-
-                if request.context.parentContent:
-                    tree_context += (
-                        f"Parent Concept: {request.context.parentContent}. "
-                    )
+        # Build tree context information
+        tree_context = ""
+        if request.context:
+            # Main mindmap topic
+            if request.context.mindmapTitle:
+                tree_context += (
+                    f"Mindmap Topic: {request.context.mindmapTitle}. "
+                )
+
+            # Educational metadata
+            if request.context.grade:
+                tree_context += f"Grade Level: {request.context.grade}. "
+            if request.context.subject:
+                tree_context += f"Subject: {request.context.subject}. "
 
+            # Hierarchy context
+            if request.context.rootNodeContent:
                 tree_context += (
-                    f"Current Level: {request.context.currentLevel}. "
+                    f"Root Concept: {request.context.rootNodeContent}. "
                 )
 
-            # Convert nodes to JSON for the prompt
-            nodes_json = json.dumps(
-                [
-                    {
-                        "nodeId": n.nodeId,
-                        "content": n.content,
-                        "level": n.level,
-                    }
-                    for n in request.nodes
-                ],
-                ensure_ascii=False,
-            )
-
-            # Determine which prompt to use based on operation
-            operation = self._get_operation(
-                request.instruction, request.operation
-            )
-            prompt_key = f"modification.mindmap.{operation}_branch"
-
-            # Prepare grade level text for prompt
-            grade_level = ""
-            if request.context and request.context.grade:
-                grade_level = f" for {request.context.grade}"
-
-            prompt = self._render(
-                prompt_key,
+            if (
+                request.context.fullAncestryPath
+                and len(request.context.fullAncestryPath) > 0
+            ):
+                ancestry = " → ".join(request.context.fullAncestryPath)
+                tree_context += f"Hierarchy Path: {ancestry}. "
+
+            if request.context.parentContent:
+                tree_context += (
+                    f"Parent Concept: {request.context.parentContent}. "
+                )
+
+            tree_context += f"Current Level: {request.context.currentLevel}. "
+
+        # Convert nodes to JSON for the prompt
+        nodes_json = _dump_json(
+            [
                 {
-                    "nodes_json": nodes_json,
-                    "tree_context": tree_context,
-                    "instruction": request.instruction,
-                    "grade_level": grade_level,
-                },
-            )
-
-            text, usage = self.llm_executor.batch(
-                provider=request.provider,
-                model=request.model,
-                messages=[HumanMessage(content=prompt)],
-            )
-            logger.info(
-                "refine_mindmap_branch tokens: %s",
-                usage.total_tokens if usage else "N/A",
-            )
-
-            # Parse refined nodes from response
-            parsed = self._extract_json(text)
-            return {"refinedNodes": parsed}
-        except AuthenticationError as e:
-            raise AIAuthenticationError(
-                f"AI service authentication failed: {str(e)}"
-            )
-        except RateLimitError as e:
-            raise AIRateLimitError(f"OpenAI rate limit exceeded: {str(e)}")
-        except OpenAIAPIError as e:
-            raise AIServiceError(f"OpenAI API error: {str(e)}")
-        except Exception as e:
-            logger.exception("Unexpected error in refine_mindmap_branch")
-            raise AIServiceError(f"Failed to refine mindmap branch: {str(e)}")
+                    "nodeId": n.nodeId,
+                    "content": n.content,
+                    "level": n.level,
+                }
+                for n in request.nodes
+            ]
+        )
+
+        # Determine which prompt to use based on operation
+        operation = self._get_operation(request.instruction, request.operation)
+        prompt_key = f"modification.mindmap.{operation}_branch"
+
+        # Prepare grade level text for prompt
+        grade_level = ""
+        if request.context and request.context.grade:
+            grade_level = f" for {request.context.grade}"
+
+        prompt = self._render(
+            prompt_key,
+            {
+                "nodes_json": nodes_json,
+                "tree_context": tree_context,
+                "instruction": request.instruction,
+                "grade_level": grade_level,
+            },
+        )
+
+        text, usage = self.llm_executor.batch(
+            provider=request.provider,
+            model=request.model,
+            messages=[HumanMessage(content=prompt)],
+            max_tokens=_max_tokens("refine_mindmap_branch"),
+            timeout=settings.llm_timeout,
+            max_retries=settings.max_retries,
+        )
+        logger.info(
+            "refine_mindmap_branch tokens: %s",
+            usage.total_tokens if usage else "N/A",
+        )
+
+        # Parse refined nodes from response
+        parsed = self._extract_json(text)
+        return {"refinedNodes": parsed}
@@ -1,21 +1,102 @@
+import asyncio
 import base64
+import functools
 import json
+import logging
 import re
-from typing import Any, Generator, Iterable, List, Optional, Tuple
+from typing import Any, Iterable, List, Optional
+
+import orjson
 
 from app.schemas.token_usage import TokenUsage
 
+logger = logging.getLogger(__name__)
+
+# orjson has no offset-based decoding, so whole-object detection still uses
+# the stdlib decoder's raw_decode
+_DECODER = json.JSONDecoder()
+# Splits on whitespace runs, keeping them: "a  b" -> ['a', '  ', 'b']
+_WS_SPLIT = re.compile(r"(\s+)")
+# Characters that change the extractor's state inside an object / a string
+_OBJECT_SPECIAL = re.compile(r'[{}"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to compact UTF-8 JSON text with orjson."""
+    return orjson.dumps(obj).decode("utf-8")
+
+
+@functools.lru_cache(maxsize=1024)
+def _usage_json(
+    input_tokens: int,
+    output_tokens: int,
+    total_tokens: int,
+    model: Optional[str],
+    provider: Optional[str],
+) -> str:
+    """Serialize a token usage record as the final-event JSON payload."""
+    return _dumps(
+        {
+            "token_usage": {
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": total_tokens,
+                "model": model,
+                "provider": provider,
+            }
+        }
+    )
+
+
+def _token_usage_json(token_usage: TokenUsage) -> str:
+    return _usage_json(
+        token_usage.input_tokens,
+        token_usage.output_tokens,
+        token_usage.total_tokens,
+        token_usage.model,
+        token_usage.provider,
+    )
+
+
+async def _watch_disconnect(request, disconnected: asyncio.Event) -> None:
+    """Set ``disconnected`` once the client goes away.
+
+    One task per stream waits on the ASGI receive channel, so the streaming
+    loop can check a flag instead of polling ``request.is_disconnected()``
+    for every chunk.
+    """
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            disconnected.set()
+            return
+
 
 # VIBE CODE
 async def sse_word_by_word(
-    request, chunks: Iterable, token_usage: Optional[Any] = None
+    request,
+    chunks: Iterable,
+    token_usage: Optional[TokenUsage] = None,
+    coalesce: bool = False,
 ):
-    print("Starting SSE word by word")
+    """Stream text as base64-encoded frames, one per word or whitespace run.
+
+    With ``coalesce=True`` the whole text is sent as a single frame after
+    the last chunk, for callers that do not render incrementally.
+    """
+    logger.debug("Starting SSE word by word")
     if await request.is_disconnected():
-        print("Client disconnected")
+        logger.info("Client disconnected")
         return
 
-    buffer = ""
+    disconnected = asyncio.Event()
+    watcher = asyncio.create_task(_watch_disconnect(request, disconnected))
+    # Text not yet sent. Unless coalescing, it never contains whitespace:
+    # everything up to the last whitespace run is flushed as it arrives.
+    pending: List[str] = []
+    # Local alias saves a global and attribute lookup per emitted token
+    b64encode = base64.b64encode
 
     try:
         # Send content chunks
@@ -24,137 +105,190 @@ async def sse_word_by_word(
                 token_usage = chunk
                 continue
 
-            if await request.is_disconnected():
-                print("Client disconnected during streaming")
+            if disconnected.is_set():
+                logger.info("Client disconnected during streaming")
                 return
 
-            if chunk:
-                buffer += str(chunk)
-
+            if chunk and coalesce:
+                pending.append(str(chunk))
+            elif chunk:
                 # Split on whitespace, keeping separators as elements:
                 # "### Âm Thanh" -> ['###', ' ', 'Âm', ' ', 'Thanh']
-                tokens = re.split(r"(\s+)", buffer)
+                # Only the new chunk is scanned: the pending text has no
+                # whitespace, so it can only extend the chunk's first token.
+                tokens = _WS_SPLIT.split(str(chunk))
+                if len(tokens) == 1:
+                    # Still inside a word
+                    pending.append(tokens[0])
+                    continue
+
+                if pending:
+                    pending.append(tokens[0])
+                    tokens[0] = "".join(pending)
 
                 # Process all tokens except the last one (which might be incomplete)
-                if len(tokens) > 1:
-                    complete_tokens = tokens[:-1]
-                    buffer = tokens[-1]  # Keep the last token in buffer
-
-                    for token in complete_tokens:
-                        if (
-                            token
-                        ):  # Don't skip empty tokens as they might be important whitespace
-                            encoded = base64.b64encode(
-                                token.encode("utf-8")
-                            ).decode("ascii")
-                            yield {"data": encoded}
+                pending = [tokens[-1]]
+
+                for token in tokens[:-1]:
+                    if (
+                        token
+                    ):  # Don't skip empty tokens as they might be important whitespace
+                        encoded = b64encode(token.encode("utf-8"))
+                        yield {"data": encoded.decode("ascii")}
 
         # Yield any remaining content in buffer
+        buffer = "".join(pending)
         if buffer:
             encoded = base64.b64encode(buffer.encode("utf-8")).decode("ascii")
             yield {"data": encoded}
 
         # Send token usage as final event
         if token_usage:
+            usage_json = _token_usage_json(token_usage)
             yield {
-                "data": base64.b64encode(
-                    json.dumps(
-                        {
-                            "token_usage": {
-                                "input_tokens": token_usage.input_tokens,
-                                "output_tokens": token_usage.output_tokens,
-                                "total_tokens": token_usage.total_tokens,
-                                "model": token_usage.model,
-                                "provider": token_usage.provider,
-                            }
-                        }
-                    ).encode("utf-8")
-                ).decode("ascii")
+                "data": base64.b64encode(usage_json.encode("utf-8")).decode(
+                    "ascii"
+                )
             }
 
     except Exception as e:
-        print(f"Error in word-by-word streaming: {e}")
+        logger.exception("Error in word-by-word streaming")
         error_encoded = base64.b64encode(
             f"Error: {str(e)}".encode("utf-8")
         ).decode("ascii")
         yield {"data": error_encoded}
 
+    finally:
+        watcher.cancel()
 
-def _find_complete_json_object(buffer: str) -> Optional[Tuple[str, int]]:
-    """Find a complete JSON object in the buffer.
-
-    Returns:
-        Tuple of (json_str, end_idx) if found, None otherwise
-    """
-    start_idx = buffer.find("{")
-    if start_idx == -1:
-        return None
-
-    brace_count = 0
-    end_idx = start_idx
-
-    for i in range(start_idx, len(buffer)):
-        if buffer[i] == "{":
-            brace_count += 1
-        elif buffer[i] == "}":
-            brace_count -= 1
-
-        if brace_count == 0:
-            end_idx = i
-            break
 
-    if brace_count == 0:
-        json_str = buffer[start_idx : end_idx + 1].strip()
-        return (json_str, end_idx)
+class _JsonStreamExtractor:
+    """Find complete top-level JSON objects in text that arrives in pieces.
 
-    return None
+    Brace depth and string/escape state are kept across calls to ``feed``,
+    so every character is scanned once and braces inside string literals
+    are not counted. Text outside an object (array brackets, commas,
+    markdown code fences) is skipped, so fences need no stripping even
+    when split across chunks. Objects that arrive whole are parsed
+    directly by the C decoder without the per-character scan.
+    """
 
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        # Pieces of the object currently being read
+        self._parts: List[str] = []
+
+    def feed(self, text: str) -> List[Any]:
+        """Scan newly received text.
+
+        Returns:
+            The decoded JSON objects completed by this text, in order.
+            Objects that fail to decode are skipped.
+        """
+        objects = []
+        start = 0
+        i = 0
+        n = len(text)
+
+        if self.escape:
+            # The previous text ended on a backslash inside a string
+            self.escape = False
+            i = 1
+
+        while i < n:
+            if self.depth == 0:
+                # Fast path: jump straight to the next object
+                i = text.find("{", i)
+                if i == -1:
+                    return objects
+
+                # Usually the whole object is in this text: raw_decode parses
+                # it and reports where it ends in a single C call.
+                try:
+                    obj, i = _DECODER.raw_decode(text, i)
+                except json.JSONDecodeError:
+                    # Incomplete (or malformed); fall back to scanning
+                    start = i
+                    self.depth = 1
+                    i += 1
+                else:
+                    objects.append(obj)
+                continue
 
-def _process_json_object(
-    json_str: str, buffer: str, start_idx: int, end_idx: int
-) -> Tuple[Optional[str], str]:
-    """Process a JSON object and return SSE event data and updated buffer.
+            # Jump over ordinary characters to the next one that matters
+            if self.in_string:
+                match = _STRING_SPECIAL.search(text, i)
+                if match is None:
+                    break
+                i = match.start()
+                if text[i] == "\\":
+                    # Skip the escaped character, which may be in the next text
+                    i += 2
+                    self.escape = i > n
+                    continue
+                self.in_string = False
+            else:
+                match = _OBJECT_SPECIAL.search(text, i)
+                if match is None:
+                    break
+                i = match.start()
+                ch = text[i]
+                if ch == '"':
+                    self.in_string = True
+                elif ch == "{":
+                    self.depth += 1
+                else:
+                    self.depth -= 1
+                    if self.depth == 0:
+                        self._parts.append(text[start : i + 1])
+                        json_str = "".join(self._parts)
+                        self._parts = []
+                        try:
+                            objects.append(orjson.loads(json_str))
+                        except orjson.JSONDecodeError as e:
+                            logger.warning("JSON decode error: %s", e)
+            i += 1
+
+        if self.depth:
+            self._parts.append(text[start:])
+
+        return objects
+
+
+def _process_json_object(json_obj: Any) -> Optional[str]:
+    """Turn a decoded JSON object into SSE event data.
 
     Returns:
-        Tuple of (event_data, updated_buffer)
+        The event data, or None if the object has no ``type`` field.
     """
-    try:
-        json_obj = json.loads(json_str)
-
-        # Check if it's a valid object with type field
-        if isinstance(json_obj, dict) and "type" in json_obj:
-            event_data = (
-                f"data: {json.dumps(json_obj, ensure_ascii=False)}\n\n"
-            )
-            updated_buffer = buffer[end_idx + 1 :].lstrip()
-            return (event_data, updated_buffer)
-
-        # Valid JSON but no type field, just remove it from buffer
-        return (None, buffer[end_idx + 1 :].lstrip())
+    # Check if it's a valid object with type field
+    if isinstance(json_obj, dict) and "type" in json_obj:
+        return f"data: {_dumps(json_obj)}\n\n"
 
-    except json.JSONDecodeError as e:
-        print(f"JSON decode error: {e}")
-        # Remove the problematic part and continue
-        return (None, buffer[start_idx + 1 :])
+    return None
 
 
 def _create_token_usage_event(token_usage: TokenUsage) -> str:
     """Create SSE event data for token usage."""
-    return f"data: {json.dumps({'token_usage': {'input_tokens': token_usage.input_tokens, 'output_tokens': token_usage.output_tokens, 'total_tokens': token_usage.total_tokens, 'model': token_usage.model, 'provider': token_usage.provider}}, ensure_ascii=False)}\n\n"
+    return f"data: {_token_usage_json(token_usage)}\n\n"
 
 
 # VIBE CODE
 async def sse_json_by_json(
-    request, chunks: Iterable, token_usage: Optional[Any] = None
+    request, chunks: Iterable, token_usage: Optional[TokenUsage] = None
 ):
     """Stream JSON objects one at a time in SSE format, then send token usage."""
-    print("Starting SSE JSON by JSON streaming")
+    logger.debug("Starting SSE JSON by JSON streaming")
 
     if await request.is_disconnected():
-        print("Client disconnected")
+        logger.info("Client disconnected")
         return
 
-    buffer = ""
+    disconnected = asyncio.Event()
+    watcher = asyncio.create_task(_watch_disconnect(request, disconnected))
+    extractor = _JsonStreamExtractor()
 
     try:
         # Process content chunks
@@ -163,28 +297,13 @@ async def sse_json_by_json(
                 token_usage = chunk
                 continue
 
-            if await request.is_disconnected():
-                print("Client disconnected during streaming")
+            if disconnected.is_set():
+                logger.info("Client disconnected during streaming")
                 return
 
             if chunk:
-                buffer += chunk
-                buffer = buffer.replace("```json", "").replace("```", "")
-                print(f"Current buffer: {buffer}")
-
-                # Look for and process complete JSON objects in the buffer
-                while True:
-                    result = _find_complete_json_object(buffer)
-                    if result is None:
-                        break
-
-                    json_str, end_idx = result
-                    start_idx = buffer.find("{")
-
-                    event_data, buffer = _process_json_object(
-                        json_str, buffer, start_idx, end_idx
-                    )
-
+                for json_obj in extractor.feed(chunk):
+                    event_data = _process_json_object(json_obj)
                     if event_data:
                         yield event_data
 
@@ -193,5 +312,14 @@ async def sse_json_by_json(
             yield _create_token_usage_event(token_usage)
 
     except Exception as e:
-        print(f"Error in SSE streaming: {e}")
-        yield f"data: {json.dumps({'error': f'Streaming error: {str(e)}'}, ensure_ascii=False)}\n\n"
+        logger.exception("Error in SSE streaming")
+        yield f"data: {_dumps({'error': f'Streaming error: {str(e)}'})}\n\n"
+
+    finally:
+        watcher.cancel()
+
+
+__all__ = [
+    "sse_word_by_word",
+    "sse_json_by_json",
+]
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List
 
 from app.schemas.token_usage import TokenUsage
 
@@ -6,35 +6,64 @@ from app.schemas.token_usage import TokenUsage
 class TokenTracker:
     """Utility class to track and aggregate token usage across requests."""
 
-    def __init__(self):
-        self.total_usage = TokenUsage()
-        self.request_usages = []
+    def __init__(self, track_details: bool = False):
+        """
+        Initialize the tracker.
+
+        Args:
+            track_details: Keep every added usage in ``request_usages``.
+                Off by default so a long-lived tracker does not grow
+                without bound.
+        """
+        # Running totals as plain ints; a TokenUsage is only built on read
+        self._input_tokens = 0
+        self._output_tokens = 0
+        self._total_tokens = 0
+        self.request_count = 0
+        self.track_details = track_details
+        self.request_usages: List[TokenUsage] = []
+
+    @property
+    def total_usage(self) -> TokenUsage:
+        """Total token usage across tracked requests."""
+        return self.get_total()
 
     def add_usage(self, usage: TokenUsage) -> None:
         """Add token usage from a single request."""
         if isinstance(usage, dict):
             usage = TokenUsage(**usage)
-        self.request_usages.append(usage)
-        self.total_usage = self.total_usage + usage
+        if self.track_details:
+            self.request_usages.append(usage)
+        self.request_count += 1
+        self._input_tokens += usage.input_tokens
+        self._output_tokens += usage.output_tokens
+        self._total_tokens += usage.total_tokens
 
     def get_total(self) -> TokenUsage:
         """Get total token usage."""
-        return self.total_usage
+        return TokenUsage(
+            input_tokens=self._input_tokens,
+            output_tokens=self._output_tokens,
+            total_tokens=self._total_tokens,
+        )
 
     def get_usage_count(self) -> int:
         """Get number of tracked requests."""
-        return len(self.request_usages)
+        return self.request_count
 
     def reset(self) -> None:
         """Reset tracker."""
-        self.total_usage = TokenUsage()
+        self._input_tokens = 0
+        self._output_tokens = 0
+        self._total_tokens = 0
+        self.request_count = 0
         self.request_usages = []
 
     def to_dict(self) -> dict:
         """Convert usage to dictionary."""
         return {
-            "input_tokens": self.total_usage.input_tokens,
-            "output_tokens": self.total_usage.output_tokens,
-            "total_tokens": self.total_usage.total_tokens,
-            "requests_count": len(self.request_usages),
+            "input_tokens": self._input_tokens,
+            "output_tokens": self._output_tokens,
+            "total_tokens": self._total_tokens,
+            "requests_count": self.request_count,
         }
@@ -0,0 +1,5 @@
+"""Run the ingestion pipeline with ``python -m ingestion_app``."""
+
+from ingestion_app.main import main
+
+main()
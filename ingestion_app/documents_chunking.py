@@ -1,7 +1,9 @@
 """Hierarchical chunking module to split documents into parent-child chunks for embedding."""
 
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Optional, Tuple
 
+import numpy as np
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
@@ -16,6 +18,7 @@ class HierarchicalDocumentChunker:
         chunk_overlap: int = 100,
         separators: Optional[List[str]] = None,
         length_function: callable = len,
+        max_workers: int = 1,
     ):
         """
         Initialize the Hierarchical Document Chunker.
@@ -26,10 +29,13 @@ class HierarchicalDocumentChunker:
             chunk_overlap: Number of characters to overlap between chunks
             separators: List of separator strings to split on (default: hierarchical split)
             length_function: Function to measure chunk length (default: len)
+            max_workers: Processes used to split documents in parallel
+                (default: 1, split in-process)
         """
         self.parent_chunk_size = parent_chunk_size
         self.child_chunk_size = child_chunk_size
         self.chunk_overlap = chunk_overlap
+        self.max_workers = max_workers
 
         # Use default hierarchical separators if not provided
         if separators is None:
@@ -70,58 +76,89 @@ class HierarchicalDocumentChunker:
 
         Returns:
             Tuple of (parent_chunks, child_chunks) where child chunks reference their parents
+            by ``parent_id``, which is also the parent's index in parent_chunks
         """
         if not documents:
             return [], []
 
+        if self.max_workers <= 1 or len(documents) < 2:
+            return self._split_batch(documents)
+
+        # Splitting is CPU-bound pure Python, so spread contiguous batches of
+        # documents over worker processes, then make the ids global again.
+        batch_size = -(-len(documents) // self.max_workers)
+        batches = [
+            documents[i : i + batch_size]
+            for i in range(0, len(documents), batch_size)
+        ]
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(self._split_batch, batches))
+
         all_parent_chunks = []
         all_child_chunks = []
-        global_parent_id = 0
+        for parent_chunks, child_chunks in results:
+            parent_offset = len(all_parent_chunks)
+            child_offset = len(all_child_chunks)
+            if parent_offset or child_offset:
+                for chunk in parent_chunks:
+                    chunk.metadata["chunk_id"] += parent_offset
+                    chunk.metadata["parent_id"] += parent_offset
+                for chunk in child_chunks:
+                    chunk.metadata["chunk_id"] += child_offset
+                    chunk.metadata["parent_id"] += parent_offset
+            all_parent_chunks.extend(parent_chunks)
+            all_child_chunks.extend(child_chunks)
+
+        return all_parent_chunks, all_child_chunks
+
+    def _split_batch(
+        self, documents: List[Document]
+    ) -> Tuple[List[Document], List[Document]]:
+        """Split documents with ids numbered from 0 within the batch."""
+        # One splitter pass over all documents; each parent chunk carries a
+        # copy of its source document's metadata.
+        parent_chunks = self.parent_splitter.split_documents(documents)
+        all_child_chunks = []
         global_child_id = 0
 
-        for doc in documents:
-            # Create parent chunks
-            parent_chunks = self.parent_splitter.split_documents([doc])
+        for parent_id, parent_chunk in enumerate(parent_chunks):
+            parent_text = parent_chunk.page_content
+            parent_metadata = parent_chunk.metadata
+
+            # Add parent metadata
+            parent_metadata["chunk_id"] = parent_id
+            parent_metadata["chunk_type"] = "parent"
+            parent_metadata["chunk_size"] = len(parent_text)
+            parent_metadata["parent_id"] = parent_id
+            parent_metadata["doc_id"] = parent_metadata.get(
+                "doc_id", "unknown"
+            )
+
+            # Metadata shared by every child of this parent, built once.
+            # Only children are stored, so they carry the parent text for
+            # retrieval to return as context.
+            child_base = {
+                **parent_metadata,
+                "chunk_type": "child",
+                "parent_text": parent_text,  # Store parent context
+            }
 
-            for parent_idx, parent_chunk in enumerate(parent_chunks):
-                # Add parent metadata
-                parent_chunk.metadata["chunk_id"] = global_parent_id
-                parent_chunk.metadata["chunk_type"] = "parent"
-                parent_chunk.metadata["chunk_size"] = len(
-                    parent_chunk.page_content
+            # Create child chunks from this parent
+            for child_idx, child_text in enumerate(
+                self.child_splitter.split_text(parent_text)
+            ):
+                child_metadata = child_base.copy()
+                child_metadata.update(
+                    chunk_id=global_child_id,
+                    chunk_size=len(child_text),
+                    child_index=child_idx,
                 )
-                parent_chunk.metadata["parent_id"] = global_parent_id
-                parent_chunk.metadata["doc_id"] = doc.metadata.get(
-                    "doc_id", "unknown"
+                all_child_chunks.append(
+                    Document(page_content=child_text, metadata=child_metadata)
                 )
+                global_child_id += 1
 
-                # Create child chunks from this parent
-                child_chunks = self.child_splitter.split_text(
-                    parent_chunk.page_content
-                )
-
-                for child_idx, child_text in enumerate(child_chunks):
-                    # Create child document with reference to parent
-                    child_metadata = {
-                        **parent_chunk.metadata,
-                        "chunk_id": global_child_id,
-                        "chunk_type": "child",
-                        "chunk_size": len(child_text),
-                        "parent_id": global_parent_id,
-                        "parent_text": parent_chunk.page_content,  # Store parent context
-                        "child_index": child_idx,
-                    }
-
-                    child_doc = Document(
-                        page_content=child_text, metadata=child_metadata
-                    )
-                    all_child_chunks.append(child_doc)
-                    global_child_id += 1
-
-                all_parent_chunks.append(parent_chunk)
-                global_parent_id += 1
-
-        return all_parent_chunks, all_child_chunks
+        return parent_chunks, all_child_chunks
 
     def split_text(
         self, text: str, metadata: Optional[dict] = None
@@ -163,28 +200,49 @@ class HierarchicalDocumentChunker:
                 "total_characters": 0,
             }
 
-        parent_sizes = [len(doc.page_content) for doc in parent_chunks]
-        child_sizes = [len(doc.page_content) for doc in child_chunks]
+        parent_sizes = _chunk_sizes(parent_chunks)
+        child_sizes = _chunk_sizes(child_chunks)
 
         return {
             "total_parent_chunks": len(parent_chunks),
             "total_child_chunks": len(child_chunks),
             "avg_parent_size": (
-                sum(parent_sizes) // len(parent_sizes) if parent_sizes else 0
+                int(parent_sizes.sum()) // parent_sizes.size
+                if parent_sizes.size
+                else 0
             ),
             "avg_child_size": (
-                sum(child_sizes) // len(child_sizes) if child_sizes else 0
+                int(child_sizes.sum()) // child_sizes.size
+                if child_sizes.size
+                else 0
+            ),
+            "min_parent_size": (
+                int(parent_sizes.min()) if parent_sizes.size else 0
+            ),
+            "max_parent_size": (
+                int(parent_sizes.max()) if parent_sizes.size else 0
+            ),
+            "min_child_size": (
+                int(child_sizes.min()) if child_sizes.size else 0
+            ),
+            "max_child_size": (
+                int(child_sizes.max()) if child_sizes.size else 0
             ),
-            "min_parent_size": min(parent_sizes) if parent_sizes else 0,
-            "max_parent_size": max(parent_sizes) if parent_sizes else 0,
-            "min_child_size": min(child_sizes) if child_sizes else 0,
-            "max_child_size": max(child_sizes) if child_sizes else 0,
             "avg_children_per_parent": (
                 len(child_chunks) / len(parent_chunks) if parent_chunks else 0
             ),
-            "total_characters": sum(parent_sizes),
+            "total_characters": int(parent_sizes.sum()),
         }
 
 
+def _chunk_sizes(chunks: List[Document]) -> np.ndarray:
+    """Collect chunk lengths into an int64 array for C-level reductions."""
+    return np.fromiter(
+        (len(doc.page_content) for doc in chunks),
+        dtype=np.int64,
+        count=len(chunks),
+    )
+
+
 # Backward compatibility alias
 DocumentChunker = HierarchicalDocumentChunker
@@ -1,14 +1,91 @@
 """Embedding service module to generate embeddings using Vertex AI."""
 
+import asyncio
+import functools
+import hashlib
 import json
-from typing import List, Optional
+import os
+import re
+import sqlite3
+import string
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import vertexai
+from google.genai.errors import APIError
 from google.oauth2 import service_account
+from langchain_core.embeddings import Embeddings
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
+# Stay under SQLite's bound-parameter limit when looking up hashes
+_CACHE_LOOKUP_BATCH = 500
+# Element types the document cache can store vectors as
+_CACHE_DTYPES = {"float32": np.float32, "float16": np.float16}
+_WHITESPACE = re.compile(r"\s+")
+# Words and single punctuation/whitespace characters, the units the provider
+# client counts (twice each) when it estimates tokens for a request
+_SEPARATORS = re.escape(string.punctuation + "\t\n ")
+_TOKEN_UNIT = re.compile(rf"[{_SEPARATORS}]|[^{_SEPARATORS}]+")
+# Provider errors worth retrying: rate limited or temporarily unavailable
+_RETRY_STATUS = {429, 503}
+_MAX_ATTEMPTS = 4
+# Default output dimension of known embedding models; others are probed
+_MODEL_DIMENSIONS = {
+    "gemini-embedding-001": 3072,
+    "text-embedding-004": 768,
+    "text-embedding-005": 768,
+    "text-multilingual-embedding-002": 768,
+}
 
-class EmbeddingService:
+
+def _query_key(text: str) -> str:
+    """
+    Normalize a query into its cache key.
+
+    Queries that differ only in Unicode composition (Vietnamese diacritics
+    typed as combining marks vs precomposed letters), case, spacing or
+    trailing sentence punctuation share one key and so one embedding.
+    Diacritics themselves are kept, since they change the word.
+
+    Args:
+        text: Query text
+
+    Returns:
+        Normalized cache key
+    """
+    text = unicodedata.normalize("NFC", text).casefold()
+    return _WHITESPACE.sub(" ", text).strip().rstrip(".?!").rstrip()
+
+
+@functools.lru_cache(maxsize=4)
+def _load_credentials(path: str, mtime: float) -> service_account.Credentials:
+    """
+    Load service account credentials, shared by services using one file.
+
+    Args:
+        path: Path to service account JSON file
+        mtime: The file's modification time, so edits are picked up
+
+    Returns:
+        Service account credentials
+    """
+    with open(path, encoding="utf-8") as f:
+        service_account_info = json.load(f)
+    return service_account.Credentials.from_service_account_info(
+        service_account_info
+    )
+
+
+def _should_retry(error: APIError, attempt: int) -> bool:
+    """Whether a failed embedding request should be tried again."""
+    return error.code in _RETRY_STATUS and attempt < _MAX_ATTEMPTS - 1
+
+
+class EmbeddingService(Embeddings):
     """Manages document embeddings using Google Vertex AI."""
 
     def __init__(
@@ -17,6 +94,12 @@ class EmbeddingService:
         project_id: Optional[str] = None,
         location: Optional[str] = "us-central1",
         service_account_file: Optional[str] = None,
+        cache_path: Optional[str] = None,
+        batch_size: int = 100,
+        max_tokens_per_batch: int = 18000,
+        max_concurrency: int = 8,
+        query_cache_size: int = 4096,
+        cache_dtype: str = "float32",
     ):
         """
         Initialize the EmbeddingService.
@@ -26,11 +109,41 @@ class EmbeddingService:
             project_id: Google Cloud project ID
             location: Google Cloud location/region
             service_account_file: Path to service account JSON file
+            cache_path: SQLite file for caching document embeddings by
+                content hash (default: no cache)
+            batch_size: Maximum texts per embedding request
+            max_tokens_per_batch: Estimated tokens per embedding request;
+                kept under the provider client's 20000 so each batch is a
+                single request
+            max_concurrency: Embedding requests kept in flight at once
+            query_cache_size: Query embeddings kept in memory (0 disables)
+            cache_dtype: Element type of cached vectors, "float32" or
+                "float16" (half the size, ~3 significant digits)
+
+        Raises:
+            ValueError: If cache_dtype is not supported
         """
         self.model_name = model_name
         self.project_id = project_id
         self.location = location
         self.service_account_file = service_account_file
+        self.batch_size = batch_size
+        self.max_tokens_per_batch = max_tokens_per_batch
+        self.max_concurrency = max_concurrency
+        self.query_cache_size = query_cache_size
+        if cache_dtype not in _CACHE_DTYPES:
+            raise ValueError(
+                f"Unsupported cache_dtype: {cache_dtype}. "
+                f"Supported: {', '.join(_CACHE_DTYPES)}"
+            )
+        self._cache_dtype = _CACHE_DTYPES[cache_dtype]
+        # Rows are keyed by model; float16 rows get their own key so they
+        # are never decoded as float32 (or vice versa)
+        self._cache_model_key = (
+            model_name
+            if cache_dtype == "float32"
+            else f"{model_name}@{cache_dtype}"
+        )
 
         # Initialize Vertex AI
         self._initialize_vertexai()
@@ -42,15 +155,133 @@ class EmbeddingService:
             location=location,
         )
 
+        self._cache = self._open_cache(cache_path) if cache_path else None
+        # LRU of normalized query -> vector, shared by embed_query and
+        # aembed_query
+        self._query_cache: "OrderedDict[str, Tuple[float, ...]]" = (
+            OrderedDict()
+        )
+
+    def close(self) -> None:
+        """Close the embedding client's connection pool and the cache."""
+        self.embeddings.client.close()
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+    async def aclose(self) -> None:
+        """Like close, also closing the async connection pool."""
+        await self.embeddings.client.aio.aclose()
+        self.close()
+
+    def __enter__(self) -> "EmbeddingService":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "EmbeddingService":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    @staticmethod
+    def _open_cache(path: str) -> sqlite3.Connection:
+        """Open (and create if needed) the document embedding cache."""
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "hash BLOB NOT NULL, model TEXT NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (hash, model))"
+        )
+        return conn
+
+    def _lookup_cached(
+        self, texts: List[str]
+    ) -> Tuple[List[bytes], Dict[bytes, List[float]], Dict[bytes, str]]:
+        """
+        Look up document embeddings in the cache.
+
+        Args:
+            texts: Texts about to be embedded
+
+        Returns:
+            Tuple of (content hash per text, cached vectors by hash,
+            uncached texts by hash with duplicates collapsed)
+        """
+        hashes = [hashlib.sha256(t.encode("utf-8")).digest() for t in texts]
+        unique = list(dict.fromkeys(hashes))
+
+        cached = {}
+        for i in range(0, len(unique), _CACHE_LOOKUP_BATCH):
+            batch = unique[i : i + _CACHE_LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._cache.execute(
+                "SELECT hash, vector FROM embeddings "
+                f"WHERE model = ? AND hash IN ({placeholders})",
+                [self._cache_model_key, *batch],
+            )
+            for content_hash, blob in rows:
+                cached[content_hash] = np.frombuffer(
+                    blob, dtype=self._cache_dtype
+                ).tolist()
+
+        misses = {}
+        for content_hash, text in zip(hashes, texts):
+            if content_hash not in cached:
+                misses.setdefault(content_hash, text)
+
+        return hashes, cached, misses
+
+    def _store_cached(
+        self,
+        cached: Dict[bytes, List[float]],
+        misses: Dict[bytes, str],
+        vectors: List[List[float]],
+    ) -> None:
+        """Write freshly computed vectors to the cache and to ``cached``."""
+        rows = []
+        for content_hash, vector in zip(misses, vectors):
+            cached[content_hash] = vector
+            rows.append(
+                (
+                    content_hash,
+                    self._cache_model_key,
+                    np.asarray(vector, dtype=self._cache_dtype).tobytes(),
+                )
+            )
+
+        with self._cache:
+            self._cache.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)", rows
+            )
+
+    def _cached_query(self, text: str) -> Optional[List[float]]:
+        """Return a cached query vector, marking it recently used."""
+        key = _query_key(text)
+        vector = self._query_cache.get(key)
+        if vector is None:
+            return None
+        self._query_cache.move_to_end(key)
+        return list(vector)
+
+    def _remember_query(self, text: str, vector: List[float]) -> None:
+        """Add a query vector to the LRU, evicting the oldest if full."""
+        if self.query_cache_size <= 0:
+            return
+        # Stored as a tuple so callers cannot mutate the cached copy
+        self._query_cache[_query_key(text)] = tuple(vector)
+        if len(self._query_cache) > self.query_cache_size:
+            self._query_cache.popitem(last=False)
+
     def _initialize_vertexai(self):
         """Initialize Vertex AI with credentials."""
         if self.service_account_file:
             # Load credentials from service account file
-            service_account_info = json.load(open(self.service_account_file))
-            credentials = (
-                service_account.Credentials.from_service_account_info(
-                    service_account_info
-                )
+            credentials = _load_credentials(
+                self.service_account_file,
+                os.path.getmtime(self.service_account_file),
             )
 
             # Initialize Vertex AI with credentials
@@ -88,7 +319,20 @@ class EmbeddingService:
         if not texts:
             return []
 
-        return self.embeddings.embed_documents(texts)
+        if self._cache is None:
+            # Repeated chunks (page headers, footers) are embedded once
+            unique = list(dict.fromkeys(texts))
+            if len(unique) == len(texts):
+                return self._embed_batched(texts)
+            vectors = dict(zip(unique, self._embed_batched(unique)))
+            return [vectors[text] for text in texts]
+
+        hashes, cached, misses = self._lookup_cached(texts)
+        if misses:
+            vectors = self._embed_batched(list(misses.values()))
+            self._store_cached(cached, misses, vectors)
+
+        return [cached[content_hash] for content_hash in hashes]
 
     def embed_query(self, text: str) -> List[float]:
         """
@@ -100,7 +344,11 @@ class EmbeddingService:
         Returns:
             Embedding vector
         """
-        return self.embeddings.embed_query(text)
+        vector = self._cached_query(text)
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self._remember_query(text, vector)
+        return vector
 
     async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
         """
@@ -115,7 +363,100 @@ class EmbeddingService:
         if not texts:
             return []
 
-        return await self.embeddings.aembed_documents(texts)
+        if self._cache is None:
+            unique = list(dict.fromkeys(texts))
+            if len(unique) == len(texts):
+                return await self._aembed_batched(texts)
+            vectors = dict(zip(unique, await self._aembed_batched(unique)))
+            return [vectors[text] for text in texts]
+
+        hashes, cached, misses = self._lookup_cached(texts)
+        if misses:
+            vectors = await self._aembed_batched(list(misses.values()))
+            self._store_cached(cached, misses, vectors)
+
+        return [cached[content_hash] for content_hash in hashes]
+
+    def _pack_batches(self, texts: List[str]) -> List[List[str]]:
+        """
+        Greedily pack texts into batches that each fit one request.
+
+        Args:
+            texts: Texts to embed, in order
+
+        Returns:
+            Consecutive batches of at most ``batch_size`` texts and
+            ``max_tokens_per_batch`` estimated tokens. A text over the token
+            budget gets a batch of its own, so the API reports the error.
+        """
+        batches: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+        for text in texts:
+            tokens = 2 * len(_TOKEN_UNIT.findall(text))
+            if current and (
+                current_tokens + tokens > self.max_tokens_per_batch
+                or len(current) == self.batch_size
+            ):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(text)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def _embed_batched(self, texts: List[str]) -> List[List[float]]:
+        """Embed packed batches, with up to ``max_concurrency`` in flight.
+
+        Sync counterpart of _aembed_batched: worker threads overlap the
+        network waits of separate requests.
+        """
+        batches = self._pack_batches(texts)
+        if len(batches) == 1:
+            return self._embed_batch(batches[0])
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(batches))
+        ) as executor:
+            results = list(executor.map(self._embed_batch, batches))
+        return [vector for batch in results for vector in batch]
+
+    def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        """Embed one request's worth of texts, retrying rate limits."""
+        for attempt in range(_MAX_ATTEMPTS):
+            try:
+                return self.embeddings.embed_documents(batch)
+            except APIError as e:
+                if not _should_retry(e, attempt):
+                    raise
+            time.sleep(2**attempt)
+
+    async def _aembed_batched(self, texts: List[str]) -> List[List[float]]:
+        """Embed packed batches, with up to ``max_concurrency`` in flight.
+
+        The provider client sends its batches one after another; the calls
+        are network-bound, so overlapping them cuts wall-clock time.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                for attempt in range(_MAX_ATTEMPTS):
+                    try:
+                        return await self.embeddings.aembed_documents(batch)
+                    except APIError as e:
+                        if not _should_retry(e, attempt):
+                            raise
+                    # Back off outside the except block, still holding the
+                    # slot so a rate-limited run does not add more load
+                    await asyncio.sleep(2**attempt)
+
+        results = await asyncio.gather(
+            *(embed_batch(batch) for batch in self._pack_batches(texts))
+        )
+        return [vector for batch in results for vector in batch]
 
     async def aembed_query(self, text: str) -> List[float]:
         """
@@ -127,17 +468,27 @@ class EmbeddingService:
         Returns:
             Embedding vector
         """
-        return await self.embeddings.aembed_query(text)
+        vector = self._cached_query(text)
+        if vector is None:
+            vector = await self.embeddings.aembed_query(text)
+            self._remember_query(text, vector)
+        return vector
+
+    @functools.cached_property
+    def embedding_dimension(self) -> int:
+        """Dimension of this model's vectors, probed once if not known."""
+        model = self.model_name.removeprefix("models/")
+        if model in _MODEL_DIMENSIONS:
+            return _MODEL_DIMENSIONS[model]
+        return len(self.embeddings.embed_query(" "))
 
     def get_embedding_dimension(self) -> int:
         """
         Get the dimension of the embedding vectors.
 
         Returns:
-            Embedding dimension (768 for text-embedding-004)
+            Embedding dimension (3072 for gemini-embedding-001, 768 for
+            text-embedding-004; other models are measured with one probe
+            embedding)
         """
-        # text-embedding-004 produces 768-dimensional embeddings
-        if "text-embedding-004" in self.model_name:
-            return 768
-        # Default dimension for most Vertex AI embedding models
-        return 768
+        return self.embedding_dimension
@@ -1,21 +1,114 @@
+import asyncio
+import gzip
+import hashlib
+import json
 import os
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 from dotenv import load_dotenv
 from langchain_community.document_loaders import (
     Docx2txtLoader,
+    PyMuPDFLoader,
     TextLoader,
     UnstructuredMarkdownLoader,
 )
 from langchain_core.documents import Document
-from llama_parse import LlamaParse
 
 from ingestion_app.metadata_parser import (
     extract_metadata_from_path,
     get_metadata_summary,
 )
 
+# Enhanced parsing instruction for image-heavy educational books with tables;
+# {language} is filled in with the loader's pdf_language
+_PARSING_INSTRUCTION_TEMPLATE = (
+    "This is a Vietnamese educational textbook that contains text, images, tables, and diagrams. "
+    "The content is in {language} language. "
+    "\n\n"
+    "CRITICAL REQUIREMENTS:\n"
+    "1. TABLES - MUST NOT SKIP: Extract ALL tables completely with full content. "
+    "Convert tables to clean markdown format with proper alignment. "
+    "Preserve all data, numbers, formulas, and relationships in tables. "
+    "For complex multi-level tables, maintain the hierarchical structure.\n"
+    "2. TEXT CONTENT: Extract all text accurately, preserving Vietnamese diacritical marks and special characters. "
+    "Maintain paragraph breaks, formatting, and text flow.\n"
+    "3. IMAGES & DIAGRAMS: Describe visual content that contains important educational information "
+    "(charts, diagrams, illustrations). Include context about what the image represents.\n"
+    "4. STRUCTURE: Preserve document hierarchy including chapters, sections, subsections, "
+    "numbered lists, bullet points, and exercises.\n"
+    "5. MATHEMATICAL & SCIENTIFIC CONTENT: Accurately capture formulas, equations, units, "
+    "and scientific notation. Preserve subscripts, superscripts, and special symbols.\n"
+    "6. EDUCATIONAL ELEMENTS: Mark exercises, examples, summaries, and key terms clearly.\n"
+)
+
+
+def iter_directory(
+    directory_path: str, recursive: bool, extensions: Iterable[str]
+) -> Iterator[Path]:
+    """
+    Yield files under a directory whose extension is in ``extensions``.
+
+    Files are yielded as the walk finds them, so callers can start work
+    before a large tree has been fully traversed. Uses ``os.scandir``
+    entries so non-matching files are rejected from their name alone,
+    without building a ``Path`` or another ``stat``.
+
+    Args:
+        directory_path: Path to the directory to scan
+        recursive: Whether to descend into subdirectories
+        extensions: Lowercase extensions including the dot, e.g. ".pdf"
+
+    Yields:
+        Matching file paths
+
+    Raises:
+        ValueError: If directory path doesn't exist
+    """
+    if not os.path.isdir(directory_path):
+        raise ValueError(f"Directory not found: {directory_path}")
+
+    extensions = frozenset(extensions)
+    pending = [directory_path]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(entry.path)
+                    continue
+                dot = name.rfind(".")
+                if (
+                    dot > 0
+                    and name[dot:].lower() in extensions
+                    and entry.is_file()
+                ):
+                    yield Path(entry.path)
+
+
+def scan_directory(
+    directory_path: str, recursive: bool, extensions: Iterable[str]
+) -> List[Path]:
+    """
+    List files under a directory whose extension is in ``extensions``.
+
+    Args:
+        directory_path: Path to the directory to scan
+        recursive: Whether to descend into subdirectories
+        extensions: Lowercase extensions including the dot, e.g. ".pdf"
+
+    Returns:
+        Matching file paths
+
+    Raises:
+        ValueError: If directory path doesn't exist
+    """
+    return list(iter_directory(directory_path, recursive, extensions))
+
 
 class DocumentLoader:
     """Handles loading documents from various file formats for ingestion."""
@@ -28,6 +121,7 @@ class DocumentLoader:
         ".md": UnstructuredMarkdownLoader,
         ".docx": Docx2txtLoader,
     }
+    SUPPORTED_EXT_SET = frozenset(SUPPORTED_EXTENSIONS)
 
     def __init__(
         self,
@@ -38,6 +132,8 @@ class DocumentLoader:
         use_auto_mode: bool = True,  # NEW: Enable auto_mode for heavy image-table books
         max_pdf_size_mb: int = 150,
         skip_llama_parse_on_error: bool = True,
+        max_workers: int = 8,
+        cache_dir: Optional[str] = None,
     ):
         """
         Initialize the DocumentLoader.
@@ -50,6 +146,9 @@ class DocumentLoader:
             use_auto_mode: Use auto_mode for optimal parsing of image-heavy books (default: True)
             max_pdf_size_mb: Maximum PDF size in MB for LlamaParse (default: 150)
             skip_llama_parse_on_error: Skip LlamaParse for a file if it fails (default: True)
+            max_workers: Files load_from_directory loads concurrently (default: 8)
+            cache_dir: Directory caching LlamaParse results by PDF content and
+                parser settings (default: no cache)
         """
         self.encoding = encoding
         self.pdf_language = pdf_language
@@ -57,28 +156,16 @@ class DocumentLoader:
         self.use_auto_mode = use_auto_mode
         self.max_pdf_size_mb = max_pdf_size_mb
         self.skip_llama_parse_on_error = skip_llama_parse_on_error
+        self.max_workers = max_workers
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
         self._failed_files = set()  # Track files that failed with LlamaParse
+        self._failed_files_lock = threading.Lock()
 
-        # Enhanced parsing instruction for image-heavy educational books with tables
         if parsing_instruction is None:
-            self.parsing_instruction = (
-                f"This is a Vietnamese educational textbook that contains text, images, tables, and diagrams. "
-                f"The content is in {pdf_language} language. "
-                "\n\n"
-                "CRITICAL REQUIREMENTS:\n"
-                "1. TABLES - MUST NOT SKIP: Extract ALL tables completely with full content. "
-                "Convert tables to clean markdown format with proper alignment. "
-                "Preserve all data, numbers, formulas, and relationships in tables. "
-                "For complex multi-level tables, maintain the hierarchical structure.\n"
-                "2. TEXT CONTENT: Extract all text accurately, preserving Vietnamese diacritical marks and special characters. "
-                "Maintain paragraph breaks, formatting, and text flow.\n"
-                "3. IMAGES & DIAGRAMS: Describe visual content that contains important educational information "
-                "(charts, diagrams, illustrations). Include context about what the image represents.\n"
-                "4. STRUCTURE: Preserve document hierarchy including chapters, sections, subsections, "
-                "numbered lists, bullet points, and exercises.\n"
-                "5. MATHEMATICAL & SCIENTIFIC CONTENT: Accurately capture formulas, equations, units, "
-                "and scientific notation. Preserve subscripts, superscripts, and special symbols.\n"
-                "6. EDUCATIONAL ELEMENTS: Mark exercises, examples, summaries, and key terms clearly.\n"
+            self.parsing_instruction = _PARSING_INSTRUCTION_TEMPLATE.format(
+                language=pdf_language
             )
         else:
             self.parsing_instruction = parsing_instruction
@@ -88,6 +175,10 @@ class DocumentLoader:
     def _init_llama_parser(self):
         """Initialize LlamaParse parser with configuration optimized for educational books."""
         try:
+            # Imported here: llama_parse pulls in llama_index, which only PDF
+            # parsing needs, and without it PDFs still load via PyMuPDF
+            from llama_parse import LlamaParse
+
             llama_config = {
                 "result_type": "markdown",
                 "verbose": True,
@@ -114,6 +205,12 @@ class DocumentLoader:
                 True  # Helps with image-heavy pages
             )
 
+            # Parser settings are part of the PDF cache key, so changing the
+            # parsing instruction or mode invalidates cached results
+            self._parser_config_key = json.dumps(
+                {k: v for k, v in llama_config.items() if k != "api_key"},
+                sort_keys=True,
+            )
             self.llama_parser = LlamaParse(**llama_config)
         except Exception as e:
             print(f"Warning: Failed to initialize LlamaParse: {e}")
@@ -135,26 +232,81 @@ class DocumentLoader:
         Raises:
             ValueError: If directory path doesn't exist
         """
-        dir_path = Path(directory_path)
-        if not dir_path.exists() or not dir_path.is_dir():
-            raise ValueError(f"Directory not found: {directory_path}")
-
-        documents = []
-        pattern = "**/*" if recursive else "*"
-
-        for file_path in dir_path.glob(pattern):
-            if (
-                file_path.is_file()
-                and file_path.suffix in self.SUPPORTED_EXTENSIONS
+        # Loading is dominated by LlamaParse API calls and file I/O, so
+        # threads overlap the waits. Files are submitted as the walk finds
+        # them, so loading starts before a large tree is fully scanned.
+        paths: List[Path] = []
+        futures = {}
+        with ThreadPoolExecutor(
+            max_workers=max(1, self.max_workers)
+        ) as executor:
+            for file_path in iter_directory(
+                directory_path, recursive, self.SUPPORTED_EXT_SET
             ):
+                future = executor.submit(self.load_file, str(file_path))
+                futures[future] = len(paths)
+                paths.append(file_path)
+
+            # Results keep the directory order
+            results: List[List[Document]] = [[] for _ in paths]
+            for future in as_completed(futures):
+                idx = futures[future]
+                file_path = paths[idx]
                 try:
-                    docs = self.load_file(str(file_path))
-                    documents.extend(docs)
+                    docs = future.result()
+                    results[idx] = docs
                     print(f"✓ Loaded: {file_path.name} ({len(docs)} chunks)")
                 except Exception as e:
                     print(f"✗ Failed to load {file_path.name}: {str(e)}")
 
-        return documents
+        return [doc for docs in results for doc in docs]
+
+    def _discover_paths(
+        self, directory_path: str, recursive: bool
+    ) -> List[Path]:
+        """List supported files under a directory, raising if it is missing."""
+        return scan_directory(
+            directory_path, recursive, self.SUPPORTED_EXT_SET
+        )
+
+    async def aload_from_directory(
+        self,
+        directory_path: str,
+        recursive: bool = True,
+        max_concurrency: int = 4,
+    ) -> List[Document]:
+        """
+        Load all supported documents from a directory asynchronously.
+
+        PDFs are parsed with LlamaParse's async API, so many uploads wait on
+        the network at once; other formats load in a worker thread.
+
+        Args:
+            directory_path: Path to the directory containing documents
+            recursive: Whether to search subdirectories recursively
+            max_concurrency: Files loaded at once (default: 4)
+
+        Returns:
+            List of loaded Document objects, in directory order
+
+        Raises:
+            ValueError: If directory path doesn't exist
+        """
+        paths = self._discover_paths(directory_path, recursive)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def load_one(file_path: Path) -> List[Document]:
+            async with semaphore:
+                try:
+                    docs = await self.aload_file(str(file_path))
+                except Exception as e:
+                    print(f"✗ Failed to load {file_path.name}: {str(e)}")
+                    return []
+            print(f"✓ Loaded: {file_path.name} ({len(docs)} chunks)")
+            return docs
+
+        results = await asyncio.gather(*(load_one(p) for p in paths))
+        return [doc for docs in results for doc in docs]
 
     def load_file(self, file_path: str) -> List[Document]:
         """
@@ -169,6 +321,44 @@ class DocumentLoader:
         Raises:
             ValueError: If file doesn't exist or unsupported format
         """
+        path, file_extension = self._check_file(file_path)
+
+        # Handle PDF files with LlamaParse
+        if file_extension == ".pdf":
+            documents = self._load_pdf(file_path)
+        else:
+            documents = self._load_with_langchain(file_path, file_extension)
+
+        self._add_file_metadata(documents, path, file_extension)
+        return documents
+
+    async def aload_file(self, file_path: str) -> List[Document]:
+        """
+        Load a single document file; async counterpart of load_file.
+
+        Args:
+            file_path: Path to the document file
+
+        Returns:
+            List of Document objects (may contain multiple pages/chunks)
+
+        Raises:
+            ValueError: If file doesn't exist or unsupported format
+        """
+        path, file_extension = self._check_file(file_path)
+
+        if file_extension == ".pdf":
+            documents = await self._aload_pdf(file_path)
+        else:
+            documents = await asyncio.to_thread(
+                self._load_with_langchain, file_path, file_extension
+            )
+
+        self._add_file_metadata(documents, path, file_extension)
+        return documents
+
+    def _check_file(self, file_path: str) -> Tuple[Path, str]:
+        """Validate a file path and return it with its lowercased suffix."""
         path = Path(file_path)
         if not path.exists() or not path.is_file():
             raise ValueError(f"File not found: {file_path}")
@@ -179,46 +369,49 @@ class DocumentLoader:
                 f"Unsupported file format: {file_extension}. "
                 f"Supported formats: {', '.join(self.SUPPORTED_EXTENSIONS.keys())}"
             )
+        return path, file_extension
 
-        # Handle PDF files with LlamaParse
-        if file_extension == ".pdf":
-            documents = self._load_pdf(file_path)
-        else:
-            # Handle other file types with LangChain loaders
-            loader_class = self.SUPPORTED_EXTENSIONS[file_extension]
+    def _load_with_langchain(
+        self, file_path: str, file_extension: str
+    ) -> List[Document]:
+        """Load a non-PDF file with its LangChain loader."""
+        loader_class = self.SUPPORTED_EXTENSIONS[file_extension]
 
-            # Special handling for TextLoader to specify encoding
-            if loader_class == TextLoader:
-                loader = loader_class(file_path, encoding=self.encoding)
-            else:
-                loader = loader_class(file_path)
+        # Special handling for TextLoader to specify encoding
+        if loader_class == TextLoader:
+            loader = loader_class(file_path, encoding=self.encoding)
+        else:
+            loader = loader_class(file_path)
 
-            documents = loader.load()
+        return loader.load()
 
+    @staticmethod
+    def _add_file_metadata(
+        documents: List[Document], path: Path, file_extension: str
+    ) -> None:
+        """Add file and educational metadata to loaded documents in place."""
         # Extract educational metadata from filename
-        educational_metadata = extract_metadata_from_path(file_path)
+        educational_metadata = extract_metadata_from_path(str(path))
+
+        # Basic file metadata, the same for every page of the file
+        shared = {
+            "source_file": path.name,
+            "file_path": str(path.absolute()),
+            "file_type": file_extension,
+        }
+
+        # Educational metadata (if available)
+        if educational_metadata.get("has_metadata"):
+            shared.update(
+                grade=educational_metadata["grade"],
+                subject_code=educational_metadata["subject_code"],
+                subject_name=educational_metadata["subject_name"],
+                metadata_summary=get_metadata_summary(educational_metadata),
+            )
 
         # Add file metadata and educational metadata to all documents
         for doc in documents:
-            # Basic file metadata
-            doc.metadata["source_file"] = path.name
-            doc.metadata["file_path"] = str(path.absolute())
-            doc.metadata["file_type"] = file_extension
-
-            # Educational metadata (if available)
-            if educational_metadata.get("has_metadata"):
-                doc.metadata["grade"] = educational_metadata["grade"]
-                doc.metadata["subject_code"] = educational_metadata[
-                    "subject_code"
-                ]
-                doc.metadata["subject_name"] = educational_metadata[
-                    "subject_name"
-                ]
-                doc.metadata["metadata_summary"] = get_metadata_summary(
-                    educational_metadata
-                )
-
-        return documents
+            doc.metadata.update(shared)
 
     def _load_pdf(self, file_path: str) -> List[Document]:
         """
@@ -230,15 +423,66 @@ class DocumentLoader:
         Returns:
             List of Document objects
         """
+        if self._skip_llama_parse(file_path):
+            return self._load_pdf_basic(file_path)
+
+        cache_file = self._pdf_cache_file(file_path)
+        cached = self._read_pdf_cache(cache_file, file_path)
+        if cached is not None:
+            return cached
+
+        try:
+            # Use LlamaParse for advanced parsing
+            llama_documents = self.llama_parser.load_data(file_path)
+            documents = self._to_langchain_documents(
+                llama_documents, file_path
+            )
+            self._write_pdf_cache(cache_file, documents)
+            return documents
+        except Exception as e:
+            self._report_llama_parse_error(file_path, e)
+            return self._load_pdf_fallback(file_path)
+
+    async def _aload_pdf(self, file_path: str) -> List[Document]:
+        """
+        Load PDF file using LlamaParse's async API.
+
+        Args:
+            file_path: Path to PDF file
+
+        Returns:
+            List of Document objects
+        """
+        if self._skip_llama_parse(file_path):
+            return await asyncio.to_thread(self._load_pdf_basic, file_path)
+
+        cache_file = await asyncio.to_thread(self._pdf_cache_file, file_path)
+        cached = self._read_pdf_cache(cache_file, file_path)
+        if cached is not None:
+            return cached
+
+        try:
+            llama_documents = await self.llama_parser.aload_data(file_path)
+            documents = self._to_langchain_documents(
+                llama_documents, file_path
+            )
+            self._write_pdf_cache(cache_file, documents)
+            return documents
+        except Exception as e:
+            self._report_llama_parse_error(file_path, e)
+            return await asyncio.to_thread(self._load_pdf_fallback, file_path)
+
+    def _skip_llama_parse(self, file_path: str) -> bool:
+        """Decide whether a PDF should go straight to the basic loader."""
         # Check if this file previously failed and should be skipped
-        if self.skip_llama_parse_on_error and file_path in self._failed_files:
+        if (
+            self.skip_llama_parse_on_error
+            and file_path in self.get_failed_files()
+        ):
             print(
                 f"⚠️  Skipping LlamaParse for {file_path} (previously failed)"
             )
-            from langchain_community.document_loaders import PyMuPDFLoader
-
-            loader = PyMuPDFLoader(file_path)
-            return loader.load()
+            return True
 
         # Check file size
         file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
@@ -251,76 +495,150 @@ class DocumentLoader:
                 f"   Tip: Increase max_pdf_size_mb or split the PDF into smaller files."
             )
             if self.skip_llama_parse_on_error:
-                self._failed_files.add(file_path)
-            from langchain_community.document_loaders import PyMuPDFLoader
+                self._mark_failed(file_path)
+            return True
 
-            loader = PyMuPDFLoader(file_path)
-            return loader.load()
+        return False
 
-        try:
-            # Use LlamaParse for advanced parsing
-            llama_documents = self.llama_parser.load_data(file_path)
+    def _pdf_cache_file(self, file_path: str) -> Optional[Path]:
+        """
+        Locate the cached LlamaParse result for a PDF.
 
-            # Convert LlamaIndex documents to LangChain documents
-            langchain_docs = []
-            for idx, llama_doc in enumerate(llama_documents):
-                langchain_doc = Document(
-                    page_content=llama_doc.text,
-                    metadata={
-                        "page": idx + 1,
-                        "source": file_path,
-                        **llama_doc.metadata,
-                    },
+        Args:
+            file_path: Path to PDF file
+
+        Returns:
+            Cache file path keyed by the SHA-256 of the parser settings and
+            the file bytes, or None if caching is disabled
+        """
+        if self.cache_dir is None or self.llama_parser is None:
+            return None
+
+        config_key = self._parser_config_key.encode("utf-8")
+        with open(file_path, "rb") as f:
+            if hasattr(hashlib, "file_digest"):
+                # Python 3.11+: hashes straight from the file descriptor
+                # without copying blocks into Python bytes objects
+                digest = hashlib.file_digest(
+                    f, lambda: hashlib.sha256(config_key)
                 )
-                langchain_docs.append(langchain_doc)
+            else:
+                digest = hashlib.sha256(config_key)
+                # Hash in 1 MiB blocks so large PDFs are never fully in memory
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+        return self.cache_dir / f"{digest.hexdigest()}.pkl.gz"
+
+    @staticmethod
+    def _read_pdf_cache(
+        cache_file: Optional[Path], file_path: str
+    ) -> Optional[List[Document]]:
+        """Load cached documents, or None on a miss or unreadable entry."""
+        if cache_file is None or not cache_file.exists():
+            return None
+
+        try:
+            with gzip.open(cache_file, "rb") as f:
+                documents = pickle.load(f)
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable PDF cache {cache_file}: {e}")
+            return None
 
-            return langchain_docs
+        # The same content may have been cached from another path
+        for doc in documents:
+            doc.metadata["source"] = file_path
+        print(f"♻️  Using cached parse for {file_path}")
+        return documents
 
+    @staticmethod
+    def _write_pdf_cache(
+        cache_file: Optional[Path], documents: List[Document]
+    ) -> None:
+        """Store parsed documents, replacing the cache file atomically."""
+        if cache_file is None:
+            return
+
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with gzip.open(tmp_file, "wb") as f:
+                pickle.dump(documents, f, protocol=5)
+            os.replace(tmp_file, cache_file)
         except Exception as e:
-            error_message = str(e).lower()
+            print(f"⚠️  Could not write PDF cache {cache_file}: {e}")
+            tmp_file.unlink(missing_ok=True)
 
-            # Track this file as failed
-            if self.skip_llama_parse_on_error:
-                self._failed_files.add(file_path)
-
-            # Check for token limit exceeded errors
-            if any(
-                keyword in error_message
-                for keyword in [
-                    "token limit",
-                    "tokens exceeded",
-                    "context length",
-                    "too many tokens",
-                    "maximum context",
-                    "rate limit",
-                    "quota exceeded",
-                    "too large",
-                ]
-            ):
-                print(f"⚠️  Token/Rate limit exceeded for {file_path}")
-                print(f"   Error: {e}")
-                print(
-                    f"   This PDF is too large for LlamaParse (exceeds token limit)."
-                )
-                print(f"   Recommendation:")
-                print(f"   - Split the PDF into smaller files")
-                print(f"   - Increase max_pdf_size_mb parameter")
-                print(f"   - Use basic loader for this file")
-                print(f"   Falling back to basic PDF loader...")
-            else:
-                print(f"❌ Error parsing PDF with LlamaParse: {e}")
-                print(f"   Falling back to basic PDF loader...")
+    @staticmethod
+    def _to_langchain_documents(
+        llama_documents: list, file_path: str
+    ) -> List[Document]:
+        """Convert LlamaIndex documents to LangChain documents."""
+        return [
+            Document(
+                page_content=llama_doc.text,
+                metadata={
+                    "page": idx + 1,
+                    "source": file_path,
+                    **llama_doc.metadata,
+                },
+            )
+            for idx, llama_doc in enumerate(llama_documents)
+        ]
+
+    def _report_llama_parse_error(self, file_path: str, e: Exception) -> None:
+        """Record and explain a LlamaParse failure before falling back."""
+        error_message = str(e).lower()
+
+        # Track this file as failed
+        if self.skip_llama_parse_on_error:
+            self._mark_failed(file_path)
+
+        # Check for token limit exceeded errors
+        if any(
+            keyword in error_message
+            for keyword in [
+                "token limit",
+                "tokens exceeded",
+                "context length",
+                "too many tokens",
+                "maximum context",
+                "rate limit",
+                "quota exceeded",
+                "too large",
+            ]
+        ):
+            print(f"⚠️  Token/Rate limit exceeded for {file_path}")
+            print(f"   Error: {e}")
+            print(
+                f"   This PDF is too large for LlamaParse (exceeds token limit)."
+            )
+            print(f"   Recommendation:")
+            print(f"   - Split the PDF into smaller files")
+            print(f"   - Increase max_pdf_size_mb parameter")
+            print(f"   - Use basic loader for this file")
+            print(f"   Falling back to basic PDF loader...")
+        else:
+            print(f"❌ Error parsing PDF with LlamaParse: {e}")
+            print(f"   Falling back to basic PDF loader...")
+
+    @staticmethod
+    def _load_pdf_basic(file_path: str) -> List[Document]:
+        """Load a PDF with PyMuPDF, without LlamaParse."""
+        loader = PyMuPDFLoader(file_path)
+        return loader.load()
 
-            # Fallback to basic PDF loader
-            try:
-                from langchain_community.document_loaders import PyMuPDFLoader
+    def _load_pdf_fallback(self, file_path: str) -> List[Document]:
+        """Basic loader after a LlamaParse failure; [] if it fails too."""
+        try:
+            return self._load_pdf_basic(file_path)
+        except Exception as fallback_error:
+            print(f"❌ Basic PDF loader also failed: {fallback_error}")
+            print(f"   Skipping file: {file_path}")
+            return []  # Return empty list if both loaders fail
 
-                loader = PyMuPDFLoader(file_path)
-                return loader.load()
-            except Exception as fallback_error:
-                print(f"❌ Basic PDF loader also failed: {fallback_error}")
-                print(f"   Skipping file: {file_path}")
-                return []  # Return empty list if both loaders fail
+    def _mark_failed(self, file_path: str) -> None:
+        """Record a file LlamaParse failed on; safe across loader threads."""
+        with self._failed_files_lock:
+            self._failed_files.add(file_path)
 
     def get_supported_extensions(self) -> List[str]:
         """
@@ -338,11 +656,13 @@ class DocumentLoader:
         Returns:
             Set of file paths that failed
         """
-        return self._failed_files.copy()
+        with self._failed_files_lock:
+            return self._failed_files.copy()
 
     def clear_failed_files(self):
         """Clear the list of failed files."""
-        self._failed_files.clear()
+        with self._failed_files_lock:
+            self._failed_files.clear()
 
     def get_loading_stats(self) -> dict:
         """
@@ -351,8 +671,9 @@ class DocumentLoader:
         Returns:
             Dictionary with loading statistics
         """
+        failed_files = self.get_failed_files()
         return {
-            "failed_files_count": len(self._failed_files),
-            "failed_files": list(self._failed_files),
+            "failed_files_count": len(failed_files),
+            "failed_files": list(failed_files),
             "max_pdf_size_mb": self.max_pdf_size_mb,
         }
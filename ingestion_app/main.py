@@ -11,66 +11,102 @@ This script orchestrates the entire document ingestion pipeline:
    d. Store in PostgreSQL vector database
 
 Usage:
-    python ingestion_app/main.py --docs-dir ./data/documents --reset
+    python -m ingestion_app --docs-dir ./data/documents --reset
 """
 
 import argparse
+import asyncio
 import os
 import sys
+from dataclasses import dataclass, replace
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 from dotenv import load_dotenv
-
-# Add parent directory to path to import app modules
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from pgvector.psycopg import register_vector
+from psycopg_pool import ConnectionPool
 
 from ingestion_app.documents_chunking import DocumentChunker
 from ingestion_app.documents_embedding import EmbeddingService
-from ingestion_app.documents_loader import DocumentLoader
+from ingestion_app.documents_loader import DocumentLoader, scan_directory
 from ingestion_app.vector_store import VectorStoreManager
 
 
-def load_env_config():
+@dataclass(frozen=True, slots=True)
+class IngestConfig:
+    """Ingestion settings read from the environment."""
+
+    project_id: Optional[str]
+    location: str
+    service_account_file: Optional[str]
+    embedding_model: str
+    embedding_cache_path: Optional[str]
+    embedding_cache_dtype: str
+    # Hierarchical chunking configuration
+    parent_chunk_size: int
+    child_chunk_size: int
+    chunk_overlap: int
+    chunk_workers: int
+    load_workers: int
+    doc_concurrency: int
+    pdf_cache_dir: Optional[str]
+    # PostgreSQL configuration
+    pg_connection_string: Optional[str]
+    pg_host: str
+    pg_port: int
+    pg_database: str
+    pg_user: str
+    pg_password: Optional[str]
+    collection_name: str
+    use_halfvec: bool
+    # LlamaParse PDF configuration
+    pdf_language: str
+    use_premium_pdf_mode: bool
+
+
+def load_env_config() -> IngestConfig:
     """Load configuration from environment variables."""
     # Load .env file
     load_dotenv()
 
-    config = {
-        "project_id": os.getenv("VERTEX_PROJECT_ID"),
-        "location": os.getenv("VERTEX_LOCATION", "us-central1"),
-        "service_account_file": os.getenv("GOOGLE_APPLICATION_CREDENTIALS"),
-        "embedding_model": os.getenv("EMBEDDING_MODEL", "text-embedding-004"),
-        # Hierarchical chunking configuration
-        "parent_chunk_size": int(os.getenv("PARENT_CHUNK_SIZE", "2000")),
-        "child_chunk_size": int(os.getenv("CHILD_CHUNK_SIZE", "500")),
-        "chunk_overlap": int(os.getenv("CHUNK_OVERLAP", "100")),
-        # PostgreSQL configuration
-        "pg_connection_string": os.getenv("PG_CONNECTION_STRING"),
-        "pg_host": os.getenv("PG_HOST", "localhost"),
-        "pg_port": int(os.getenv("PG_PORT", "5432")),
-        "pg_database": os.getenv("PG_DATABASE", "vectordb"),
-        "pg_user": os.getenv("PG_USER", "postgres"),
-        "pg_password": os.getenv("PG_PASSWORD"),
-        "collection_name": os.getenv("COLLECTION_NAME", "documents"),
-        # LlamaParse PDF configuration
-        "pdf_language": os.getenv("PDF_LANGUAGE", "vi"),
-        "use_premium_pdf_mode": os.getenv(
-            "USE_PREMIUM_PDF_MODE", "true"
-        ).lower()
+    config = IngestConfig(
+        project_id=os.getenv("VERTEX_PROJECT_ID"),
+        location=os.getenv("VERTEX_LOCATION", "us-central1"),
+        service_account_file=os.getenv("GOOGLE_APPLICATION_CREDENTIALS"),
+        embedding_model=os.getenv("EMBEDDING_MODEL", "text-embedding-004"),
+        embedding_cache_path=os.getenv("EMBEDDING_CACHE_PATH") or None,
+        embedding_cache_dtype=os.getenv("EMBEDDING_CACHE_DTYPE", "float32"),
+        parent_chunk_size=int(os.getenv("PARENT_CHUNK_SIZE", "2000")),
+        child_chunk_size=int(os.getenv("CHILD_CHUNK_SIZE", "500")),
+        chunk_overlap=int(os.getenv("CHUNK_OVERLAP", "100")),
+        chunk_workers=int(os.getenv("CHUNK_WORKERS", "1")),
+        load_workers=int(os.getenv("LOAD_WORKERS", "8")),
+        doc_concurrency=int(os.getenv("DOC_CONCURRENCY", "4")),
+        pdf_cache_dir=os.getenv("PDF_CACHE_DIR") or None,
+        pg_connection_string=os.getenv("PG_CONNECTION_STRING"),
+        pg_host=os.getenv("PG_HOST", "localhost"),
+        pg_port=int(os.getenv("PG_PORT", "5432")),
+        pg_database=os.getenv("PG_DATABASE", "vectordb"),
+        pg_user=os.getenv("PG_USER", "postgres"),
+        pg_password=os.getenv("PG_PASSWORD"),
+        collection_name=os.getenv("COLLECTION_NAME", "documents"),
+        use_halfvec=os.getenv("USE_HALFVEC", "false").lower() == "true",
+        pdf_language=os.getenv("PDF_LANGUAGE", "vi"),
+        use_premium_pdf_mode=os.getenv("USE_PREMIUM_PDF_MODE", "true").lower()
         == "true",
-    }
+    )
 
     # Validate required fields
-    if not config["project_id"]:
+    if not config.project_id:
         raise ValueError("VERTEX_PROJECT_ID environment variable is required")
 
-    if not config["service_account_file"]:
+    if not config.service_account_file:
         raise ValueError(
             "GOOGLE_APPLICATION_CREDENTIALS environment variable is required"
         )
 
     # Validate PostgreSQL configuration
-    if not config["pg_connection_string"] and not config["pg_password"]:
+    if not config.pg_connection_string and not config.pg_password:
         raise ValueError(
             "Either PG_CONNECTION_STRING or PG_PASSWORD environment variable is required"
         )
@@ -92,24 +128,127 @@ def discover_documents(
     Returns:
         List of file paths
     """
-    dir_path = Path(directory_path)
-    if not dir_path.exists() or not dir_path.is_dir():
-        raise ValueError(f"Directory not found: {directory_path}")
+    return scan_directory(directory_path, recursive, supported_extensions)
 
-    file_paths = []
-    pattern = "**/*" if recursive else "*"
 
-    for file_path in dir_path.glob(pattern):
-        if file_path.is_file() and file_path.suffix in supported_extensions:
-            file_paths.append(file_path)
+async def process_document(
+    label: str,
+    file_path: Path,
+    loader: DocumentLoader,
+    chunker: DocumentChunker,
+    embedding_service: EmbeddingService,
+    vector_store: VectorStoreManager,
+) -> Optional[int]:
+    """
+    Load, chunk, embed and store a single document.
 
-    return file_paths
+    Args:
+        label: Prefix for progress lines, e.g. "[2/9] SGV_KNTT_T1.pdf"
+        file_path: Document to ingest
+        loader: Document loader
+        chunker: Hierarchical chunker
+        embedding_service: Embedding service
+        vector_store: Vector store manager
+
+    Returns:
+        Number of chunks stored, or None if the document had no content
+    """
+    # 2a. Load document
+    print(f"{label} 📄 Loading document...")
+    documents = await loader.aload_file(str(file_path))
+    if not documents:
+        print(f"{label} ⚠️  No content loaded, skipping")
+        return None
+    print(f"{label} ✓ Loaded {len(documents)} page(s)")
+
+    # Display educational metadata if available
+    if documents[0].metadata.get("has_metadata") is not False:
+        metadata_summary = documents[0].metadata.get("metadata_summary")
+        if metadata_summary:
+            print(f"{label} 📚 {metadata_summary}")
+
+    # 2b. Chunk document (CPU-bound, so off the event loop)
+    parent_chunks, child_chunks = await asyncio.to_thread(
+        chunker.split_documents, documents
+    )
+    stats = chunker.get_chunk_stats(parent_chunks, child_chunks)
+    print(
+        f"{label} ✂️  Created {stats['total_parent_chunks']} parent chunks, "
+        f"{stats['total_child_chunks']} child chunks (for embedding)"
+    )
+
+    # Child chunks are embedded (parent context rides in their metadata); pull
+    # their columns out once and hand those on instead of the Documents
+    texts = [chunk.page_content for chunk in child_chunks]
+    metadatas = [chunk.metadata for chunk in child_chunks]
+
+    # 2c. Embed all chunks of the document in one batched call
+    vectors = await embedding_service.aembed_documents(texts)
+
+    # 2d. Store chunks with their precomputed vectors
+    doc_ids = await asyncio.to_thread(
+        vector_store.add_texts_with_vectors, texts, metadatas, vectors
+    )
+    print(f"{label} 💾 Stored {len(doc_ids)} chunks")
+    return len(doc_ids)
+
+
+async def ingest_documents(
+    file_paths: List[Path],
+    loader: DocumentLoader,
+    chunker: DocumentChunker,
+    embedding_service: EmbeddingService,
+    vector_store: VectorStoreManager,
+    concurrency: int,
+) -> Tuple[int, int, int]:
+    """
+    Ingest documents, with up to ``concurrency`` of them in flight.
+
+    Loading (LlamaParse), embedding (Vertex AI) and storing (PostgreSQL)
+    are network-bound, so overlapping documents cuts wall-clock time.
+
+    Args:
+        file_paths: Documents to ingest
+        loader: Document loader
+        chunker: Hierarchical chunker
+        embedding_service: Embedding service
+        vector_store: Vector store manager
+        concurrency: Documents processed at once
+
+    Returns:
+        Tuple of (successful documents, failed documents, chunks stored)
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    total = len(file_paths)
+
+    async def run(idx: int, file_path: Path) -> Optional[int]:
+        label = f"[{idx}/{total}] {file_path.name}:"
+        async with semaphore:
+            try:
+                return await process_document(
+                    label,
+                    file_path,
+                    loader,
+                    chunker,
+                    embedding_service,
+                    vector_store,
+                )
+            except Exception as e:
+                print(f"{label} ❌ Error processing document: {e}")
+                return None
+
+    results = await asyncio.gather(
+        *(run(idx, fp) for idx, fp in enumerate(file_paths, 1))
+    )
+    stored = [count for count in results if count is not None]
+    return len(stored), total - len(stored), sum(stored)
 
 
 def main():
     """Main ingestion pipeline."""
     parser = argparse.ArgumentParser(
-        description="Ingest documents into vector database for RAG operations"
+        prog="python -m ingestion_app",
+        description="Ingest documents into vector database for RAG operations",
     )
     parser.add_argument(
         "--docs-dir",
@@ -143,26 +282,22 @@ def main():
     try:
         config = load_env_config()
         if args.collection_name:
-            config["collection_name"] = args.collection_name
+            config = replace(config, collection_name=args.collection_name)
     except Exception as e:
         print(f"❌ Configuration error: {e}")
         sys.exit(1)
 
     print(f"\n📋 Configuration:")
     print(f"  Documents directory: {args.docs_dir}")
-    print(f"  Collection name: {config['collection_name']}")
-    print(f"  Embedding model: {config['embedding_model']}")
-    print(
-        f"  Parent chunk size: {config['parent_chunk_size']} chars (context)"
-    )
-    print(
-        f"  Child chunk size: {config['child_chunk_size']} chars (embedding)"
-    )
-    print(f"  Chunk overlap: {config['chunk_overlap']}")
-    print(f"  PostgreSQL Database: {config['pg_database']}")
-    print(f"  PostgreSQL Host: {config['pg_host']}:{config['pg_port']}")
-    print(f"  PDF Language: {config['pdf_language']}")
-    print(f"  PDF Premium Mode: {config['use_premium_pdf_mode']}")
+    print(f"  Collection name: {config.collection_name}")
+    print(f"  Embedding model: {config.embedding_model}")
+    print(f"  Parent chunk size: {config.parent_chunk_size} chars (context)")
+    print(f"  Child chunk size: {config.child_chunk_size} chars (embedding)")
+    print(f"  Chunk overlap: {config.chunk_overlap}")
+    print(f"  PostgreSQL Database: {config.pg_database}")
+    print(f"  PostgreSQL Host: {config.pg_host}:{config.pg_port}")
+    print(f"  PDF Language: {config.pdf_language}")
+    print(f"  PDF Premium Mode: {config.use_premium_pdf_mode}")
     print()
 
     # Validate database connection before proceeding
@@ -172,20 +307,21 @@ def main():
         import psycopg2
 
         # Build connection string for validation
-        if config["pg_connection_string"]:
+        if config.pg_connection_string:
             # Convert SQLAlchemy format to psycopg2 format
             # Replace 'postgresql+psycopg2://' with 'postgresql://'
-            test_conn_string = config["pg_connection_string"].replace(
+            test_conn_string = config.pg_connection_string.replace(
                 "postgresql+psycopg://", "postgresql://"
             )
         else:
             test_conn_string = (
-                f"postgresql://{config['pg_user']}:{config['pg_password']}@"
-                f"{config['pg_host']}:{config['pg_port']}/{config['pg_database']}"
+                f"postgresql://{config.pg_user}:{config.pg_password}@"
+                f"{config.pg_host}:{config.pg_port}/{config.pg_database}"
             )
 
-        # Attempt to connect
+        # Attempt to connect; autocommit so CREATE EXTENSION below applies
         conn = psycopg2.connect(test_conn_string)
+        conn.autocommit = True
         cursor = conn.cursor()
 
         # Check PostgreSQL version
@@ -202,22 +338,26 @@ def main():
                 WHERE table_name = %s
             );
             """,
-            (config["collection_name"],),
+            (config.collection_name,),
         )
         table_exists = cursor.fetchone()[0]
 
         if table_exists:
-            # Count existing documents
+            # Planner estimate rather than COUNT(*), which scans the table
             cursor.execute(
-                f"SELECT COUNT(*) FROM {config['collection_name']};"
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s;",
+                (config.collection_name,),
             )
             doc_count = cursor.fetchone()[0]
-            print(
-                f"✓ Collection '{config['collection_name']}' exists ({doc_count} documents)"
-            )
+            if doc_count >= 0:
+                size = f"~{doc_count} documents (estimate)"
+            else:
+                # reltuples is -1 until the table is first analyzed
+                size = "size not yet estimated"
+            print(f"✓ Collection '{config.collection_name}' exists ({size})")
         else:
             print(
-                f"ℹ️  Collection '{config['collection_name']}' does not exist yet (will be created)"
+                f"ℹ️  Collection '{config.collection_name}' does not exist yet (will be created)"
             )
 
         # Check if pgvector extension exists
@@ -229,17 +369,22 @@ def main():
         if has_pgvector:
             print(f"✓ pgvector extension is installed")
         else:
-            print(f"⚠️  pgvector extension is NOT installed")
-            print(
-                f"   The pipeline will attempt to create it (requires superuser privileges)"
-            )
-            print(f"   If creation fails, please install pgvector manually:")
-            print(
-                f"   - Ubuntu/Debian: sudo apt install postgresql-17-pgvector"
-            )
-            print(
-                f"   - Or follow: https://github.com/pgvector/pgvector#installation"
-            )
+            # Create it on this connection instead of opening another one
+            print(f"⚠️  pgvector extension is NOT installed, creating it...")
+            try:
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS vector")
+                print("✓ pgvector extension created/verified")
+            except psycopg2.Error as e:
+                print(f"⚠️  Error creating pgvector extension: {e}")
+                print(
+                    f"   Creating it requires superuser privileges; please install pgvector manually:"
+                )
+                print(
+                    f"   - Ubuntu/Debian: sudo apt install postgresql-17-pgvector"
+                )
+                print(
+                    f"   - Or follow: https://github.com/pgvector/pgvector#installation"
+                )
 
         cursor.close()
         conn.close()
@@ -250,10 +395,10 @@ def main():
         print(f"   Error: {e}")
         print(f"\n   Please check:")
         print(
-            f"   1. PostgreSQL is running on {config['pg_host']}:{config['pg_port']}"
+            f"   1. PostgreSQL is running on {config.pg_host}:{config.pg_port}"
         )
-        print(f"   2. Database '{config['pg_database']}' exists")
-        print(f"   3. User '{config['pg_user']}' has correct password")
+        print(f"   2. Database '{config.pg_database}' exists")
+        print(f"   3. User '{config.pg_user}' has correct password")
         print(f"   4. PostgreSQL accepts connections from this host")
         sys.exit(1)
     except Exception as e:
@@ -267,8 +412,10 @@ def main():
     # Initialize document loader
     try:
         loader = DocumentLoader(
-            pdf_language=config["pdf_language"],
-            use_premium_mode=config["use_premium_pdf_mode"],
+            pdf_language=config.pdf_language,
+            use_premium_mode=config.use_premium_pdf_mode,
+            max_workers=config.load_workers,
+            cache_dir=config.pdf_cache_dir,
         )
         print(f"✓ Document loader initialized")
     except Exception as e:
@@ -278,9 +425,10 @@ def main():
     # Initialize chunker
     try:
         chunker = DocumentChunker(
-            parent_chunk_size=config["parent_chunk_size"],
-            child_chunk_size=config["child_chunk_size"],
-            chunk_overlap=config["chunk_overlap"],
+            parent_chunk_size=config.parent_chunk_size,
+            child_chunk_size=config.child_chunk_size,
+            chunk_overlap=config.chunk_overlap,
+            max_workers=config.chunk_workers,
         )
         print(f"✓ Document chunker initialized")
     except Exception as e:
@@ -290,12 +438,14 @@ def main():
     # Initialize embedding service
     try:
         embedding_service = EmbeddingService(
-            model_name=config["embedding_model"],
-            project_id=config["project_id"],
-            location=config["location"],
-            service_account_file=config["service_account_file"],
+            model_name=config.embedding_model,
+            project_id=config.project_id,
+            location=config.location,
+            service_account_file=config.service_account_file,
+            cache_path=config.embedding_cache_path,
+            cache_dtype=config.embedding_cache_dtype,
         )
-        print(f"✓ Embedding service initialized ({config['embedding_model']})")
+        print(f"✓ Embedding service initialized ({config.embedding_model})")
         print(
             f"  Embedding dimension: {embedding_service.get_embedding_dimension()}"
         )
@@ -305,31 +455,39 @@ def main():
 
     # Initialize vector store
     try:
-        if config["pg_connection_string"]:
-            connection_string = config["pg_connection_string"].replace(
+        if config.pg_connection_string:
+            connection_string = config.pg_connection_string.replace(
                 "postgresql+psycopg://", "postgresql+psycopg2://"
             )
         else:
             connection_string = None
 
+        # One pool for every COPY and maintenance query of the run, sized
+        # for the documents in flight; pgvector types are registered once
+        # per connection instead of on every write
+        pool = ConnectionPool(
+            test_conn_string,
+            min_size=2,
+            max_size=max(2, config.doc_concurrency),
+            configure=register_vector,
+            open=True,
+        )
+
         vector_store = VectorStoreManager(
-            embeddings=embedding_service.get_embeddings(),
-            collection_name=config["collection_name"],
+            # The service itself, so document embeddings go through its cache
+            embeddings=embedding_service,
+            collection_name=config.collection_name,
             connection_string=connection_string,
-            host=config["pg_host"],
-            port=config["pg_port"],
-            database=config["pg_database"],
-            user=config["pg_user"],
-            password=config["pg_password"],
+            host=config.pg_host,
+            port=config.pg_port,
+            database=config.pg_database,
+            user=config.pg_user,
+            password=config.pg_password,
+            use_halfvec=config.use_halfvec,
+            embedding_dimension=embedding_service.get_embedding_dimension(),
+            pool=pool,
         )
 
-        # Try to create pgvector extension
-        if connection_string:
-            VectorStoreManager.create_extension(connection_string)
-        else:
-            conn_str = f"postgresql+psycopg2://{config['pg_user']}:{config['pg_password']}@{config['pg_host']}:{config['pg_port']}/{config['pg_database']}"
-            VectorStoreManager.create_extension(conn_str)
-
         if args.reset:
             vector_store.reset_collection()
 
@@ -360,63 +518,33 @@ def main():
         print(f"❌ Error discovering documents: {e}")
         sys.exit(1)
 
-    # Step 2: Process each document individually
-    print("\n🔄 Step 2: Processing documents individually...")
+    # Step 2: Process documents, several at a time
+    print(
+        f"\n🔄 Step 2: Processing documents "
+        f"({config.doc_concurrency} at a time)..."
+    )
     print("-" * 70)
 
-    total_chunks_stored = 0
-    successful_docs = 0
-    failed_docs = 0
-
-    for idx, file_path in enumerate(file_paths, 1):
-        print(f"\n[{idx}/{len(file_paths)}] Processing: {file_path.name}")
-        print("  " + "-" * 66)
-
-        try:
-            # 2a. Load document
-            print(f"  📄 Loading document...")
-            documents = loader.load_file(str(file_path))
-            if not documents:
-                print(f"  ⚠️  No content loaded, skipping")
-                failed_docs += 1
-                continue
-            print(f"  ✓ Loaded {len(documents)} page(s)")
-
-            # Display educational metadata if available
-            if (
-                documents
-                and documents[0].metadata.get("has_metadata") is not False
-            ):
-                metadata_summary = documents[0].metadata.get(
-                    "metadata_summary"
-                )
-                if metadata_summary:
-                    print(f"  📚 {metadata_summary}")
-
-            # 2b. Chunk document
-            print(f"  ✂️  Chunking document...")
-            parent_chunks, child_chunks = chunker.split_documents(documents)
-            stats = chunker.get_chunk_stats(parent_chunks, child_chunks)
-            print(f"  ✓ Created {stats['total_parent_chunks']} parent chunks")
-            print(
-                f"  ✓ Created {stats['total_child_chunks']} child chunks (for embedding)"
+    async def run_ingestion() -> Tuple[int, int, int]:
+        # Closes the async client pool too, on the loop that opened it
+        async with embedding_service:
+            return await ingest_documents(
+                file_paths,
+                loader,
+                chunker,
+                embedding_service,
+                vector_store,
+                config.doc_concurrency,
             )
 
-            # Use child chunks for embedding (they contain parent context in metadata)
-            chunks = child_chunks
-
-            # 2c. Embed and store chunks
-            print(f"  💾 Storing chunks in vector database...")
-            doc_ids = vector_store.add_documents(chunks, batch_size=100)
-            print(f"  ✓ Stored {len(doc_ids)} chunks")
-
-            total_chunks_stored += len(doc_ids)
-            successful_docs += 1
+    successful_docs, failed_docs, total_chunks_stored = asyncio.run(
+        run_ingestion()
+    )
 
-        except Exception as e:
-            print(f"  ❌ Error processing document: {e}")
-            failed_docs += 1
-            continue
+    # Build the ANN index once over the loaded rows rather than per insert
+    if successful_docs > 0:
+        vector_store.build_ann_index()
+    pool.close()
 
     # Success summary
     print("\n" + "=" * 70)
@@ -430,7 +558,7 @@ def main():
     print(f"  Successfully processed: {successful_docs}")
     print(f"  Failed: {failed_docs}")
     print(f"  Total chunks stored: {total_chunks_stored}")
-    print(f"  Collection: {config['collection_name']}")
+    print(f"  Collection: {config.collection_name}")
     print()
 
 
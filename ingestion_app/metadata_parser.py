@@ -13,8 +13,8 @@ Expected filename format:
 Where x is the grade (1-5) and y is the version (ignored).
 """
 
+import os
 import re
-from pathlib import Path
 from typing import Any, Dict, Optional
 
 # Subject code mapping
@@ -24,6 +24,13 @@ SUBJECT_MAPPING = {
     "TV": "Tiếng Việt",  # Literature
 }
 
+# Pattern to match the educational book filename format
+# Matches: SGV_KNTT_<SUBJECT><GRADE>[_T<VERSION>] or SGK_<SUBJECT><GRADE>[_<VERSION>]
+# Subject can be: T, TA, or TV
+# Grade is a single digit (1-5)
+# Optional version suffix for literature books (e.g., _T)
+_FILENAME_RE = re.compile(r"SG[VK]_KNTT_(T[AV]?)(\d)(?:_T\d)?$", re.IGNORECASE)
+
 
 def parse_educational_metadata(filename: str) -> Dict[str, Any]:
     """
@@ -50,7 +57,8 @@ def parse_educational_metadata(filename: str) -> Dict[str, Any]:
         {'grade': 5, 'subject_code': 'TV', 'subject_name': 'Tiếng Việt', 'has_metadata': True}
     """
     # Remove extension and get base filename
-    base_filename = Path(filename).stem
+    name = os.path.basename(filename)
+    base_filename = name.rpartition(".")[0] or name
 
     # Initialize result
     result = {
@@ -60,22 +68,12 @@ def parse_educational_metadata(filename: str) -> Dict[str, Any]:
         "has_metadata": False,
     }
 
-    # Pattern to match the educational book filename format
-    # Matches: SGV_KNTT_<SUBJECT><GRADE>[_T<VERSION>] or SGK_<SUBJECT><GRADE>[_<VERSION>]
-    # Subject can be: T, TA, or TV
-    # Grade is a single digit (1-5)
-    # Optional version suffix for literature books (e.g., _T)
-    pattern = r"SG[VK]_KNTT_(T[AV]?)(\d)(?:_T\d)?$"
-
-    match = re.search(pattern, base_filename, re.IGNORECASE)
+    match = _FILENAME_RE.search(base_filename)
 
     if match:
         subject_code = match.group(1).upper()
         grade_str = match.group(2)
 
-        print("subject_code", subject_code)
-        print("grade_str", grade_str)
-
         try:
             grade = int(grade_str)
 
@@ -106,8 +104,7 @@ def extract_metadata_from_path(file_path: str) -> Dict[str, Any]:
     Returns:
         Dictionary with educational metadata
     """
-    filename = Path(file_path).name
-    return parse_educational_metadata(filename)
+    return parse_educational_metadata(os.path.basename(file_path))
 
 
 def validate_metadata(metadata: Dict[str, Any]) -> bool:
@@ -1,10 +1,42 @@
 """Vector store module to manage PostgreSQL with pgvector for document storage and retrieval."""
 
-from typing import Any, Dict, List, Optional
-
+import logging
+import uuid
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import orjson
+import psycopg
 from langchain_community.vectorstores import PGVector
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
+from pgvector.psycopg import register_vector
+from psycopg import sql
+from psycopg.types.json import Jsonb
+from psycopg_pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# Columns of langchain_community's PGVector table, in COPY order, and their
+# types for the binary COPY format
+_COPY_COLUMNS = (
+    "uuid",
+    "collection_id",
+    "embedding",
+    "document",
+    "cmetadata",
+    "custom_id",
+)
+_COPY_TYPES = ["uuid", "uuid", "vector", "varchar", "jsonb", "varchar"]
+
+# Serializes cmetadata in C straight to UTF-8 bytes, which the jsonb dumper
+# sends as is; non-str keys are stringified as json.dumps would
+_dumps_metadata = partial(orjson.dumps, option=orjson.OPT_NON_STR_KEYS)
+
+# Widest column pgvector will build an HNSW index on, per column type
+_HNSW_MAX_DIMENSIONS = {"vector": 2000, "halfvec": 4000}
 
 
 class VectorStoreManager:
@@ -20,6 +52,9 @@ class VectorStoreManager:
         database: Optional[str] = "vectordb",
         user: Optional[str] = "postgres",
         password: Optional[str] = None,
+        use_halfvec: bool = False,
+        embedding_dimension: Optional[int] = None,
+        pool: Optional[ConnectionPool] = None,
     ):
         """
         Initialize the VectorStoreManager with PostgreSQL + pgvector.
@@ -33,9 +68,22 @@ class VectorStoreManager:
             database: Database name
             user: Database user
             password: Database password
+            use_halfvec: Store embeddings as FP16 halfvec, converting the
+                shared embedding column on first use. Halves storage and
+                lets HNSW index up to 4000 dimensions
+            embedding_dimension: Width of the halfvec column; probed from
+                the embeddings if not given
+            pool: Connection pool for the COPY and maintenance queries;
+                its connections must have pgvector types registered. A
+                fresh connection is opened per call if not given
         """
         self.embeddings = embeddings
         self.collection_name = collection_name
+        self.use_halfvec = use_halfvec
+        self.embedding_dimension = embedding_dimension
+        self.pool = pool
+        # uuid of the collection row, looked up on first use
+        self._collection_id: Optional[uuid.UUID] = None
 
         if connection_string:
             self.connection_string = connection_string
@@ -54,12 +102,47 @@ class VectorStoreManager:
         Returns:
             PGVector vector store instance
         """
-        return PGVector(
+        # PGVector creates the collection row; a reset gives it a new uuid
+        self._collection_id = None
+        store = PGVector(
             embedding_function=self.embeddings,
             collection_name=self.collection_name,
             connection_string=self.connection_string,
             use_jsonb=True,  # Store metadata as JSONB for better querying
         )
+        if self.use_halfvec:
+            self._ensure_halfvec_column()
+        return store
+
+    def _ensure_halfvec_column(self):
+        """
+        Convert the embedding column to halfvec(dimension) if needed.
+
+        PGVector creates the column as an untyped vector. Any index on it
+        is dropped first, since its operator class only fits vector.
+        """
+        if self.embedding_dimension is None:
+            self.embedding_dimension = len(self.embeddings.embed_query(" "))
+        column_type = f"halfvec({int(self.embedding_dimension)})"
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+                "WHERE attrelid = 'langchain_pg_embedding'::regclass "
+                "AND attname = 'embedding'"
+            ).fetchone()
+            if row and row[0] == column_type:
+                return
+
+            print(f"Converting embedding column to {column_type}...")
+            conn.execute("DROP INDEX IF EXISTS idx_embedding_hnsw")
+            conn.execute(
+                sql.SQL(
+                    "ALTER TABLE langchain_pg_embedding "
+                    "ALTER COLUMN embedding TYPE {type} "
+                    "USING embedding::{type}"
+                ).format(type=sql.SQL(column_type))
+            )
 
     def add_documents(
         self,
@@ -72,7 +155,8 @@ class VectorStoreManager:
 
         Args:
             documents: List of Document objects to add
-            batch_size: Number of documents to process in each batch
+            batch_size: Kept for compatibility; the embeddings instance
+                batches its own requests and rows go out in a single COPY
             ids: Optional list of IDs for the documents
 
         Returns:
@@ -81,28 +165,221 @@ class VectorStoreManager:
         if not documents:
             return []
 
-        print(
-            f"Adding {len(documents)} documents to PostgreSQL vector store..."
+        logger.debug(
+            "Adding %d documents to PostgreSQL vector store", len(documents)
         )
 
-        # Process in batches to avoid memory issues
-        all_ids = []
-        for i in range(0, len(documents), batch_size):
-            batch = documents[i : i + batch_size]
-            batch_ids = ids[i : i + batch_size] if ids else None
+        # One embedding call for all texts; EmbeddingService packs them into
+        # requests and runs those concurrently
+        vectors = self.embeddings.embed_documents(
+            [doc.page_content for doc in documents]
+        )
+        return self.add_documents_with_vectors(documents, vectors, ids)
 
-            doc_ids = self.vector_store.add_documents(
-                documents=batch,
-                ids=batch_ids,
-            )
-            all_ids.extend(doc_ids)
+    def add_documents_with_vectors(
+        self,
+        documents: List[Document],
+        vectors: List[List[float]],
+        ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        """
+        Add documents whose embeddings were already computed.
 
-            print(
-                f"  Processed batch {i // batch_size + 1}/{(len(documents) - 1) // batch_size + 1}"
+        Args:
+            documents: Documents to store
+            vectors: Embedding of each document, in the same order
+            ids: Optional list of IDs for the documents
+
+        Returns:
+            List of document IDs
+
+        Raises:
+            ValueError: If the collection does not exist
+        """
+        return self.add_texts_with_vectors(
+            [doc.page_content for doc in documents],
+            [doc.metadata for doc in documents],
+            vectors,
+            ids,
+        )
+
+    def add_texts_with_vectors(
+        self,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        vectors: Sequence[Sequence[float]],
+        ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        """
+        Add texts, their metadata and precomputed embeddings as columns.
+
+        Rows stream over a single binary COPY in one transaction instead of
+        one INSERT each, which is what PGVector.add_embeddings issues. The
+        commit does not wait for the WAL flush: a crash can lose the last
+        batch, but the source files can simply be ingested again.
+
+        Args:
+            texts: Text of each row
+            metadatas: Metadata of each row, in the same order
+            vectors: Embedding of each row, as lists or an (N, d) array
+            ids: Optional list of IDs for the rows
+
+        Returns:
+            List of row IDs
+
+        Raises:
+            ValueError: If the collection does not exist
+        """
+        if ids is None:
+            ids = [str(uuid.uuid4()) for _ in texts]
+
+        # One conversion for the whole batch, already in the big-endian
+        # layout of the binary format, so the dumper does not copy each row
+        if self.use_halfvec:
+            types = [*_COPY_TYPES[:2], "halfvec", *_COPY_TYPES[3:]]
+            matrix = np.asarray(vectors, dtype=">f2")
+        else:
+            types = _COPY_TYPES
+            matrix = np.asarray(vectors, dtype=">f4")
+
+        with self._connect() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SET LOCAL synchronous_commit = off")
+                collection_id = self._resolve_collection_id(cursor)
+
+                with cursor.copy(
+                    f"COPY langchain_pg_embedding ({', '.join(_COPY_COLUMNS)}) "
+                    "FROM STDIN WITH (FORMAT BINARY)"
+                ) as copy:
+                    copy.set_types(types)
+                    for text, metadata, vector, row_id in zip(
+                        texts, metadatas, matrix, ids
+                    ):
+                        copy.write_row(
+                            (
+                                uuid.uuid4(),
+                                collection_id,
+                                vector,
+                                text,
+                                Jsonb(metadata, dumps=_dumps_metadata),
+                                row_id,
+                            )
+                        )
+
+        # Runs once per stored document; callers report progress themselves
+        logger.debug("Added %d documents to PostgreSQL", len(ids))
+        return ids
+
+    def build_ann_index(
+        self,
+        m: int = 16,
+        ef_construction: int = 64,
+        ops: Optional[str] = None,
+    ) -> bool:
+        """
+        Create an HNSW index on the embedding column if there is none.
+
+        Meant to run once after a bulk load, since building over existing
+        rows is much faster than updating the index on every insert. The
+        default ops match PGVector's cosine distance strategy.
+
+        pgvector can only index a column declared with a fixed dimension of
+        at most 2000 (4000 for halfvec), so the index is skipped for
+        untyped or wider columns.
+
+        Args:
+            m: Maximum connections per graph node
+            ef_construction: Candidate list size while building
+            ops: Operator class of the distance the queries use; cosine
+                for the column type if not given
+
+        Returns:
+            True if the index exists afterwards, False if it was skipped
+        """
+        column = "halfvec" if self.use_halfvec else "vector"
+        if ops is None:
+            ops = f"{column}_cosine_ops"
+        limit = _HNSW_MAX_DIMENSIONS[column]
+
+        try:
+            with self._connect() as conn:
+                # atttypmod holds the declared dimension, -1 if there is none
+                row = conn.execute(
+                    "SELECT atttypmod FROM pg_attribute "
+                    "WHERE attrelid = 'langchain_pg_embedding'::regclass "
+                    "AND attname = 'embedding'"
+                ).fetchone()
+                dimension = row[0] if row else -1
+                if not 0 < dimension <= limit:
+                    print(
+                        "⚠️  Skipping HNSW index: the embedding column needs "
+                        f"a fixed dimension of at most {limit}"
+                    )
+                    return False
+
+                conn.execute(
+                    sql.SQL(
+                        "CREATE INDEX IF NOT EXISTS idx_embedding_hnsw "
+                        "ON langchain_pg_embedding "
+                        "USING hnsw (embedding {}) "
+                        "WITH (m = {}, ef_construction = {})"
+                    ).format(
+                        sql.Identifier(ops),
+                        sql.Literal(int(m)),
+                        sql.Literal(int(ef_construction)),
+                    )
+                )
+        except psycopg.Error as e:
+            print(f"⚠️  Error building HNSW index: {e}")
+            return False
+
+        print("✓ HNSW index on embeddings is ready")
+        return True
+
+    def _resolve_collection_id(self, cursor: psycopg.Cursor) -> uuid.UUID:
+        """
+        Return the collection's uuid, querying it only the first time.
+
+        Args:
+            cursor: Cursor to run the lookup on if it is not cached yet
+
+        Returns:
+            uuid of the langchain_pg_collection row
+
+        Raises:
+            ValueError: If the collection does not exist
+        """
+        if self._collection_id is None:
+            cursor.execute(
+                "SELECT uuid FROM langchain_pg_collection WHERE name = %s",
+                (self.collection_name,),
             )
+            row = cursor.fetchone()
+            if row is None:
+                raise ValueError("Collection not found")
+            self._collection_id = row[0]
+        return self._collection_id
+
+    @contextmanager
+    def _connect(self) -> Iterator[psycopg.Connection]:
+        """
+        Yield a connection with pgvector types, committing on success.
+
+        Borrowed from the pool when there is one, opened otherwise.
+        """
+        if self.pool is not None:
+            with self.pool.connection() as conn:
+                yield conn
+            return
 
-        print(f"✓ Successfully added {len(all_ids)} documents to PostgreSQL")
-        return all_ids
+        with psycopg.connect(self._libpq_url()) as conn:
+            register_vector(conn)
+            yield conn
+
+    def _libpq_url(self) -> str:
+        """Connection string without a SQLAlchemy driver suffix."""
+        scheme, sep, rest = self.connection_string.partition("://")
+        return scheme.split("+", 1)[0] + sep + rest
 
     def similarity_search(
         self,
@@ -193,24 +470,14 @@ class VectorStoreManager:
             Dictionary with collection statistics
         """
         try:
-            # Execute a query to count documents
-            import psycopg2
-
-            psycopg2_url = self.connection_string.replace(
-                "postgresql+psycopg2://", "postgresql://"
-            )
-            conn = psycopg2.connect(psycopg2_url)
-            cursor = conn.cursor()
-
             # Count total documents in the table
-            cursor.execute(
-                f"SELECT COUNT(*) FROM langchain_pg_embedding WHERE collection_id = (SELECT uuid FROM langchain_pg_collection WHERE name = %s)",
-                (self.collection_name,),
-            )
-            count = cursor.fetchone()[0]
-
-            cursor.close()
-            conn.close()
+            with self._connect() as conn, conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT COUNT(*) FROM langchain_pg_embedding "
+                    "WHERE collection_id = %s",
+                    (self._resolve_collection_id(cursor),),
+                )
+                count = cursor.fetchone()[0]
 
             return {
                 "collection_name": self.collection_name,
@@ -0,0 +1,120 @@
+"""Test hierarchical document chunking."""
+
+import pytest
+from langchain_core.documents import Document
+
+from ingestion_app.documents_chunking import HierarchicalDocumentChunker
+
+
+@pytest.fixture
+def chunker():
+    """Chunker with small sizes so short texts produce several chunks."""
+    return HierarchicalDocumentChunker(
+        parent_chunk_size=200, child_chunk_size=60, chunk_overlap=10
+    )
+
+
+@pytest.fixture
+def documents():
+    """Two documents, one without a doc_id."""
+    paragraph = "Phân số là một phần của tổng thể. " * 12
+    return [
+        Document(page_content=paragraph, metadata={"doc_id": "math-6"}),
+        Document(page_content=paragraph, metadata={"source": "notes.md"}),
+    ]
+
+
+class TestSplitDocuments:
+    """Test HierarchicalDocumentChunker.split_documents."""
+
+    def test_empty_input(self, chunker):
+        """Test no documents yields no chunks."""
+        assert chunker.split_documents([]) == ([], [])
+
+    def test_ids_are_global_and_sequential(self, chunker, documents):
+        """Test parent and child ids run across all documents."""
+        parents, children = chunker.split_documents(documents)
+
+        assert [p.metadata["chunk_id"] for p in parents] == list(
+            range(len(parents))
+        )
+        assert [c.metadata["chunk_id"] for c in children] == list(
+            range(len(children))
+        )
+
+    def test_children_reference_their_parent(self, chunker, documents):
+        """Test each child points at a parent containing its text."""
+        parents, children = chunker.split_documents(documents)
+
+        for child in children:
+            parent = parents[child.metadata["parent_id"]]
+            assert child.metadata["chunk_type"] == "child"
+            assert child.page_content in parent.page_content
+            assert child.metadata["chunk_size"] == len(child.page_content)
+            assert child.metadata["doc_id"] == parent.metadata["doc_id"]
+            assert child.metadata["parent_text"] == parent.page_content
+
+    def test_doc_id_defaults_to_unknown(self, chunker, documents):
+        """Test parents keep their source doc_id or fall back."""
+        parents, _ = chunker.split_documents(documents)
+
+        assert {p.metadata["doc_id"] for p in parents} == {
+            "math-6",
+            "unknown",
+        }
+
+    def test_child_metadata_is_not_shared(self, chunker, documents):
+        """Test sibling children get independent metadata dicts."""
+        _, children = chunker.split_documents(documents)
+
+        children[0].metadata["extra"] = True
+
+        assert "extra" not in children[1].metadata
+
+    def test_parallel_split_matches_serial(self, documents):
+        """Test worker processes produce the same chunks and ids."""
+        documents = documents * 3
+        serial = HierarchicalDocumentChunker(
+            parent_chunk_size=200, child_chunk_size=60, chunk_overlap=10
+        )
+        parallel = HierarchicalDocumentChunker(
+            parent_chunk_size=200,
+            child_chunk_size=60,
+            chunk_overlap=10,
+            max_workers=2,
+        )
+
+        assert parallel.split_documents(documents) == serial.split_documents(
+            documents
+        )
+
+
+class TestGetChunkStats:
+    """Test HierarchicalDocumentChunker.get_chunk_stats."""
+
+    def test_stats_match_chunk_sizes(self, chunker, documents):
+        """Test reported sizes agree with the chunks themselves."""
+        parents, children = chunker.split_documents(documents)
+        parent_sizes = [len(p.page_content) for p in parents]
+        child_sizes = [len(c.page_content) for c in children]
+
+        stats = chunker.get_chunk_stats(parents, children)
+
+        assert stats["total_parent_chunks"] == len(parents)
+        assert stats["total_child_chunks"] == len(children)
+        assert stats["avg_parent_size"] == sum(parent_sizes) // len(parents)
+        assert stats["avg_child_size"] == sum(child_sizes) // len(children)
+        assert stats["min_child_size"] == min(child_sizes)
+        assert stats["max_parent_size"] == max(parent_sizes)
+        assert stats["total_characters"] == sum(parent_sizes)
+        assert isinstance(stats["total_characters"], int)
+
+    def test_no_children(self, chunker):
+        """Test parents without children report zero child sizes."""
+        parents = [Document(page_content="abc"), Document(page_content="a")]
+
+        stats = chunker.get_chunk_stats(parents, [])
+
+        assert stats["avg_parent_size"] == 2
+        assert stats["min_child_size"] == 0
+        assert stats["avg_child_size"] == 0
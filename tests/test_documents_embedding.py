@@ -0,0 +1,362 @@
+"""Test the ingestion embedding service."""
+
+import asyncio
+import os
+import threading
+import unicodedata
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from google.genai.errors import APIError
+
+from ingestion_app.documents_embedding import EmbeddingService
+
+
+def _fake_vectors(texts):
+    return [[float(len(t)), 0.5] for t in texts]
+
+
+@pytest.fixture
+def provider():
+    """Mock LangChain embeddings client."""
+    embeddings = Mock()
+    embeddings.embed_documents.side_effect = _fake_vectors
+    embeddings.aembed_documents = AsyncMock(side_effect=_fake_vectors)
+    embeddings.embed_query.side_effect = lambda t: [float(len(t))]
+    embeddings.client.aio.aclose = AsyncMock()
+    embeddings.aembed_query = AsyncMock(side_effect=lambda t: [float(len(t))])
+    return embeddings
+
+
+@pytest.fixture
+def make_service(provider):
+    """Build an EmbeddingService without contacting Vertex AI."""
+
+    def make(**kwargs):
+        with (
+            patch.object(EmbeddingService, "_initialize_vertexai"),
+            patch(
+                "ingestion_app.documents_embedding.GoogleGenerativeAIEmbeddings",
+                return_value=provider,
+            ),
+        ):
+            return EmbeddingService(project_id="test-project", **kwargs)
+
+    return make
+
+
+class TestDocumentCache:
+    """Test the content-hash document embedding cache."""
+
+    def test_without_cache_calls_provider(self, make_service, provider):
+        """Test embeddings pass straight through when no cache is set."""
+        service = make_service()
+
+        assert service.embed_documents(["ab", "c"]) == [[2.0, 0.5], [1.0, 0.5]]
+        provider.embed_documents.assert_called_once_with(["ab", "c"])
+
+    def test_duplicates_embedded_once_without_cache(
+        self, make_service, provider
+    ):
+        """Test repeated texts in one call hit the provider once."""
+        service = make_service()
+
+        assert service.embed_documents(["ab", "c", "ab"]) == [
+            [2.0, 0.5],
+            [1.0, 0.5],
+            [2.0, 0.5],
+        ]
+        assert asyncio.run(service.aembed_documents(["c", "c"])) == [
+            [1.0, 0.5],
+            [1.0, 0.5],
+        ]
+        provider.embed_documents.assert_called_once_with(["ab", "c"])
+        provider.aembed_documents.assert_awaited_once_with(["c"])
+
+    def test_only_misses_are_embedded(self, make_service, provider, tmp_path):
+        """Test cached texts are served locally across service instances."""
+        cache_path = str(tmp_path / "embeddings.sqlite")
+
+        first = make_service(cache_path=cache_path)
+        assert first.embed_documents(["ab", "ab", "c"]) == [
+            [2.0, 0.5],
+            [2.0, 0.5],
+            [1.0, 0.5],
+        ]
+        provider.embed_documents.assert_called_once_with(["ab", "c"])
+
+        provider.embed_documents.reset_mock()
+        second = make_service(cache_path=cache_path)
+        assert second.embed_documents(["xyz", "c"]) == [
+            [3.0, 0.5],
+            [1.0, 0.5],
+        ]
+        provider.embed_documents.assert_called_once_with(["xyz"])
+
+    def test_cache_is_per_model(self, make_service, provider, tmp_path):
+        """Test vectors from one model are not reused for another."""
+        cache_path = str(tmp_path / "embeddings.sqlite")
+        make_service(cache_path=cache_path).embed_documents(["ab"])
+
+        provider.embed_documents.reset_mock()
+        make_service(
+            model_name="text-embedding-004", cache_path=cache_path
+        ).embed_documents(["ab"])
+
+        provider.embed_documents.assert_called_once_with(["ab"])
+
+    def test_float16_cache(self, make_service, provider, tmp_path):
+        """Test float16 rows round-trip and are kept apart from float32."""
+        cache_path = str(tmp_path / "embeddings.sqlite")
+        make_service(cache_path=cache_path).embed_documents(["ab"])
+
+        provider.embed_documents.reset_mock()
+        half = make_service(cache_path=cache_path, cache_dtype="float16")
+        half.embed_documents(["ab"])
+        provider.embed_documents.assert_called_once_with(["ab"])
+
+        provider.embed_documents.reset_mock()
+        half = make_service(cache_path=cache_path, cache_dtype="float16")
+        assert half.embed_documents(["ab"]) == [[2.0, 0.5]]
+        provider.embed_documents.assert_not_called()
+
+    def test_rejects_unknown_cache_dtype(self, make_service):
+        """Test an unsupported cache_dtype fails fast."""
+        with pytest.raises(ValueError, match="cache_dtype"):
+            make_service(cache_dtype="int8")
+
+    def test_async_uses_cache(self, make_service, provider, tmp_path):
+        """Test aembed_documents shares the cache with embed_documents."""
+        service = make_service(cache_path=str(tmp_path / "e.sqlite"))
+        service.embed_documents(["ab"])
+
+        result = asyncio.run(service.aembed_documents(["ab", "c"]))
+
+        assert result == [[2.0, 0.5], [1.0, 0.5]]
+        provider.aembed_documents.assert_awaited_once_with(["c"])
+
+
+class TestConcurrentBatches:
+    """Test batched async document embedding."""
+
+    def test_batches_keep_input_order(self, make_service, provider):
+        """Test results are flattened in input order across batches."""
+        service = make_service(batch_size=2, max_concurrency=2)
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+        result = asyncio.run(service.aembed_documents(texts))
+
+        assert result == _fake_vectors(texts)
+        assert provider.aembed_documents.await_count == 3
+
+    def test_concurrency_is_bounded(self, make_service, provider):
+        """Test no more than max_concurrency batches run at once."""
+        in_flight = 0
+        peak = 0
+
+        async def slow_embed(texts):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _fake_vectors(texts)
+
+        provider.aembed_documents = AsyncMock(side_effect=slow_embed)
+        service = make_service(batch_size=1, max_concurrency=3)
+
+        asyncio.run(service.aembed_documents(list("abcdefgh")))
+
+        assert peak == 3
+
+    def test_sync_batches_run_in_threads(self, make_service, provider):
+        """Test embed_documents overlaps batches and keeps input order."""
+        started = threading.Barrier(2, timeout=5)
+
+        def slow_embed(texts):
+            started.wait()  # both batches must be in flight together
+            return _fake_vectors(texts)
+
+        provider.embed_documents.side_effect = slow_embed
+        service = make_service(batch_size=2, max_concurrency=2)
+        texts = ["a", "bb", "ccc", "dddd"]
+
+        assert service.embed_documents(texts) == _fake_vectors(texts)
+
+    def test_batches_respect_token_budget(self, make_service):
+        """Test texts are packed up to the token estimate, in order."""
+        # "w w w" counts as 5 units, estimated at 10 tokens
+        service = make_service(max_tokens_per_batch=25)
+        texts = ["w w w", "w w w", "w w w", "w w w w w w w w w w w w w w"]
+
+        assert service._pack_batches(texts) == [
+            texts[:2],
+            texts[2:3],
+            texts[3:],
+        ]
+
+    def test_rate_limited_batch_is_retried(self, make_service, provider):
+        """Test a 429 from the provider is retried after a backoff."""
+        provider.embed_documents.side_effect = [
+            APIError(429, {"error": {"message": "quota"}}),
+            [[1.0]],
+        ]
+        service = make_service()
+
+        with patch("ingestion_app.documents_embedding.time.sleep") as sleep:
+            assert service.embed_documents(["a"]) == [[1.0]]
+
+        sleep.assert_called_once_with(1)
+        assert provider.embed_documents.call_count == 2
+
+    def test_other_errors_are_not_retried(self, make_service, provider):
+        """Test client errors other than rate limits propagate at once."""
+        provider.aembed_documents = AsyncMock(
+            side_effect=APIError(400, {"error": {"message": "bad"}})
+        )
+        service = make_service()
+
+        with pytest.raises(APIError):
+            asyncio.run(service.aembed_documents(["a"]))
+        provider.aembed_documents.assert_awaited_once()
+
+
+class TestQueryCache:
+    """Test the in-memory query embedding LRU."""
+
+    def test_repeated_query_hits_cache(self, make_service, provider):
+        """Test a repeated query is embedded once, sync or async."""
+        service = make_service()
+
+        assert service.embed_query("abc") == [3.0]
+        assert asyncio.run(service.aembed_query("abc")) == [3.0]
+        assert service.embed_query("abc") == [3.0]
+
+        provider.embed_query.assert_called_once_with("abc")
+        provider.aembed_query.assert_not_awaited()
+
+    def test_near_duplicate_queries_share_entry(self, make_service, provider):
+        """Test spacing, case, punctuation and NFD noise hit the cache."""
+        service = make_service()
+
+        service.embed_query("Phân số là gì?")
+        service.embed_query("  phân  số là gì ")
+        service.embed_query(unicodedata.normalize("NFD", "Phân số là gì"))
+
+        provider.embed_query.assert_called_once_with("Phân số là gì?")
+
+    def test_diacritics_are_significant(self, make_service, provider):
+        """Test queries differing in diacritics are embedded separately."""
+        service = make_service()
+
+        service.embed_query("ban")
+        service.embed_query("bạn")
+
+        assert provider.embed_query.call_count == 2
+
+    def test_returned_vector_is_a_copy(self, make_service):
+        """Test mutating a result does not change the cached vector."""
+        service = make_service()
+
+        service.embed_query("abc").append(1.0)
+
+        assert service.embed_query("abc") == [3.0]
+
+    def test_least_recently_used_is_evicted(self, make_service, provider):
+        """Test the cache is bounded by query_cache_size."""
+        service = make_service(query_cache_size=2)
+
+        service.embed_query("a")
+        service.embed_query("bb")
+        service.embed_query("a")
+        service.embed_query("ccc")  # evicts "bb"
+        service.embed_query("bb")
+
+        assert [c.args[0] for c in provider.embed_query.call_args_list] == [
+            "a",
+            "bb",
+            "ccc",
+            "bb",
+        ]
+
+
+class TestEmbeddingDimension:
+    """Test EmbeddingService.get_embedding_dimension."""
+
+    @pytest.mark.parametrize(
+        "model_name, dimension",
+        [
+            ("gemini-embedding-001", 3072),
+            ("models/gemini-embedding-001", 3072),
+            ("text-embedding-004", 768),
+        ],
+    )
+    def test_known_models(self, make_service, provider, model_name, dimension):
+        """Test known models report their dimension without a request."""
+        service = make_service(model_name=model_name)
+
+        assert service.get_embedding_dimension() == dimension
+        provider.embed_query.assert_not_called()
+
+    def test_unknown_model_is_probed_once(self, make_service, provider):
+        """Test other models are measured with a single probe embedding."""
+        provider.embed_query.side_effect = lambda t: [0.0] * 1536
+        service = make_service(model_name="some-new-embedding")
+
+        assert service.get_embedding_dimension() == 1536
+        assert service.get_embedding_dimension() == 1536
+        provider.embed_query.assert_called_once()
+
+
+class TestClose:
+    """Test releasing the client and cache."""
+
+    def test_context_manager_closes(self, make_service, provider, tmp_path):
+        """Test leaving the with block closes the client and the cache."""
+        with make_service(cache_path=str(tmp_path / "e.sqlite")) as service:
+            service.embed_documents(["ab"])
+
+        provider.client.close.assert_called_once_with()
+        assert service._cache is None
+
+    def test_async_context_manager_closes(self, make_service, provider):
+        """Test async with also closes the async connection pool."""
+
+        async def run():
+            async with make_service():
+                pass
+
+        asyncio.run(run())
+
+        provider.client.aio.aclose.assert_awaited_once_with()
+        provider.client.close.assert_called_once_with()
+
+
+class TestCredentials:
+    """Test service account credential loading."""
+
+    def test_file_is_read_once_until_modified(self, provider, tmp_path):
+        """Test services sharing a file reuse its parsed credentials."""
+        path = tmp_path / "sa.json"
+        path.write_text('{"type": "service_account"}', encoding="utf-8")
+
+        with (
+            patch("ingestion_app.documents_embedding.vertexai.init"),
+            patch(
+                "ingestion_app.documents_embedding.service_account.Credentials"
+                ".from_service_account_info"
+            ) as from_info,
+            patch(
+                "ingestion_app.documents_embedding.GoogleGenerativeAIEmbeddings",
+                return_value=provider,
+            ),
+        ):
+            for _ in range(2):
+                EmbeddingService(
+                    project_id="p", service_account_file=str(path)
+                )
+            assert from_info.call_count == 1
+
+            os.utime(path, (0, 0))
+            EmbeddingService(project_id="p", service_account_file=str(path))
+            assert from_info.call_count == 2
@@ -0,0 +1,142 @@
+"""Test the ingestion document loader."""
+
+from unittest.mock import Mock
+
+import pytest
+from langchain_core.documents import Document
+
+from ingestion_app.documents_loader import DocumentLoader, scan_directory
+
+
+@pytest.fixture
+def loader(tmp_path):
+    """Loader with a PDF cache and a mocked LlamaParse parser."""
+    loader = DocumentLoader(cache_dir=str(tmp_path / "cache"))
+    loader.llama_parser = Mock()
+    loader._parser_config_key = "{}"
+    return loader
+
+
+class TestScanDirectory:
+    """Test scan_directory."""
+
+    def test_matches_extensions_case_insensitively(self, tmp_path):
+        """Test supported files are found in subdirectories only if asked."""
+        (tmp_path / "sub").mkdir()
+        for name in ["a.pdf", "b.TXT", ".md", "c.py", "sub/d.docx"]:
+            (tmp_path / name).touch()
+
+        found = scan_directory(
+            str(tmp_path), True, DocumentLoader.SUPPORTED_EXT_SET
+        )
+        top = scan_directory(
+            str(tmp_path), False, DocumentLoader.SUPPORTED_EXT_SET
+        )
+
+        assert sorted(p.name for p in found) == ["a.pdf", "b.TXT", "d.docx"]
+        assert sorted(p.name for p in top) == ["a.pdf", "b.TXT"]
+
+    def test_missing_directory(self, tmp_path):
+        """Test a missing directory raises ValueError."""
+        with pytest.raises(ValueError, match="Directory not found"):
+            scan_directory(str(tmp_path / "nope"), True, {".pdf"})
+
+
+class TestLoadFile:
+    """Test DocumentLoader.load_file."""
+
+    def test_text_file_gets_educational_metadata(self, loader, tmp_path):
+        """Test file and filename-derived metadata are attached."""
+        path = tmp_path / "SGV_KNTT_T1.txt"
+        path.write_text("Phân số", encoding="utf-8")
+
+        [doc] = loader.load_file(str(path))
+
+        assert doc.page_content == "Phân số"
+        assert doc.metadata["source_file"] == "SGV_KNTT_T1.txt"
+        assert doc.metadata["file_type"] == ".txt"
+        assert doc.metadata["grade"] == 1
+        assert doc.metadata["subject_name"] == "Toán"
+
+    def test_unsupported_extension(self, loader, tmp_path):
+        """Test unsupported formats are rejected."""
+        path = tmp_path / "notes.py"
+        path.touch()
+
+        with pytest.raises(ValueError, match="Unsupported file format"):
+            loader.load_file(str(path))
+
+
+class TestPdfCache:
+    """Test the parsed-PDF cache."""
+
+    def test_second_load_skips_llama_parse(self, loader, tmp_path):
+        """Test an unchanged PDF is parsed once, even from a new path."""
+        loader.llama_parser.load_data.return_value = [
+            Mock(text="Trang 1", metadata={})
+        ]
+        first = tmp_path / "a.pdf"
+        first.write_bytes(b"%PDF-1.4 fake")
+        second = tmp_path / "b.pdf"
+        second.write_bytes(b"%PDF-1.4 fake")
+
+        assert loader._load_pdf(str(first)) == [
+            Document(
+                page_content="Trang 1",
+                metadata={"page": 1, "source": str(first)},
+            )
+        ]
+        [doc] = loader._load_pdf(str(second))
+
+        assert doc.metadata["source"] == str(second)
+        loader.llama_parser.load_data.assert_called_once_with(str(first))
+
+    def test_parser_settings_are_part_of_key(self, loader, tmp_path):
+        """Test changing parser settings invalidates cached parses."""
+        path = tmp_path / "a.pdf"
+        path.write_bytes(b"%PDF-1.4 fake")
+
+        before = loader._pdf_cache_file(str(path))
+        loader._parser_config_key = '{"premium_mode": true}'
+
+        assert loader._pdf_cache_file(str(path)) != before
+
+
+class TestLoadFromDirectory:
+    """Test DocumentLoader.load_from_directory."""
+
+    def test_results_keep_directory_order(self, tmp_path):
+        """Test documents come back in scan order across worker threads."""
+        for i in range(5):
+            (tmp_path / f"{i}.txt").write_text(str(i), encoding="utf-8")
+        loader = DocumentLoader(max_workers=3)
+        expected = [
+            p.read_text(encoding="utf-8")
+            for p in scan_directory(
+                str(tmp_path), True, DocumentLoader.SUPPORTED_EXT_SET
+            )
+        ]
+
+        docs = loader.load_from_directory(str(tmp_path))
+
+        assert [d.page_content for d in docs] == expected
+
+    def test_missing_directory(self, tmp_path):
+        """Test a missing directory raises ValueError."""
+        with pytest.raises(ValueError, match="Directory not found"):
+            DocumentLoader().load_from_directory(str(tmp_path / "nope"))
+
+
+class TestParsingInstruction:
+    """Test the default LlamaParse instruction."""
+
+    def test_default_names_the_pdf_language(self):
+        """Test the template is filled with pdf_language."""
+        loader = DocumentLoader(pdf_language="en")
+
+        assert "The content is in en language." in loader.parsing_instruction
+        assert "{" not in loader.parsing_instruction
+
+    def test_custom_instruction_is_kept(self):
+        """Test an explicit instruction replaces the template."""
+        assert DocumentLoader(parsing_instruction="").parsing_instruction == ""
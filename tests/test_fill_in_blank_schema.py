@@ -3,7 +3,14 @@
 import pytest
 from pydantic import ValidationError
 
-from app.schemas.exam_content import Question
+from app.schemas.exam_content import (
+    FillInBlankData,
+    MultipleChoiceData,
+    Question,
+    validate_question,
+    validate_questions,
+    validate_questions_json,
+)
 
 
 def test_fill_in_blank_with_string_data():
@@ -25,10 +32,8 @@ def test_fill_in_blank_with_string_data():
 
     question = Question(**question_data)
     assert question.type == "FILL_IN_BLANK"
-    assert hasattr(question.data, "data")
-    assert isinstance(question.data.data, str)
-    assert "{{" in question.data.data
-    assert "}}" in question.data.data
+    assert isinstance(question.data, FillInBlankData)
+    assert question.data.data.startswith("The capital")
 
 
 def test_fill_in_blank_with_multiple_blanks():
@@ -50,10 +55,9 @@ def test_fill_in_blank_with_multiple_blanks():
 
     question = Question(**question_data)
     assert question.type == "FILL_IN_BLANK"
-    assert hasattr(question.data, "data")
+    assert isinstance(question.data, FillInBlankData)
     # Should have 2 blank placeholders
-    assert question.data.data.count("{{") == 2
-    assert question.data.data.count("}}") == 2
+    assert question.data.num_blanks == 2
 
 
 def test_multiple_choice_with_object_data():
@@ -81,7 +85,8 @@ def test_multiple_choice_with_object_data():
 
     question = Question(**question_data)
     assert question.type == "MULTIPLE_CHOICE"
-    assert hasattr(question.data, "options")
+    assert isinstance(question.data, MultipleChoiceData)
+    assert len(question.data.options) == 4
 
 
 def test_fill_in_blank_with_case_sensitive():
@@ -103,10 +108,9 @@ def test_fill_in_blank_with_case_sensitive():
 
     question = Question(**question_data)
     assert question.type == "FILL_IN_BLANK"
-    assert hasattr(question.data, "data")
-    assert hasattr(question.data, "caseSensitive")
-    assert question.data.caseSensitive == True
-    assert "{{" in question.data.data
+    assert isinstance(question.data, FillInBlankData)
+    assert question.data.caseSensitive is True
+    assert question.data.data == "Hello {{world|World}}"
 
 
 def test_invalid_question_type():
@@ -136,3 +140,115 @@ def test_missing_required_fields():
 
     with pytest.raises(ValidationError):
         Question(**question_data)
+
+
+def test_data_type_defaults_to_question_type():
+    """Test data without its own type is validated as the question type."""
+    question_data = {
+        "type": "OPEN_ENDED",
+        "difficulty": "KNOWLEDGE",
+        "title": "Explain",
+        "grade": "3",
+        "chapter": "Test",
+        "subject": "TV",
+        "data": {"expected_answer": "Because"},
+    }
+
+    question = Question(**question_data)
+    assert question.data.type == "OPEN_ENDED"
+    assert question.data.expectedAnswer == "Because"
+
+
+def test_data_is_validated_only_against_its_type():
+    """Test errors come from the tagged model alone."""
+    question_data = {
+        "type": "FILL_IN_BLANK",
+        "difficulty": "KNOWLEDGE",
+        "title": "Test",
+        "grade": "3",
+        "chapter": "Test",
+        "subject": "TV",
+        "data": {"type": "FILL_IN_BLANK"},
+    }
+
+    with pytest.raises(ValidationError) as exc_info:
+        Question(**question_data)
+
+    errors = exc_info.value.errors()
+    assert [e["loc"] for e in errors] == [("data", "FILL_IN_BLANK", "data")]
+
+
+def test_validate_question_matches_constructor():
+    """Test the shared adapter validates like Question(**data)."""
+    question_data = {
+        "type": "FILL_IN_BLANK",
+        "difficulty": "KNOWLEDGE",
+        "title": "Complete the sentence",
+        "grade": "3",
+        "chapter": "Test Topic",
+        "subject": "TV",
+        "data": {"type": "FILL_IN_BLANK", "data": "{{Hà Nội}}"},
+    }
+
+    question = validate_question(question_data)
+
+    assert isinstance(question, Question)
+    assert question == Question(**question_data)
+    with pytest.raises(ValidationError):
+        validate_question({**question_data, "grade": "9"})
+
+
+def test_validate_questions_json_from_bytes():
+    """Test a JSON array of questions is parsed and validated at once."""
+    raw = (
+        '[{"type": "FILL_IN_BLANK", "difficulty": "KNOWLEDGE",'
+        ' "title": "Complete the sentence", "grade": "3",'
+        ' "chapter": "Test Topic", "subject": "TV",'
+        ' "data": {"type": "FILL_IN_BLANK",'
+        ' "data": "The capital of Vietnam is {{Hà Nội|Hanoi}}."}}]'
+    ).encode("utf-8")
+
+    [question] = validate_questions_json(raw)
+
+    assert question.type == "FILL_IN_BLANK"
+    assert question.data.data == "The capital of Vietnam is {{Hà Nội|Hanoi}}."
+
+
+def test_validate_questions_json_reports_errors():
+    """Test malformed JSON and bad items surface as ValidationError."""
+    with pytest.raises(ValidationError) as exc_info:
+        validate_questions_json("[{")
+    assert exc_info.value.errors()[0]["type"] == "json_invalid"
+
+    with pytest.raises(ValidationError) as exc_info:
+        validate_questions_json('[{"type": "MATCHING"}]')
+    assert exc_info.value.errors()[0]["loc"][0] == 0
+
+
+def test_validate_questions_batch():
+    """Test a list of question dicts is validated in one call."""
+    question_data = {
+        "type": "OPEN_ENDED",
+        "difficulty": "KNOWLEDGE",
+        "title": "Describe your family",
+        "grade": "2",
+        "chapter": "Family",
+        "subject": "TV",
+        "data": {"expectedAnswer": "My family has four people."},
+    }
+
+    questions = validate_questions([question_data, question_data])
+    assert questions == [validate_question(question_data)] * 2
+
+    with pytest.raises(ValidationError) as exc_info:
+        validate_questions([question_data, {**question_data, "grade": "9"}])
+    assert exc_info.value.errors()[0]["loc"][:2] == (1, "grade")
+
+
+def test_question_data_is_frozen():
+    """Test validated question data cannot be mutated in place."""
+    data = FillInBlankData(data="Hello {{world}} and {{moon}}")
+    assert data.num_blanks == 2
+
+    with pytest.raises(ValidationError):
+        data.data = "Hello"
@@ -0,0 +1,100 @@
+"""Test the ingestion CLI pipeline."""
+
+import asyncio
+import dataclasses
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from langchain_core.documents import Document
+
+from ingestion_app.main import ingest_documents, load_env_config, main
+
+
+def test_ingest_documents_counts_outcomes():
+    """Test stored, empty and failing documents are tallied."""
+    pages = {
+        "ok.txt": [Document(page_content="a", metadata={})],
+        "empty.txt": [],
+    }
+
+    async def aload_file(path):
+        if Path(path).name == "bad.txt":
+            raise ValueError("unreadable")
+        return pages[Path(path).name]
+
+    loader = Mock(aload_file=aload_file)
+    chunker = Mock()
+    chunker.split_documents.side_effect = lambda docs: (docs, docs * 3)
+    chunker.get_chunk_stats.return_value = {
+        "total_parent_chunks": 1,
+        "total_child_chunks": 3,
+    }
+    embedding_service = Mock()
+    embedding_service.aembed_documents = AsyncMock(
+        side_effect=lambda texts: [[0.0]] * len(texts)
+    )
+    vector_store = Mock()
+    vector_store.add_texts_with_vectors.side_effect = (
+        lambda texts, metadatas, vectors: [str(i) for i in range(len(texts))]
+    )
+
+    result = asyncio.run(
+        ingest_documents(
+            [Path("ok.txt"), Path("empty.txt"), Path("bad.txt")],
+            loader,
+            chunker,
+            embedding_service,
+            vector_store,
+            concurrency=2,
+        )
+    )
+
+    assert result == (1, 2, 3)
+    embedding_service.aembed_documents.assert_awaited_once_with(
+        ["a", "a", "a"]
+    )
+
+
+def test_load_env_config(monkeypatch):
+    """Test settings are parsed into a frozen IngestConfig."""
+    monkeypatch.setattr("ingestion_app.main.load_dotenv", lambda: None)
+    monkeypatch.setenv("VERTEX_PROJECT_ID", "p")
+    monkeypatch.setenv("GOOGLE_APPLICATION_CREDENTIALS", "sa.json")
+    monkeypatch.setenv("PG_PASSWORD", "secret")
+    monkeypatch.setenv("PG_PORT", "6543")
+    monkeypatch.setenv("USE_HALFVEC", "True")
+
+    config = load_env_config()
+
+    assert config.pg_port == 6543
+    assert config.use_halfvec is True
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.pg_port = 5432
+
+
+def test_main_collection_name_override(monkeypatch, capsys):
+    """Test --collection-name replaces the configured collection."""
+    import psycopg2
+
+    monkeypatch.setattr("ingestion_app.main.load_dotenv", lambda: None)
+    monkeypatch.setenv("VERTEX_PROJECT_ID", "p")
+    monkeypatch.setenv("GOOGLE_APPLICATION_CREDENTIALS", "sa.json")
+    monkeypatch.setenv("PG_PASSWORD", "secret")
+    monkeypatch.setattr(
+        "sys.argv",
+        ["python -m ingestion_app", "--collection-name", "custom_docs"],
+    )
+    monkeypatch.setattr(
+        psycopg2,
+        "connect",
+        Mock(side_effect=psycopg2.OperationalError("unreachable")),
+    )
+
+    with pytest.raises(SystemExit) as exc_info:
+        main()
+
+    out = capsys.readouterr().out
+    assert "Configuration error" not in out
+    assert "Collection name: custom_docs" in out
+    assert exc_info.value.code == 1
@@ -0,0 +1,94 @@
+"""Test LLMExecutor parameter routing."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.llms.executor import LLMExecutor, LLMOutputTruncatedError
+from app.schemas.token_usage import TokenUsage
+
+
+@pytest.fixture
+def adapter_class():
+    """Mock adapter class whose instances return a fixed completion."""
+    adapter = Mock()
+    adapter.run.return_value = ("ok", TokenUsage())
+    adapter.last_finish_reason = "stop"
+    return Mock(return_value=adapter)
+
+
+class TestBatch:
+    """Test LLMExecutor.batch."""
+
+    def test_client_limits_go_to_adapter_constructor(self, adapter_class):
+        """Test max_tokens/timeout/max_retries configure the client."""
+        executor = LLMExecutor()
+        messages = [Mock()]
+
+        with patch.object(
+            executor, "_text_adapter", return_value=adapter_class
+        ):
+            result = executor.batch(
+                provider="google",
+                model="gemini-2.5-flash",
+                messages=messages,
+                max_tokens=1024,
+                timeout=30.0,
+                max_retries=2,
+                temperature=0.2,
+            )
+
+        assert result[0] == "ok"
+        adapter_class.assert_called_once_with(
+            model_name="gemini-2.5-flash",
+            max_tokens=1024,
+            timeout=30.0,
+            max_retries=2,
+        )
+        adapter_class.return_value.run.assert_called_once_with(
+            model="gemini-2.5-flash", messages=messages, temperature=0.2
+        )
+
+    def test_unset_limits_are_not_forwarded(self, adapter_class):
+        """Test None limits leave the client defaults in place."""
+        executor = LLMExecutor()
+
+        with patch.object(
+            executor, "_text_adapter", return_value=adapter_class
+        ):
+            executor.batch(provider="openai", model="gpt-4o", messages=[])
+
+        adapter_class.assert_called_once_with(model_name="gpt-4o")
+
+    @pytest.mark.parametrize("finish_reason", ["length", "MAX_TOKENS"])
+    def test_truncated_output_raises(self, adapter_class, finish_reason):
+        """Test a capped call that hit its limit raises."""
+        adapter_class.return_value.last_finish_reason = finish_reason
+        executor = LLMExecutor()
+
+        with patch.object(
+            executor, "_text_adapter", return_value=adapter_class
+        ):
+            with pytest.raises(LLMOutputTruncatedError) as exc_info:
+                executor.batch(
+                    provider="google",
+                    model="gemini-2.5-flash",
+                    messages=[],
+                    max_tokens=256,
+                )
+
+        assert exc_info.value.max_tokens == 256
+
+    def test_uncapped_call_ignores_finish_reason(self, adapter_class):
+        """Test the check only applies when max_tokens was requested."""
+        adapter_class.return_value.last_finish_reason = "length"
+        executor = LLMExecutor()
+
+        with patch.object(
+            executor, "_text_adapter", return_value=adapter_class
+        ):
+            result = executor.batch(
+                provider="openai", model="gpt-4o", messages=[]
+            )
+
+        assert result[0] == "ok"
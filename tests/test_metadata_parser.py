@@ -0,0 +1,32 @@
+"""Test educational metadata parsing from filenames."""
+
+import pytest
+
+from ingestion_app.metadata_parser import parse_educational_metadata
+
+
+@pytest.mark.parametrize(
+    "filename, grade, subject_code",
+    [
+        ("SGV_KNTT_T1.pdf", 1, "T"),
+        ("sgk_kntt_ta3", 3, "TA"),
+        ("SGV_KNTT_TV5_T2.pdf", 5, "TV"),
+        ("/data/books/SGV_KNTT_T2.pdf", 2, "T"),
+    ],
+)
+def test_recognized_filenames(filename, grade, subject_code):
+    """Test grade and subject are read case-insensitively."""
+    metadata = parse_educational_metadata(filename)
+
+    assert metadata["has_metadata"] is True
+    assert metadata["grade"] == grade
+    assert metadata["subject_code"] == subject_code
+
+
+@pytest.mark.parametrize(
+    "filename", ["notes.pdf", "SGV_KNTT_T9.pdf", "SGV_KNTT_T1_draft.pdf"]
+)
+def test_unrecognized_filenames(filename, capsys):
+    """Test other names yield no metadata and print nothing."""
+    assert parse_educational_metadata(filename)["has_metadata"] is False
+    assert capsys.readouterr().out == ""
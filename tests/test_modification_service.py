@@ -0,0 +1,172 @@
+"""Test modification service helpers."""
+
+import json
+import math
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+from openai import APIError, AuthenticationError, RateLimitError
+
+from app.core.exceptions import (
+    AIAuthenticationError,
+    AIOutputTruncatedError,
+    AIRateLimitError,
+    AIServiceError,
+)
+from app.llms.executor import LLMOutputTruncatedError
+from app.schemas.modification import RefineContentRequest
+from app.services.modification_service import (
+    ModificationService,
+    _dump_json,
+    _max_tokens,
+)
+
+_REQUEST = httpx.Request("POST", "https://api.example.com/v1/chat")
+
+
+def _response(status_code: int) -> httpx.Response:
+    return httpx.Response(status_code, request=_REQUEST)
+
+
+class TestDumpJson:
+    """Test JSON serialization of prompt payloads."""
+
+    def test_round_trips_nested_payload(self):
+        """Test output parses back to the original value."""
+        payload = {
+            "elements": [
+                {"id": "e1", "text": "Nội dung bài học", "x": 1.5},
+                {"id": "e2", "items": [1, 2, 3], "visible": True},
+            ],
+            "meta": None,
+        }
+
+        assert json.loads(_dump_json(payload)) == payload
+
+    def test_keeps_non_ascii_characters(self):
+        """Test non-ASCII text is not escaped."""
+        assert _dump_json({"text": "tiếng Việt"}) == '{"text":"tiếng Việt"}'
+
+    def test_writes_non_finite_floats_like_stdlib(self):
+        """Test NaN and Infinity are written as literals, not null."""
+        dumped = _dump_json([float("nan"), float("inf"), float("-inf")])
+
+        assert dumped == "[NaN,Infinity,-Infinity]"
+        nan, inf, neg_inf = json.loads(dumped)
+        assert math.isnan(nan)
+        assert inf == float("inf")
+        assert neg_inf == float("-inf")
+
+
+class TestMaxTokens:
+    """Test per-operation output token caps."""
+
+    def test_defaults_to_configured_limit(self):
+        """Test operations without an override use LLM_MAX_TOKENS."""
+        with patch(
+            "app.services.modification_service.settings"
+        ) as mock_settings:
+            mock_settings.llm_max_tokens = 3000
+            mock_settings.llm_op_max_tokens = {}
+
+            assert _max_tokens("refine_element_text") == 3000
+            assert _max_tokens("expand_mindmap_node") == 4096
+
+    def test_configured_override_wins(self):
+        """Test LLM_OP_MAX_TOKENS entries take precedence."""
+        with patch(
+            "app.services.modification_service.settings"
+        ) as mock_settings:
+            mock_settings.llm_max_tokens = 2048
+            mock_settings.llm_op_max_tokens = {"expand_mindmap_node": 8192}
+
+            assert _max_tokens("expand_mindmap_node") == 8192
+
+
+class TestErrorMapping:
+    """Test translation of provider errors into HTTP errors."""
+
+    @pytest.fixture
+    def llm_executor(self):
+        """Mock executor; tests set the error raised by batch."""
+        return Mock()
+
+    @pytest.fixture
+    def service(self, llm_executor):
+        """ModificationService with a mocked executor and prompt store."""
+        prompt_store = Mock()
+        prompt_store.render.return_value = "prompt"
+        return ModificationService(llm_executor, prompt_store)
+
+    @pytest.fixture
+    def request_model(self):
+        """Minimal refine_content request."""
+        return RefineContentRequest(
+            schema={"title": "Slide"},
+            instruction="shorten",
+            model="gpt-4o",
+            provider="openai",
+        )
+
+    @pytest.mark.parametrize(
+        "error, expected_type, expected_status, expected_detail",
+        [
+            (
+                AuthenticationError(
+                    "bad key", response=_response(401), body=None
+                ),
+                AIAuthenticationError,
+                401,
+                "AI service authentication failed: bad key",
+            ),
+            (
+                RateLimitError(
+                    "slow down", response=_response(429), body=None
+                ),
+                AIRateLimitError,
+                429,
+                "OpenAI rate limit exceeded: slow down",
+            ),
+            (
+                APIError("upstream failed", request=_REQUEST, body=None),
+                AIServiceError,
+                500,
+                "OpenAI API error: upstream failed",
+            ),
+            (
+                LLMOutputTruncatedError("gpt-4o", 2048),
+                AIOutputTruncatedError,
+                502,
+                "AI response was cut off at the 2048-token output limit",
+            ),
+            (
+                ValueError("boom"),
+                AIServiceError,
+                500,
+                "Failed to refine content: boom",
+            ),
+        ],
+    )
+    def test_maps_error(
+        self,
+        service,
+        llm_executor,
+        request_model,
+        error,
+        expected_type,
+        expected_status,
+        expected_detail,
+    ):
+        """Test each provider error maps to its HTTP error and detail."""
+        llm_executor.batch.side_effect = error
+
+        with pytest.raises(expected_type) as exc_info:
+            service.refine_content(request_model)
+
+        assert exc_info.value.status_code == expected_status
+        assert exc_info.value.detail == expected_detail
+
+    def test_wrapper_keeps_method_name(self):
+        """Test functools.wraps preserves the decorated method's name."""
+        assert ModificationService.refine_content.__name__ == "refine_content"
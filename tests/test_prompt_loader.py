@@ -1,11 +1,12 @@
 """Test prompt loading functionality."""
 
 from pathlib import Path
-from unittest.mock import Mock, mock_open, patch
+from unittest.mock import Mock
 
 import pytest
+import yaml
 
-from app.prompts.loader import PromptSpec, PromptStore
+from app.prompts.loader import YAML_LOADER, PromptSpec, PromptStore
 
 
 class TestPromptStore:
@@ -40,54 +41,84 @@ class TestPromptStore:
         assert spec.format == "st"
         assert spec.defaults_path is None
 
-    @patch(
-        "builtins.open",
-        new_callable=mock_open,
-        read_data='prompts:\n  test.key:\n    path: "test.st"',
-    )
-    @patch("yaml.safe_load")
     def test_load_registry(
-        self, mock_yaml, mock_file, prompt_store, mock_registry_data
+        self, monkeypatch, prompt_store, mock_registry_data
     ):
         """Test registry loading."""
-        mock_yaml.return_value = mock_registry_data
+        raw = b'prompts:\n  test.key:\n    path: "test.st"'
+        mock_yaml = Mock(return_value=mock_registry_data)
+        monkeypatch.setattr(Path, "read_bytes", lambda self: raw)
+        monkeypatch.setattr(yaml, "load", mock_yaml)
 
         # Clear the cache to ensure fresh load
         prompt_store._load_registry.cache_clear()
 
         result = prompt_store._load_registry()
         assert result == mock_registry_data
+        mock_yaml.assert_called_once_with(raw, Loader=YAML_LOADER)
+        prompt_store._load_registry.cache_clear()
+
+    def test_load_registry_shared_across_stores(
+        self, monkeypatch, mock_registry_data
+    ):
+        """Test the registry is parsed once for all store instances."""
+        mock_yaml = Mock(return_value=mock_registry_data)
+        monkeypatch.setattr(yaml, "load", mock_yaml)
+        PromptStore._load_registry.cache_clear()
+
+        assert PromptStore()._load_registry() is (
+            PromptStore()._load_registry()
+        )
+        mock_yaml.assert_called_once()
+        PromptStore._load_registry.cache_clear()
 
-    @patch.object(PromptStore, "_load_registry")
     def test_spec_creation_from_registry(
-        self, mock_load_registry, prompt_store, mock_registry_data
+        self, monkeypatch, prompt_store, mock_registry_data
     ):
         """Test PromptSpec creation from registry."""
-        mock_load_registry.return_value = mock_registry_data
+        mock_load_registry = Mock(return_value=mock_registry_data)
+        monkeypatch.setattr(PromptStore, "_load_registry", mock_load_registry)
+        prompt_store._spec.cache_clear()
 
-        spec = prompt_store._spec("test.prompt")
+        spec = prompt_store._spec(prompt_store.base, "test.prompt")
 
         assert spec.key == "test.prompt"
-        assert spec.path.name == "prompt.st"
+        assert spec.path == prompt_store.base / "test/prompt.st"
         assert spec.format == "st"
 
-    @patch.object(PromptStore, "_load_registry")
-    def test_spec_not_found(self, mock_load_registry, prompt_store):
+        # Repeated lookups, from any store on the same base, reuse the spec
+        assert PromptStore()._spec(prompt_store.base, "test.prompt") is spec
+        mock_load_registry.assert_called_once()
+
+        # A store on another base directory resolves its own paths
+        other = PromptStore(Path("/other"))._spec(
+            Path("/other"), "test.prompt"
+        )
+        assert other.path == Path("/other/test/prompt.st")
+        prompt_store._spec.cache_clear()
+
+    def test_spec_not_found(self, monkeypatch, prompt_store):
         """Test KeyError when prompt key not found."""
-        mock_load_registry.return_value = {"prompts": {}}
+        monkeypatch.setattr(
+            PromptStore, "_load_registry", Mock(return_value={"prompts": {}})
+        )
+        prompt_store._spec.cache_clear()
 
         with pytest.raises(
             KeyError, match="Prompt key not found: nonexistent"
         ):
-            prompt_store._spec("nonexistent")
+            prompt_store._spec(prompt_store.base, "nonexistent")
 
-    @patch.object(Path, "read_text")
-    def test_load_text(self, mock_read_text, prompt_store):
+    def test_load_text(self, monkeypatch, prompt_store):
         """Test text loading with caching."""
-        mock_read_text.return_value = "Test prompt content"
+        mock_read_text = Mock(return_value="Test prompt content")
+        monkeypatch.setattr(Path, "read_text", mock_read_text)
+        prompt_store._load_text.cache_clear()
 
         path = Path("test.st")
         result = prompt_store._load_text(path)
 
         assert result == "Test prompt content"
+        # A second store hits the same cache without touching the disk
+        assert PromptStore()._load_text(path) == "Test prompt content"
         mock_read_text.assert_called_once_with(encoding="utf-8")
@@ -0,0 +1,186 @@
+"""Test server-sent event streaming helpers."""
+
+import asyncio
+import base64
+import json
+
+from app.schemas.token_usage import TokenUsage
+from app.utils.server_sent_event import (
+    _JsonStreamExtractor,
+    sse_json_by_json,
+    sse_word_by_word,
+)
+
+
+class FakeRequest:
+    """Request stub; ``receive`` reports a disconnect if ``gone`` is set."""
+
+    def __init__(self, gone: bool = False):
+        self.gone = gone
+
+    async def is_disconnected(self) -> bool:
+        return False
+
+    async def receive(self) -> dict:
+        if not self.gone:
+            await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+
+def _collect(agen) -> list:
+    async def run():
+        return [event async for event in agen]
+
+    return asyncio.run(run())
+
+
+def _decode(events: list) -> list:
+    return [base64.b64decode(e["data"]).decode("utf-8") for e in events]
+
+
+def _payloads(events: list) -> list:
+    return [json.loads(e[len("data: ") :]) for e in events]
+
+
+class TestSseWordByWord:
+    """Test word-by-word streaming."""
+
+    def test_reassembles_text_split_mid_word(self):
+        """Test decoded frames concatenate back to the streamed text."""
+        chunks = ["### Âm Th", "anh và", "o ", "bài\nhọc"]
+
+        text = "".join(
+            _decode(_collect(sse_word_by_word(FakeRequest(), chunks)))
+        )
+
+        assert text == "### Âm Thanh vào bài\nhọc"
+
+    def test_coalesce_sends_one_frame(self):
+        """Test coalesced output is a single frame of the whole text."""
+        chunks = ["### Âm Th", "anh và", "o ", "bài\nhọc"]
+
+        frames = _decode(
+            _collect(sse_word_by_word(FakeRequest(), chunks, coalesce=True))
+        )
+
+        assert frames == ["### Âm Thanh vào bài\nhọc"]
+
+    def test_stops_after_client_disconnects(self):
+        """Test streaming ends once the watcher sees the disconnect."""
+
+        async def run():
+            agen = sse_word_by_word(FakeRequest(gone=True), ["a ", "b ", "c "])
+            first = await agen.__anext__()
+            await asyncio.sleep(0)
+            rest = [event async for event in agen]
+            return [first] + rest
+
+        assert _decode(asyncio.run(run())) == ["a", " "]
+
+    def test_token_usage_is_last_frame(self):
+        """Test token usage is sent after the content."""
+        usage = TokenUsage(
+            input_tokens=3,
+            output_tokens=4,
+            total_tokens=7,
+            model="gpt-4o",
+            provider="openai",
+        )
+
+        frames = _decode(
+            _collect(sse_word_by_word(FakeRequest(), ["hello world", usage]))
+        )
+
+        assert "".join(frames[:-1]) == "hello world"
+        assert json.loads(frames[-1]) == {
+            "token_usage": {
+                "input_tokens": 3,
+                "output_tokens": 4,
+                "total_tokens": 7,
+                "model": "gpt-4o",
+                "provider": "openai",
+            }
+        }
+
+
+class TestJsonStreamExtractor:
+    """Test incremental JSON object extraction."""
+
+    def test_ignores_braces_inside_strings(self):
+        """Test braces and escaped quotes in strings do not end objects."""
+        extractor = _JsonStreamExtractor()
+        text = '{"text": "a{b}c \\"}\\" d", "n": {"x": 1}}'
+
+        assert extractor.feed(text[:20]) == []
+        assert extractor.feed(text[20:]) == [
+            {"text": 'a{b}c "}" d', "n": {"x": 1}}
+        ]
+
+    def test_object_completed_across_feeds(self):
+        """Test state carries over between calls."""
+        extractor = _JsonStreamExtractor()
+
+        assert extractor.feed('[{"a": "x\\') == []
+        assert extractor.feed('"}"}, {"b"') == [{"a": 'x"}'}]
+        assert extractor.feed(": 2}]") == [{"b": 2}]
+
+    def test_whole_objects_in_one_feed(self):
+        """Test complete objects are decoded without carrying state."""
+        extractor = _JsonStreamExtractor()
+
+        assert extractor.feed('[{"a": 1}, {"b": {"c": 2}}]') == [
+            {"a": 1},
+            {"b": {"c": 2}},
+        ]
+        assert extractor.depth == 0
+
+    def test_skips_malformed_object(self):
+        """Test an object that fails to decode is dropped."""
+        extractor = _JsonStreamExtractor()
+
+        assert extractor.feed('{"a": 1,} {"b": 2}') == [{"b": 2}]
+
+
+class TestSseJsonByJson:
+    """Test JSON-object streaming."""
+
+    def test_emits_objects_split_across_chunks(self):
+        """Test objects are emitted once their closing brace arrives."""
+        chunks = [
+            '```json\n[{"type": "title", "data": {"te',
+            'xt": "Mở đầu"}}, {"type": "list", ',
+            '"data": {"items": [1, 2]}}]\n```',
+        ]
+
+        events = _collect(sse_json_by_json(FakeRequest(), chunks))
+
+        assert _payloads(events) == [
+            {"type": "title", "data": {"text": "Mở đầu"}},
+            {"type": "list", "data": {"items": [1, 2]}},
+        ]
+
+    def test_ignores_fence_split_across_chunks(self):
+        """Test a code fence broken between chunks does not leak."""
+        chunks = ["``", '`json\n{"type": "a"}\n`', "``"]
+
+        events = _collect(sse_json_by_json(FakeRequest(), chunks))
+
+        assert _payloads(events) == [{"type": "a"}]
+
+    def test_skips_objects_without_type(self):
+        """Test objects lacking a type field are dropped."""
+        chunks = ['{"foo": 1}', '{"type": "a"}']
+
+        events = _collect(sse_json_by_json(FakeRequest(), chunks))
+
+        assert _payloads(events) == [{"type": "a"}]
+
+    def test_token_usage_is_last_event(self):
+        """Test token usage follows the content events."""
+        usage = TokenUsage(input_tokens=1, output_tokens=2, total_tokens=3)
+
+        events = _collect(
+            sse_json_by_json(FakeRequest(), ['{"type": "a"}', usage])
+        )
+
+        assert _payloads(events)[-1]["token_usage"]["total_tokens"] == 3
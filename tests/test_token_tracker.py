@@ -0,0 +1,63 @@
+"""Test token usage aggregation."""
+
+from app.schemas.token_usage import TokenUsage
+from app.utils.token_tracker import TokenTracker
+
+
+class TestTokenTracker:
+    """Test TokenTracker functionality."""
+
+    def test_totals_accumulate(self):
+        """Test usages from several requests are summed."""
+        tracker = TokenTracker()
+
+        tracker.add_usage(
+            TokenUsage(input_tokens=10, output_tokens=5, total_tokens=15)
+        )
+        tracker.add_usage(
+            {"input_tokens": 1, "output_tokens": 2, "total_tokens": 3}
+        )
+
+        total = tracker.get_total()
+        assert isinstance(total, TokenUsage)
+        assert (total.input_tokens, total.output_tokens) == (11, 7)
+        assert total.total_tokens == 18
+        assert tracker.total_usage == total
+        assert tracker.get_usage_count() == 2
+
+    def test_to_dict(self):
+        """Test dictionary form includes totals and request count."""
+        tracker = TokenTracker()
+        tracker.add_usage(
+            TokenUsage(input_tokens=2, output_tokens=3, total_tokens=5)
+        )
+
+        assert tracker.to_dict() == {
+            "input_tokens": 2,
+            "output_tokens": 3,
+            "total_tokens": 5,
+            "requests_count": 1,
+        }
+
+    def test_reset(self):
+        """Test reset clears totals and count."""
+        tracker = TokenTracker()
+        tracker.add_usage(TokenUsage(input_tokens=4, total_tokens=4))
+
+        tracker.reset()
+
+        assert tracker.get_total() == TokenUsage()
+        assert tracker.get_usage_count() == 0
+
+    def test_details_are_opt_in(self):
+        """Test individual usages are only kept when requested."""
+        usage = TokenUsage(input_tokens=1, total_tokens=1)
+        tracker = TokenTracker()
+        detailed = TokenTracker(track_details=True)
+
+        tracker.add_usage(usage)
+        detailed.add_usage(usage)
+
+        assert tracker.request_usages == []
+        assert detailed.request_usages == [usage]
+        assert tracker.get_usage_count() == detailed.get_usage_count() == 1
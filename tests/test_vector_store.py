@@ -0,0 +1,266 @@
+"""Test the ingestion vector store manager."""
+
+import uuid
+from unittest.mock import MagicMock, Mock, patch
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from ingestion_app.vector_store import VectorStoreManager
+
+
+@pytest.fixture
+def embeddings():
+    """Embeddings mock returning one short vector per text."""
+    embeddings = Mock()
+    embeddings.embed_documents.side_effect = lambda texts: [
+        [float(len(t)), 0.5] for t in texts
+    ]
+    return embeddings
+
+
+@pytest.fixture
+def conn():
+    """psycopg connection mock with a cursor and COPY context."""
+    conn = MagicMock()
+    cursor = conn.__enter__.return_value.cursor.return_value.__enter__
+    cursor.return_value.fetchone.return_value = (uuid.UUID(int=1),)
+    return conn
+
+
+@pytest.fixture
+def store(embeddings, conn):
+    """Manager that talks to the mocked connection."""
+    with patch.object(VectorStoreManager, "_initialize_store"):
+        store = VectorStoreManager(
+            embeddings,
+            collection_name="books",
+            connection_string="postgresql+psycopg2://u:p@db:5432/vectordb",
+        )
+    with (
+        patch("ingestion_app.vector_store.psycopg.connect", return_value=conn),
+        patch("ingestion_app.vector_store.register_vector"),
+    ):
+        yield store
+
+
+def _copy(conn):
+    cursor = conn.__enter__.return_value.cursor.return_value.__enter__
+    return cursor.return_value.copy.return_value.__enter__.return_value
+
+
+class TestAddDocuments:
+    """Test VectorStoreManager.add_documents."""
+
+    def test_rows_are_copied_with_vectors(self, store, embeddings, conn):
+        """Test every document is embedded once and written by COPY."""
+        docs = [
+            Document(page_content="ab", metadata={"grade": 1}),
+            Document(page_content="c", metadata={}),
+        ]
+
+        ids = store.add_documents(docs, ids=["x", "y"])
+
+        assert ids == ["x", "y"]
+        embeddings.embed_documents.assert_called_once_with(["ab", "c"])
+        copy = _copy(conn)
+        copy.set_types.assert_called_once()
+        rows = [c.args[0] for c in copy.write_row.call_args_list]
+        assert [row[1] for row in rows] == [uuid.UUID(int=1)] * 2
+        assert [row[2].tolist() for row in rows] == [[2.0, 0.5], [1.0, 0.5]]
+        assert rows[0][2].dtype == np.dtype(">f4")
+        assert [row[3] for row in rows] == ["ab", "c"]
+        assert rows[0][4].obj == {"grade": 1}
+        assert rows[0][4].dumps(rows[0][4].obj) == b'{"grade":1}'
+        assert [row[5] for row in rows] == ["x", "y"]
+
+    def test_commit_does_not_wait_for_flush(self, store, conn):
+        """Test the COPY transaction turns off synchronous_commit."""
+        store.add_documents([Document(page_content="a")])
+
+        cursor = conn.__enter__.return_value.cursor.return_value.__enter__
+        first = cursor.return_value.execute.call_args_list[0]
+        assert first.args == ("SET LOCAL synchronous_commit = off",)
+
+    def test_connects_without_driver_suffix(self, store, conn):
+        """Test the SQLAlchemy driver name is dropped for psycopg."""
+        with patch(
+            "ingestion_app.vector_store.psycopg.connect", return_value=conn
+        ) as connect:
+            store.add_documents([Document(page_content="a")])
+
+        connect.assert_called_once_with("postgresql://u:p@db:5432/vectordb")
+
+    def test_collection_is_looked_up_once(self, store, conn):
+        """Test the collection uuid is cached across writes."""
+        cursor = conn.__enter__.return_value.cursor.return_value.__enter__
+        execute = cursor.return_value.execute
+
+        store.add_documents([Document(page_content="a")])
+        store.add_documents([Document(page_content="b")])
+
+        lookups = [
+            c
+            for c in execute.call_args_list
+            if "langchain_pg_collection" in c.args[0]
+        ]
+        assert len(lookups) == 1
+        assert store._collection_id == uuid.UUID(int=1)
+
+    def test_missing_collection(self, store, conn):
+        """Test writing to an unknown collection raises ValueError."""
+        cursor = conn.__enter__.return_value.cursor.return_value.__enter__
+        cursor.return_value.fetchone.return_value = None
+
+        with pytest.raises(ValueError, match="Collection not found"):
+            store.add_documents([Document(page_content="a")])
+
+    def test_empty_input(self, store, embeddings):
+        """Test nothing is embedded or written for no documents."""
+        assert store.add_documents([]) == []
+        embeddings.embed_documents.assert_not_called()
+
+
+class TestAddDocumentsWithVectors:
+    """Test VectorStoreManager.add_documents_with_vectors."""
+
+    def test_does_not_embed(self, store, embeddings, conn):
+        """Test precomputed vectors are written as given."""
+        ids = store.add_documents_with_vectors(
+            [Document(page_content="a")], [[0.25, 0.75]]
+        )
+
+        assert len(ids) == 1
+        embeddings.embed_documents.assert_not_called()
+        [call] = _copy(conn).write_row.call_args_list
+        assert call.args[0][2].tolist() == [0.25, 0.75]
+
+
+class TestPool:
+    """Test borrowing connections from a shared pool."""
+
+    def test_copy_uses_pool(self, store, conn):
+        """Test writes borrow a pooled connection and skip registration."""
+        pool = MagicMock()
+        pool.connection.return_value = conn
+        store.pool = pool
+
+        with (
+            patch("ingestion_app.vector_store.psycopg.connect") as connect,
+            patch("ingestion_app.vector_store.register_vector") as register,
+        ):
+            store.add_texts_with_vectors(["a"], [{}], [[1.0]])
+
+        pool.connection.assert_called_once_with()
+        connect.assert_not_called()
+        register.assert_not_called()
+        assert _copy(conn).write_row.call_count == 1
+
+
+class TestAddTextsWithVectors:
+    """Test VectorStoreManager.add_texts_with_vectors."""
+
+    def test_columns_are_written_by_row(self, store, conn):
+        """Test parallel text, metadata and vector columns become rows."""
+        vectors = np.array([[1.0, 2.0], [3.0, 4.0]])
+
+        store.add_texts_with_vectors(
+            ["a", "b"], [{"page": 1}, {"page": 2}], vectors, ids=["x", "y"]
+        )
+
+        rows = [c.args[0] for c in _copy(conn).write_row.call_args_list]
+        assert [row[2].tolist() for row in rows] == vectors.tolist()
+        assert [row[3] for row in rows] == ["a", "b"]
+        assert [row[4].obj for row in rows] == [{"page": 1}, {"page": 2}]
+        assert [row[5] for row in rows] == ["x", "y"]
+
+
+class TestHalfvec:
+    """Test storing embeddings as FP16 halfvec."""
+
+    def _make(self, embeddings, conn, column_type):
+        execute = conn.__enter__.return_value.execute
+        execute.return_value.fetchone.return_value = (column_type,)
+        with (
+            patch("ingestion_app.vector_store.PGVector"),
+            patch(
+                "ingestion_app.vector_store.psycopg.connect",
+                return_value=conn,
+            ),
+            patch("ingestion_app.vector_store.register_vector"),
+        ):
+            store = VectorStoreManager(
+                embeddings,
+                connection_string="postgresql://u:p@db/vectordb",
+                use_halfvec=True,
+                embedding_dimension=3072,
+            )
+        return store, execute
+
+    def test_column_is_converted(self, embeddings, conn):
+        """Test an untyped vector column is altered to halfvec(dim)."""
+        _, execute = self._make(embeddings, conn, "vector")
+
+        alter = execute.call_args_list[-1].args[0].as_string(None)
+        assert "TYPE halfvec(3072) USING embedding::halfvec(3072)" in alter
+
+    def test_converted_column_is_left_alone(self, embeddings, conn):
+        """Test nothing is altered once the column is halfvec."""
+        _, execute = self._make(embeddings, conn, "halfvec(3072)")
+
+        execute.assert_called_once()
+
+    def test_rows_are_copied_as_float16(self, embeddings, conn):
+        """Test the COPY declares halfvec and writes FP16 arrays."""
+        store, _ = self._make(embeddings, conn, "halfvec(3072)")
+        with (
+            patch(
+                "ingestion_app.vector_store.psycopg.connect",
+                return_value=conn,
+            ),
+            patch("ingestion_app.vector_store.register_vector"),
+        ):
+            store.add_documents([Document(page_content="ab")])
+
+        copy = _copy(conn)
+        assert copy.set_types.call_args.args[0][2] == "halfvec"
+        [call] = copy.write_row.call_args_list
+        assert call.args[0][2].dtype == np.dtype(">f2")
+
+
+class TestBuildAnnIndex:
+    """Test VectorStoreManager.build_ann_index."""
+
+    def _execute(self, conn, dimension):
+        execute = conn.__enter__.return_value.execute
+        execute.return_value.fetchone.return_value = (dimension,)
+        return execute
+
+    def test_creates_hnsw_index(self, store, conn):
+        """Test a column with a fixed dimension gets the index."""
+        execute = self._execute(conn, 768)
+
+        assert store.build_ann_index(m=8) is True
+
+        create = execute.call_args_list[-1].args[0].as_string(None)
+        assert 'USING hnsw (embedding "vector_cosine_ops")' in create
+        assert "m = 8, ef_construction = 64" in create
+
+    @pytest.mark.parametrize("dimension", [-1, 3072])
+    def test_skips_unindexable_column(self, store, conn, dimension):
+        """Test untyped or too-wide columns are left without an index."""
+        execute = self._execute(conn, dimension)
+
+        assert store.build_ann_index() is False
+        execute.assert_called_once()
+
+    def test_halfvec_index(self, store, conn):
+        """Test halfvec columns use their own ops and wider limit."""
+        store.use_halfvec = True
+        execute = self._execute(conn, 3072)
+
+        assert store.build_ann_index() is True
+
+        create = execute.call_args_list[-1].args[0].as_string(None)
+        assert '(embedding "halfvec_cosine_ops")' in create